@@ -1,20 +1,34 @@
 import os
-from fastapi import FastAPI, HTTPException
+import json
+from fastapi import FastAPI, HTTPException, Query, Request
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from src.utils.logger import get_logger
 from src.core.task_store import TaskStore
 from src.core.toolrouter_config import ToolRouterStub
+from src.core.http_router import HttpToolRouter
 from src.core.analytics import AnalyticsEngine
 from src.core.analytics_insights import compute_metrics, get_recent_failures
 from src.core.workflow_planner import WorkflowPlanner
+from src.core.scheduler import Schedule, WorkflowScheduler
+from src.core.poll_supervisor import PollSupervisor
+from src.core.rate_limiter import rate_limiter
+from src.core.search_index import search_index
+from src.core.ingest import IngestQueue, ingest_agent, item_to_task
+from src.core.exceptions import RunStateError
+from src.core.responses import CompressionMiddleware, FastJSONResponse
+from src.core.webhooks import EventDeduper, decode_pubsub_push, slack_event_to_item, verify_slack_signature, verify_token
 from src.agents.slack_agent import SlackAgent
+from src.agents.registry import AgentRegistry
+from src.agents.drive_agent import DriveAgent
+from src.workflows.reminder_agent import ReminderAgent
+from src.workflows.escalation_agent import EscalationAgent
 from fastapi.middleware.cors import CORSMiddleware
 from src.core.config import settings
 
 logger = get_logger("main")
 
-app = FastAPI(title="AIOCC - AI Operations Command Center")
+app = FastAPI(title="AIOCC - AI Operations Command Center", default_response_class=FastJSONResponse)
 
 # CORS - allow local dashboard to query analytics endpoints
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -26,23 +40,92 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# large JSON (run logs, task lists, execution summaries) goes out gzip/brotli compressed
+if settings.RESPONSE_COMPRESSION_MIN_BYTES > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        gzip_level=settings.RESPONSE_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_BROTLI_QUALITY,
+    )
 
 # Instantiate async TaskStore and router (they are lightweight until connected)
 store = TaskStore()
-router = ToolRouterStub()
+# a remote ToolRouter is used when TOOLROUTER_URL is configured
+router = HttpToolRouter.from_settings() if settings.TOOLROUTER_URL else ToolRouterStub()
 analytics = AnalyticsEngine(store)
 planner = WorkflowPlanner(router=router, store=store)
-slack_agent = SlackAgent(router=router)
+slack_agent = SlackAgent(router=router, store=store)
+# one long-lived instance (and client) per agent, shared by all requests
+agents = AgentRegistry.from_settings(router=router, store=store, slack_agent=slack_agent)
+# scan state (revision and content hash per document) lives in the TaskStore
+drive_agent = DriveAgent(router=router, store=store)
+# keeps an in-memory timer per due task; fed by TaskStore change notifications
+reminder_agent = ReminderAgent(router=router, store=store, slack_agent=slack_agent)
+# ESCALATION_RULES, re-evaluated incrementally as tasks change
+escalation_agent = EscalationAgent(router=router, store=store, slack_agent=slack_agent)
+scheduler = WorkflowScheduler(
+    store=store,
+    planner=planner,
+    pollers={"reminder": reminder_agent.poll, "escalation": escalation_agent.poll},
+)
+# background poll loops for every agent, sharing one concurrency budget
+poll_supervisor = PollSupervisor(max_concurrency=settings.POLL_MAX_CONCURRENCY)
+poll_supervisor.add_agents(
+    {
+        "slack": slack_agent,
+        "gmail": agents.get("gmail"),
+        "notion": agents.get("notion"),
+        "drive": drive_agent,
+        "reminder": reminder_agent,
+        "escalation": escalation_agent,
+    },
+    store=store,
+)
+
+# pushed webhook events are acknowledged immediately and written in batches
+event_dedup = EventDeduper()
+
+
+def forget_events(keys: List[str]) -> None:
+    # events whose tasks could not be written are accepted again on redelivery
+    for key in keys:
+        event_dedup.forget(key)
+
+
+event_queue = IngestQueue(
+    store,
+    batch_size=settings.WEBHOOK_BATCH_SIZE,
+    flush_interval=settings.WEBHOOK_FLUSH_SECONDS,
+    on_dead_letter=forget_events,
+)
 
 
 @app.on_event("startup")
 async def startup_event():
     # Connect the async DB
     await store.connect()
+    # the search index lives in memory; seed it with stored tasks
+    for task in await store.list_tasks_async():
+        search_index.index_task(task)
+    await reminder_agent.start()
+    await escalation_agent.start()
+    if settings.SCHEDULER_ENABLED:
+        await scheduler.start()
+    if settings.POLLING_ENABLED:
+        await poll_supervisor.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await scheduler.stop()
+    await poll_supervisor.stop()
+    await reminder_agent.stop()
+    await escalation_agent.stop()
+    await event_queue.stop()
+    await agents.aclose()
+    if isinstance(router, HttpToolRouter):
+        await router.aclose()
     await store.disconnect()
 
 
@@ -52,15 +135,30 @@ def health():
 
 
 @app.post("/tasks")
-async def create_task(source: str, title: str, description: Optional[str] = None, owner: Optional[str] = None):
-    task = await store.add_task_async(source=source, title=title, description=description, owner=owner)
+async def create_task(source: str, title: str, description: Optional[str] = None, owner: Optional[str] = None, due_at: Optional[str] = None):
+    try:
+        task = await store.add_task_async(source=source, title=title, description=description, owner=owner, due_at=due_at)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid due_at: {e}")
     return {"task": task.__dict__}
 
 
+@app.post("/tasks/{task_id}/due")
+async def set_task_due(task_id: int, due_at: Optional[str] = None):
+    """Set a task's due time (ISO 8601; naive values are UTC) or clear it when omitted."""
+    if await store.get_task_async(task_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown task")
+    try:
+        return {"task_id": task_id, "due_at": await store.set_due_async(task_id, due_at)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid due_at: {e}")
+
+
 @app.get("/tasks")
 async def list_tasks(status: Optional[str] = None):
     tasks = await store.list_tasks_async(status=status)
-    return {"tasks": [t.__dict__ for t in tasks]}
+    # built directly so the payload skips jsonable_encoder
+    return FastJSONResponse({"tasks": [t.__dict__ for t in tasks]})
 
 
 @app.get("/analytics/overview")
@@ -75,18 +173,20 @@ async def analytics_overview():
 class WorkflowExecuteRequest(BaseModel):
     workflow_name: str
     params: Optional[Dict[str, Any]] = None
+    concurrency_key: Optional[str] = None
 
 
 @app.post("/workflows/execute")
 async def execute_workflow(req: WorkflowExecuteRequest):
     """Execute a pre-defined workflow by name with optional params.
 
-    Body: { workflow_name: str, params?: dict }
-    Returns a detailed execution summary JSON.
+    Body: { workflow_name: str, params?: dict, concurrency_key?: str }
+    Identical requests (same concurrency key) arriving while a run is in flight
+    share that run's summary. Returns a detailed execution summary JSON.
     """
     try:
-        summary = await planner.run(req.workflow_name, params=req.params or {})
-        return {"workflow": req.workflow_name, "summary": summary}
+        summary = await planner.run(req.workflow_name, params=req.params or {}, concurrency_key=req.concurrency_key)
+        return FastJSONResponse({"workflow": req.workflow_name, "summary": summary})
     except KeyError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -94,11 +194,128 @@ async def execute_workflow(req: WorkflowExecuteRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class WorkflowBatchRequest(BaseModel):
+    workflow_name: str
+    param_sets: List[Dict[str, Any]]
+    max_concurrency: Optional[int] = None
+
+
+@app.post("/workflows/execute_batch")
+async def execute_workflow_batch(req: WorkflowBatchRequest):
+    """Execute one workflow once per parameter set.
+
+    Body: { workflow_name: str, param_sets: [dict], max_concurrency?: int }
+    Returns success/failure counts and one outcome per parameter set.
+    """
+    try:
+        summary = await planner.run_many(req.workflow_name, req.param_sets, max_concurrency=req.max_concurrency)
+        return {"workflow": req.workflow_name, "summary": summary}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.exception("Workflow batch execution failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/workflows/runs/{run_id}/resume")
+async def resume_workflow_run(run_id: int):
+    """Resume a failed, timed-out or cancelled run, re-executing only the failed and remaining steps.
+
+    Returns 409 if the run succeeded, is still executing or is already being resumed.
+    """
+    try:
+        summary = await planner.resume(run_id)
+        return {"summary": summary}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RunStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.exception("Workflow resume failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/workflows/runs/{run_id}/cancel")
+async def cancel_workflow_run(run_id: int):
+    """Cancel an in-flight run; it is recorded with status "cancelled"."""
+    if not await planner.cancel(run_id):
+        raise HTTPException(status_code=404, detail="Run is not in flight")
+    return {"run_id": run_id, "status": "cancelled"}
+
+
+@app.get("/workflows/runs/{run_id}/timeline")
+async def workflow_run_timeline(run_id: int):
+    """Return the timing spans recorded for a run (planning, each step attempt, store writes)."""
+    try:
+        run = await store.get_run(run_id)
+    except Exception as e:
+        logger.exception("Failed to fetch run: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    if run is None:
+        raise HTTPException(status_code=404, detail="Unknown run")
+    log = run.get("log") if isinstance(run.get("log"), dict) else {}
+    timeline = log.get("timeline")
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="No timeline recorded for this run")
+    return {"run_id": run_id, "status": run.get("status"), "timeline": timeline}
+
+
 @app.get("/workflows/list")
 def list_workflows():
     return {"workflows": planner.list_workflows()}
 
 
+class ScheduleRequest(BaseModel):
+    name: str
+    kind: str = "workflow"
+    target: str
+    cron: str
+    params: Optional[Dict[str, Any]] = None
+    overlap: str = "skip"
+    jitter_seconds: float = 0.0
+    enabled: bool = True
+
+
+@app.get("/schedules")
+def list_schedules():
+    return {"schedules": scheduler.list_schedules()}
+
+
+@app.post("/schedules")
+async def upsert_schedule(req: ScheduleRequest):
+    """Create or replace a cron schedule for a workflow or an agent poll.
+
+    Body: { name, kind: "workflow" | "agent_poll", target, cron, params?, overlap?: "skip" | "queue", jitter_seconds? }
+    """
+    schedule = Schedule(
+        name=req.name,
+        kind=req.kind,
+        target=req.target,
+        cron=req.cron,
+        params=req.params or {},
+        overlap=req.overlap,
+        jitter_seconds=req.jitter_seconds,
+        enabled=req.enabled,
+    )
+    try:
+        saved = await scheduler.add_schedule(schedule)
+        return {"schedule": saved.to_dict()}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Failed to save schedule: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.delete("/schedules/{name}")
+async def delete_schedule(name: str):
+    if not await scheduler.remove_schedule(name):
+        raise HTTPException(status_code=404, detail="Unknown schedule")
+    return {"deleted": name}
+
+
 class SlackSendRequest(BaseModel):
     channel: str
     text: str
@@ -118,7 +335,7 @@ async def send_slack(req: SlackSendRequest):
 async def get_workflow_logs(limit: int = 50, offset: int = 0, query: Optional[str] = None):
     try:
         runs = await store.list_runs(limit=limit, offset=offset, query=query)
-        return {"runs": runs}
+        return FastJSONResponse({"runs": runs})
     except Exception as e:
         logger.exception("Failed to fetch workflow logs: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -218,35 +435,29 @@ async def analytics_trends(days: int = 30, workflow: Optional[str] = None, start
 
 
 @app.get("/agents/status")
-async def agents_status():
-    """Return connectivity status for configured agents (Slack/Gmail/Notion)."""
+async def agents_status(refresh: bool = False):
+    """Return connectivity status for configured agents (Slack/Gmail/Notion).
+
+    Probes run concurrently and are cached briefly; pass `refresh=true` to re-probe.
+    """
     try:
-        statuses = {}
-        try:
-            statuses["slack"] = await slack_agent.connect()
-        except Exception as e:
-            statuses["slack"] = {"status": "error", "error": str(e)}
-        # Gmail and Notion agents may be created on demand
-        from src.agents.gmail_agent import GmailAgent
-        from src.agents.notion_agent import NotionAgent
-
-        gmail = GmailAgent()
-        notion = NotionAgent()
-        try:
-            statuses["gmail"] = await gmail.connect()
-        except Exception as e:
-            statuses["gmail"] = {"status": "error", "error": str(e)}
-        try:
-            statuses["notion"] = await notion.connect()
-        except Exception as e:
-            statuses["notion"] = {"status": "error", "error": str(e)}
-
-        return {"agents": statuses}
+        statuses = await agents.status(refresh=refresh)
+        return {"agents": statuses, "expires_in": agents.expires_in()}
     except Exception as e:
         logger.exception("Failed to fetch agent statuses: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/agents/sync_state")
+async def agents_sync_state():
+    """Return the stored incremental-polling cursor for each agent and source."""
+    try:
+        return {"sync_state": await store.list_sync_state()}
+    except Exception as e:
+        logger.exception("Failed to list sync state: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 class AgentActionRequest(BaseModel):
     action: str
     payload: Optional[Dict[str, Any]] = None
@@ -255,33 +466,177 @@ class AgentActionRequest(BaseModel):
 @app.post("/agents/{agent}/action")
 async def agent_action(agent: str, req: AgentActionRequest):
     """Trigger a simple agent action for testing (e.g., send test Slack message)."""
+    agent = agent.lower()
+    try:
+        instance = agents.get(agent)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown agent")
     try:
-        agent = agent.lower()
         if agent == "slack":
             # send a test message to channel in payload.channel
             chan = (req.payload or {}).get("channel", "#general")
             text = (req.payload or {}).get("text", "Test message from AIOCC")
-            res = await slack_agent.act(chan, text)
-            return {"result": res}
-        elif agent == "gmail":
-            from src.agents.gmail_agent import GmailAgent
-
-            g = GmailAgent()
-            res = await g.act(req.action, req.payload or {})
-            return {"result": res}
-        elif agent == "notion":
-            from src.agents.notion_agent import NotionAgent
-
-            n = NotionAgent()
-            res = await n.act(req.action, req.payload or {})
-            return {"result": res}
+            res = await instance.act(chan, text)
         else:
-            raise HTTPException(status_code=404, detail="Unknown agent")
+            res = await instance.act(req.action, req.payload or {})
+        return {"result": res}
     except Exception as e:
         logger.exception("Agent action failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class AgentIngestRequest(BaseModel):
+    # passed to the agent's iter_items(), e.g. {"channel": "#ops"} or {"label": "INBOX"}
+    params: Dict[str, Any] = {}
+    batch_size: int = 100
+
+
+@app.post("/agents/{agent}/ingest")
+async def agent_ingest(agent: str, req: AgentIngestRequest):
+    """Stream everything new from an agent into the task store."""
+    try:
+        instance = agents.get(agent.lower())
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown agent")
+    try:
+        return {"agent": agent, "ingested": await ingest_agent(store, instance, batch_size=req.batch_size, **req.params)}
+    except TypeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Agent ingest failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/webhooks/slack/events")
+async def slack_events(request: Request):
+    """Slack Events API callback: verify, answer url_verification, queue new messages."""
+    if not settings.SLACK_SIGNING_SECRET:
+        raise HTTPException(status_code=503, detail="SLACK_SIGNING_SECRET is not configured")
+    body = await request.body()
+    if not verify_slack_signature(
+        settings.SLACK_SIGNING_SECRET,
+        request.headers.get("X-Slack-Request-Timestamp"),
+        body,
+        request.headers.get("X-Slack-Signature"),
+    ):
+        raise HTTPException(status_code=401, detail="Invalid Slack signature")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if payload.get("type") == "url_verification":
+        return {"challenge": payload.get("challenge")}
+    event_id = payload.get("event_id")
+    if payload.get("type") != "event_callback" or not event_id:
+        return {"ok": True, "queued": False}
+    if event_dedup.seen(f"slack:{event_id}"):
+        return {"ok": True, "queued": False, "duplicate": True}
+    item = slack_event_to_item(payload)
+    task = item_to_task("slack", item) if item else None
+    if task is None:
+        return {"ok": True, "queued": False}
+    search_index.index_item("slack", item)
+    if not event_queue.submit(task, key=f"slack:{event_id}"):
+        # let Slack redeliver once the queue has drained
+        event_dedup.forget(f"slack:{event_id}")
+        raise HTTPException(status_code=503, detail="Ingest queue is full")
+    return {"ok": True, "queued": True}
+
+
+@app.post("/webhooks/gmail/push")
+async def gmail_push(request: Request, token: Optional[str] = None):
+    """Gmail Pub/Sub push: verify the URL token, then sync the mailbox in the background."""
+    if not settings.GMAIL_PUSH_TOKEN:
+        raise HTTPException(status_code=503, detail="GMAIL_PUSH_TOKEN is not configured")
+    if not verify_token(settings.GMAIL_PUSH_TOKEN, token):
+        raise HTTPException(status_code=401, detail="Invalid push token")
+    try:
+        message_id, data = decode_pubsub_push(await request.json())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if event_dedup.seen(f"gmail:{message_id}"):
+        return {"ok": True, "queued": False, "duplicate": True}
+    # the notification only carries the new history id; the agent fetches
+    # everything after its stored cursor, so bursts collapse into one sync
+    gmail = agents.get("gmail")
+    started = event_queue.request_sync("gmail", lambda: ingest_agent(store, gmail, label=settings.GMAIL_PUSH_LABEL))
+    return {"ok": True, "queued": started, "history_id": data.get("historyId")}
+
+
+@app.get("/metrics/webhooks")
+def webhook_metrics():
+    """Return ingest queue depth, batch counts and duplicate webhook deliveries."""
+    return {"ingest_queue": event_queue.stats(), "dedup": event_dedup.stats()}
+
+
+@app.get("/metrics/rate_limits")
+def rate_limit_metrics():
+    """Return per-tool rate limiter wait times and in-flight counts."""
+    return {"tools": rate_limiter.metrics()}
+
+
+@app.get("/metrics/step_cache")
+def step_cache_metrics():
+    """Return hit/miss counters for cached read-only workflow steps."""
+    return {"step_cache": planner.step_cache.stats()}
+
+
+@app.get("/metrics/summaries")
+def summary_metrics():
+    """Return summarize cache hit rate, batches sent, tokens and model time saved."""
+    return {"summaries": planner.summarizer.stats() if planner.summarizer is not None else {"enabled": False}}
+
+
+@app.get("/metrics/slack_outbox")
+def slack_outbox_metrics():
+    """Return queued messages per channel and messages vs API calls for outbound Slack."""
+    return {"slack_outbox": slack_agent.outbox.stats()}
+
+
+@app.get("/metrics/reminders")
+def reminder_metrics():
+    """Return tracked deadlines, the next timer and how late timers fired."""
+    return {"reminders": reminder_agent.stats()}
+
+
+@app.get("/escalations")
+def escalations():
+    """Return the configured escalation rules and recent escalations."""
+    return {"rules": [r.spec for r in escalation_agent.rules.rules.values()], "stats": escalation_agent.stats()}
+
+
+@app.get("/metrics/dedup")
+def dedup_metrics():
+    """Return how many inserted tasks were checked, compared and linked as near-duplicates."""
+    return {"dedup": store.dedup.stats() if store.dedup is not None else {"enabled": False}}
+
+
+@app.get("/metrics/drive")
+def drive_metrics():
+    """Return Drive scan counters: files listed, skipped as unchanged, downloaded and bytes read."""
+    return {"drive": drive_agent.stats()}
+
+
+@app.get("/metrics/polling")
+def polling_metrics():
+    """Return per-agent poll intervals, lag, errors and items per poll."""
+    return poll_supervisor.metrics()
+
+
+@app.get("/search")
+def search(q: str, limit: int = 10, source: Optional[List[str]] = Query(default=None)):
+    """Search locally indexed tasks, messages and pages without upstream calls."""
+    return search_index.search(q, limit=limit, sources=source)
+
+
+@app.get("/metrics/search_index")
+def search_index_metrics():
+    """Return document and term counts for the local search index."""
+    return {"search_index": search_index.stats()}
+
+
 @app.get("/integrations")
 def integrations():
     """Return which integrations appear configured. This endpoint does NOT return secrets.
@@ -0,0 +1,94 @@
+"""Benchmark JSON serialization and compression for a page of workflow run logs.
+
+Runs `weekly_review` a few times against the ToolRouterStub to get realistic
+run records (executions plus timeline), repeats them into a `/workflows/logs`
+page of `--runs` entries, then reports encode time and bytes on the wire for:
+
+  - FastAPI's default path (jsonable_encoder + JSONResponse)
+  - FastJSONResponse (orjson when installed)
+  - gzip and, if the `brotli` package is installed, brotli on top
+
+Usage:
+  python -m scripts.bench_responses --runs 1000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import zlib
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from src.core import responses
+from src.core.responses import FastJSONResponse
+from src.core.summary_cache import LocalModelClient, Summarizer
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+async def sample_runs(count: int):
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    planner = WorkflowPlanner(router=ToolRouterStub(), store=store, summarizer=Summarizer(LocalModelClient(latency=0)))
+    for i in range(20):
+        await store.add_task_async("notion", f"Follow up on item {i}", owner=f"user{i % 5}")
+    for i in range(count):
+        await planner.run("weekly_review", params={"channel": f"#team{i}", "manager_email": f"m{i}@example.com"})
+    runs = await store.list_runs(limit=count)
+    await store.disconnect()
+    return runs
+
+
+def build_page(samples, size: int):
+    page = []
+    for i in range(size):
+        run = dict(samples[i % len(samples)])
+        run["id"] = i + 1
+        page.append(run)
+    return {"runs": page}
+
+
+def timed(fn, repeat: int):
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def main(args) -> None:
+    page = build_page(asyncio.run(sample_runs(args.samples)), args.runs)
+    rows = []
+    t_std, body_std = timed(lambda: JSONResponse(jsonable_encoder(page)).body, args.repeat)
+    rows.append(("jsonable_encoder + json", t_std, len(body_std)))
+    t_fast, body = timed(lambda: FastJSONResponse(page).body, args.repeat)
+    rows.append((f"FastJSONResponse ({'orjson' if responses._ORJSON_AVAILABLE else 'json'})", t_fast, len(body)))
+    t_gz, gz = timed(lambda: zlib.compress(body, args.gzip_level), args.repeat)
+    rows.append((f"  + gzip level {args.gzip_level}", t_fast + t_gz, len(gz)))
+    if responses._BROTLI_AVAILABLE:
+        t_br, br = timed(lambda: responses.brotli.compress(body, quality=args.brotli_quality), args.repeat)
+        rows.append((f"  + brotli quality {args.brotli_quality}", t_fast + t_br, len(br)))
+    else:
+        rows.append(("  + brotli", None, None))
+
+    print(f"page of {args.runs} runs, median of {args.repeat}")
+    print(f"{'encoding':32} {'time':>10} {'bytes':>12} {'vs default':>11}")
+    for name, seconds, size in rows:
+        if seconds is None:
+            print(f"{name:32} {'(brotli not installed)':>35}")
+            continue
+        print(f"{name:32} {seconds * 1000:8.1f}ms {size:12,d} {size / len(body_std):10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1000, help="runs per log page")
+    parser.add_argument("--samples", type=int, default=25, help="distinct runs executed to build the page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--gzip-level", type=int, default=6)
+    parser.add_argument("--brotli-quality", type=int, default=4)
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+"""Measure summarize cache hit rates and latency savings offline.
+
+Runs `weekly_review` repeatedly against a TaskStore whose tasks change every
+`--change-every` runs, with the local stand-in model client, and reports the
+summary step latency for cold (model call) and warm (cache) runs. `--cold`
+disables the cache for comparison.
+
+Usage:
+  python -m scripts.bench_summarize --runs 40 --concurrency 4 --change-every 10 --latency 0.3
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from src.core.summary_cache import DiskLRUCache, LocalModelClient, Summarizer
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+from scripts.load_test_planner import percentile
+
+
+async def main(args):
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    client = LocalModelClient(latency=args.latency)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = None if args.cold else DiskLRUCache(args.cache_dir or cache_dir)
+        summarizer = Summarizer(client, cache, max_batch_tokens=args.batch_tokens)
+        planner = WorkflowPlanner(router=ToolRouterStub(), store=store, summarizer=summarizer)
+        for i in range(args.tasks):
+            await store.add_task_async("notion", f"Follow up on item {i} with team {i % 7}", owner=f"user{i % 5}")
+
+        latencies = {"cold": [], "warm": []}
+        started = time.perf_counter()
+        for wave in range(0, args.runs, args.concurrency):
+            if args.change_every and wave and wave % args.change_every < args.concurrency:
+                await store.add_task_async("gmail", f"New request #{wave} from finance", owner="finance")
+
+            async def one(i):
+                t0 = time.perf_counter()
+                summary = await planner.run("weekly_review", params={"channel": f"#team{i}", "manager_email": "m@example.com"})
+                step = next(ex for ex in summary["executions"] if ex.get("action") == "summarize")
+                latencies["warm" if step.get("cached") else "cold"].append(time.perf_counter() - t0)
+
+            await asyncio.gather(*(one(i) for i in range(wave, min(wave + args.concurrency, args.runs))))
+        elapsed = time.perf_counter() - started
+    await store.disconnect()
+
+    stats = summarizer.stats()
+    print(f"runs:          {args.runs} in {elapsed:.2f}s")
+    print(f"model calls:   {client.calls} ({client.prompts} prompts, {client.tokens} tokens)")
+    print(f"hit rate:      {stats['hit_rate']:.1%} (hits {stats['hits']}, shared {stats['shared_inflight']}, misses {stats['misses']})")
+    for kind, values in latencies.items():
+        if values:
+            print(f"{kind:5} runs:    {len(values):4d}  p50={percentile(values, 50) * 1000:.1f}ms  p95={percentile(values, 95) * 1000:.1f}ms")
+    print(f"model time:    {stats['model_seconds']:.2f}s spent, ~{stats['est_seconds_saved']:.2f}s saved")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=50, help="tasks in the store before the first run")
+    parser.add_argument("--change-every", type=int, default=10, help="add a task every N runs (0 = never)")
+    parser.add_argument("--latency", type=float, default=0.3, help="stand-in model latency per call, seconds")
+    parser.add_argument("--batch-tokens", type=int, default=8000)
+    parser.add_argument("--cache-dir", default=None, help="defaults to a temporary directory")
+    parser.add_argument("--cold", action="store_true", help="disable the cache")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,87 @@
+"""Load-test the WorkflowPlanner against a fault-injecting ToolRouterStub.
+
+Runs a workflow many times concurrently and reports throughput, run latency
+percentiles and status counts. Profiles use the same format as the
+TOOLROUTER_STUB_FAULTS setting (see `src/core/fault_injection.py`).
+
+Usage:
+  python -m scripts.load_test_planner --runs 200 --concurrency 20 --seed 42 \
+      --faults '{"notion": {"latency": "longtail", "latency_ms": 40, "error_rate": 0.02}}'
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+from src.core.fault_injection import FaultInjector
+from src.core.rate_limiter import RateLimiter, ToolLimit, rate_limiter
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+DEFAULT_FAULTS = {
+    "gmail": {"latency": "normal", "latency_ms": 30, "jitter_ms": 10, "error_rate": 0.02},
+    "slack": {"latency": "fixed", "latency_ms": 15, "timeout_rate": 0.01, "hang_seconds": 5},
+    "notion": {"latency": "longtail", "latency_ms": 40, "tail": 1.0, "payload_bytes": 2048},
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+async def main(args):
+    faults = FaultInjector(json.loads(args.faults) if args.faults else DEFAULT_FAULTS, seed=args.seed)
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    # by default measure the planner and router, not the upstream rate limits
+    unlimited = ToolLimit(rate=1e9, burst=1e9, max_in_flight=10_000)
+    limiter = rate_limiter if args.rate_limits else RateLimiter({t: unlimited for t in ("slack", "gmail", "notion", "default")})
+    planner = WorkflowPlanner(router=ToolRouterStub(faults=faults), store=store, limiter=limiter)
+    planner.retry_backoff = args.backoff
+    planner.step_timeout = args.step_timeout
+    # measure the router, not the step cache
+    planner.step_cache.ttl_seconds = 0
+    gate = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    statuses = Counter()
+
+    async def one(i):
+        async with gate:
+            started = time.perf_counter()
+            summary = await planner.run(args.workflow, params={"channel": f"#load{i}", "database_id": "db_1", "manager_email": "m@example.com"})
+            latencies.append(time.perf_counter() - started)
+            statuses[summary.get("status")] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.runs)))
+    elapsed = time.perf_counter() - started
+    await store.disconnect()
+
+    print(json.dumps({
+        "runs": args.runs,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "runs_per_s": round(args.runs / elapsed, 1),
+        "latency_ms": {p: round(percentile(latencies, p) * 1000, 1) for p in (50, 90, 99)},
+        "statuses": dict(statuses),
+        "faults": faults.stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workflow", default="weekly_review_cross_tool")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--faults", default=None, help="JSON fault profiles")
+    parser.add_argument("--step-timeout", type=float, default=1.0)
+    parser.add_argument("--rate-limits", action="store_true", help="apply the production tool rate limits")
+    parser.add_argument("--backoff", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,116 @@
+"""Replay recorded Slack Events API and Gmail Pub/Sub deliveries against the webhooks.
+
+Events are read from a JSONL file, one per line:
+
+  {"kind": "slack", "payload": {"type": "event_callback", "event_id": "Ev1", "event": {...}}}
+  {"kind": "gmail", "data": {"emailAddress": "me@example.com", "historyId": "1234"}, "message_id": "1"}
+
+Slack bodies are signed with the signing secret and Gmail pushes carry the
+push token, exactly as the providers send them. Without a file, synthetic
+events are generated (`--duplicates` re-sends some, as providers do on retry).
+
+Usage:
+  python -m scripts.replay_webhooks --url http://localhost:8000 --slack-secret s3cr3t --gmail-token t0k3n
+  python -m scripts.replay_webhooks --file events.jsonl --url http://localhost:8000
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from src.core.config import settings
+from src.core.webhooks import build_pubsub_push, sign_slack_request
+
+SLACK_PATH = "/webhooks/slack/events"
+GMAIL_PATH = "/webhooks/gmail/push"
+
+
+def sample_events(count: int = 20, duplicates: float = 0.0, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Synthetic Slack messages plus a Gmail notification every fifth event."""
+    rng = random.Random(seed)
+    base = time.time()
+    events: List[Dict[str, Any]] = []
+    for i in range(count):
+        if i % 5 == 4:
+            event = {"kind": "gmail", "data": {"emailAddress": "ops@example.com", "historyId": str(1000 + i)}, "message_id": f"replay-{i}"}
+        else:
+            ts = f"{base + i:.6f}"
+            event = {
+                "kind": "slack",
+                "payload": {
+                    "type": "event_callback",
+                    "event_id": f"EvReplay{i}",
+                    "event_time": int(base),
+                    "event": {"type": "message", "channel": "C0REPLAY", "user": f"U{i % 3}", "text": f"Replayed message {i}", "ts": ts},
+                },
+            }
+        events.append(event)
+        if duplicates and rng.random() < duplicates:
+            events.append(event)
+    return events
+
+
+def load_events(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay(
+    client: Any,
+    events: Iterable[Dict[str, Any]],
+    slack_secret: Optional[str] = None,
+    gmail_token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """POST every event through `client` (an httpx.Client or a FastAPI TestClient).
+
+    Returns status-code counts per kind and the response bodies in order.
+    """
+    slack_secret = slack_secret or settings.SLACK_SIGNING_SECRET or ""
+    gmail_token = gmail_token or settings.GMAIL_PUSH_TOKEN or ""
+    statuses: Counter = Counter()
+    responses: List[Dict[str, Any]] = []
+    for event in events:
+        kind = event.get("kind")
+        if kind == "slack":
+            body = json.dumps(event["payload"]).encode()
+            resp = client.post(SLACK_PATH, content=body, headers=sign_slack_request(slack_secret, body))
+        elif kind == "gmail":
+            push = build_pubsub_push(event["data"], str(event["message_id"]))
+            resp = client.post(GMAIL_PATH, params={"token": gmail_token}, json=push)
+        else:
+            raise ValueError(f"unknown event kind: {kind!r}")
+        statuses[f"{kind}:{resp.status_code}"] += 1
+        try:
+            responses.append(resp.json())
+        except ValueError:
+            responses.append({"status_code": resp.status_code})
+    return {"statuses": dict(statuses), "responses": responses}
+
+
+def main(args) -> None:
+    events = load_events(args.file) if args.file else sample_events(args.count, args.duplicates, args.seed)
+    started = time.perf_counter()
+    with httpx.Client(base_url=args.url, timeout=10.0) as client:
+        result = replay(client, events, args.slack_secret, args.gmail_token)
+    elapsed = time.perf_counter() - started
+    print(f"events:     {len(events)} in {elapsed:.2f}s ({len(events) / elapsed if elapsed else 0:.1f}/s)")
+    for key, n in sorted(result["statuses"].items()):
+        print(f"  {key}: {n}")
+    print(f"duplicates: {sum(1 for r in result['responses'] if r.get('duplicate'))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--file", help="JSONL file of recorded events")
+    parser.add_argument("--count", type=int, default=20, help="synthetic events when no file is given")
+    parser.add_argument("--duplicates", type=float, default=0.2, help="fraction of synthetic events re-sent")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--slack-secret", default=None, help="defaults to SLACK_SIGNING_SECRET")
+    parser.add_argument("--gmail-token", default=None, help="defaults to GMAIL_PUSH_TOKEN")
+    main(parser.parse_args())
@@ -1,10 +1,52 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.core.background_loop import background_loop
+from src.core.config import settings
+from src.core.router_adapter import as_async_router
+from src.utils.logger import get_logger
+
+logger = get_logger("BaseAgent")
+
+# fetch_page(cursor, page_token) -> (items, next_page_token, new_cursor)
+# stored as the cursor once an agent's mock-mode sample items have been synced
+MOCK_CURSOR = "mock"
+PageFetcher = Callable[[Optional[str], Optional[str]], Awaitable[Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]]]
+
+# (agent, key) -> cursor or scan state held back until the consumer has stored the items
+_pending_cursors: ContextVar[Optional[Dict[Tuple["BaseAgent", str], Any]]] = ContextVar("aiocc_pending_cursors", default=None)
+
+
+@contextmanager
+def deferred_cursors() -> Iterator[Dict[Tuple["BaseAgent", str], Any]]:
+    """Collect cursor advances instead of writing them; the caller commits them later.
+
+    Used by streaming ingestion so a cursor only moves once the items it
+    covers have been written, not merely fetched. Commit each entry with
+    `agent.commit_deferred(key, value)`.
+    """
+    pending: Dict[Tuple["BaseAgent", str], Any] = {}
+    token = _pending_cursors.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending_cursors.reset(token)
 
 
 class BaseAgent(ABC):
-    def __init__(self, router: Any):
+    # key for this agent's rows in the TaskStore sync_state table
+    name: str = "base"
+    # safety cap per sync; None follows pagination to the end
+    max_pages: Optional[int] = 1000
+    # whether polled items are tasks to ingest into the TaskStore
+    ingests_items: bool = True
+
+    def __init__(self, router: Any, store: Any = None):
         self.router = router
+        self.arouter = as_async_router(router) if router is not None else None
+        self.store = store
 
     @abstractmethod
     async def poll(self, *args: Any, **kwargs: Any) -> Any:
@@ -13,3 +55,97 @@ class BaseAgent(ABC):
     @abstractmethod
     async def act(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
         """Perform an action in the upstream tool (send message, create task)."""
+
+    def send_many(self, calls: Iterable[Union[Sequence[Any], Dict[str, Any]]], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sync bulk `act`: each call is a tuple of positional args or a dict of keyword args.
+
+        The calls run concurrently on the shared background loop (at most
+        `max_concurrency`, default BATCH_MAX_CONCURRENCY). Results are in input
+        order; a call that raised becomes `{"status": "error", "error": ...}`.
+        """
+        coros = [self.act(**c) if isinstance(c, dict) else self.act(*c) for c in calls]
+        results = background_loop.run_many(coros, max_concurrency or settings.BATCH_MAX_CONCURRENCY)
+        return [{"status": "error", "error": str(r) or type(r).__name__} if isinstance(r, BaseException) else r for r in results]
+
+    async def get_cursor(self, source: str) -> Optional[str]:
+        if self.store is None:
+            return None
+        return await self.store.get_cursor(self.name, source)
+
+    async def set_cursor(self, source: str, cursor: Optional[str]) -> None:
+        if self.store is None or not cursor:
+            return
+        if not self._defer(source, cursor):
+            await self.store.set_cursor(self.name, source, cursor)
+
+    def _defer(self, key: str, value: Any) -> bool:
+        """Hold `value` back if inside `deferred_cursors()`; False means write it now."""
+        pending = _pending_cursors.get()
+        if pending is None:
+            return False
+        pending[(self, key)] = value
+        return True
+
+    async def commit_deferred(self, key: str, value: Any) -> None:
+        """Write a value collected by `deferred_cursors()`; by default a sync cursor."""
+        await self.store.set_cursor(self.name, key, value)
+
+    async def iter_items(self, *args: Any, **kwargs: Any) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield polled items page by page.
+
+        Agents backed by paginated APIs override this to follow upstream
+        cursors lazily: the next page is requested only when the consumer asks
+        for it, so a slow consumer throttles the fetch. The default yields the
+        result of `poll()` as a single page.
+        """
+        items = await self.poll(*args, **kwargs)
+        if items:
+            yield list(items)
+
+    async def iter_mock_items(self, source: str, items: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield mock-mode sample `items` once per source.
+
+        The cursor is then set to MOCK_CURSOR, so later syncs against a store
+        yield nothing instead of ingesting the same samples again. Without a
+        store the samples are yielded on every call.
+        """
+        if await self.get_cursor(source) == MOCK_CURSOR:
+            return
+        yield items
+        await self.set_cursor(source, MOCK_CURSOR)
+
+    async def iter_since_cursor(self, source: str, fetch_page: PageFetcher) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of everything new since the stored cursor for `source`.
+
+        The cursor is persisted only once the last page has been consumed, so
+        a failed or abandoned sync resumes from the previous position instead
+        of skipping items.
+        """
+        cursor = await self.get_cursor(source)
+        newest = cursor
+        page_token: Optional[str] = None
+        pages = 0
+        while True:
+            page, page_token, page_cursor = await fetch_page(cursor, page_token)
+            pages += 1
+            if page_cursor and (newest is None or _cursor_after(page_cursor, newest)):
+                newest = page_cursor
+            if page:
+                yield page
+            if not page_token:
+                break
+            if self.max_pages and pages >= self.max_pages:
+                # leave the cursor alone: pages may arrive newest-first, so
+                # advancing it now could skip the older items not yet fetched
+                logger.warning("%s sync of %s stopped after %s pages; cursor not advanced", self.name, source, pages)
+                return
+        if newest != cursor:
+            await self.set_cursor(source, newest)
+
+
+def _cursor_after(a: str, b: str) -> bool:
+    """Compare cursors numerically when both are numbers (ts, history ids), else as strings (ISO times)."""
+    try:
+        return float(a) > float(b)
+    except (TypeError, ValueError):
+        return str(a) > str(b)
@@ -1,12 +1,272 @@
-from typing import Dict, Any
+"""Google Drive agent that scans documents for action items.
+
+Each scan lists files (metadata only) and compares every file's revision with
+the `drive_documents` table in the TaskStore; unchanged files are skipped
+without downloading. Changed files are streamed in chunks through a SHA-256
+hash and an incremental line parser, so memory per download stays at about
+one chunk plus one line. If the content hash matches the stored one (e.g. only
+the title changed) nothing is emitted. Otherwise the action items not seen in
+the previous scan of that document are yielded. Downloads run in parallel up
+to `max_concurrency`.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import codecs
+import hashlib
+import re
+
+import httpx
+
+from src.core.config import settings
+from src.core.rate_limiter import rate_limiter
+from src.core.search_index import search_index
+from src.utils.logger import get_logger
 from .base_agent import BaseAgent
 
+logger = get_logger("DriveAgent")
+
+GOOGLE_DOC = "application/vnd.google-apps.document"
+# Google Docs are exported as text; these are downloaded as-is
+TEXT_MIME_TYPES = ("text/plain", "text/markdown", "text/csv")
+FILE_FIELDS = "nextPageToken,files(id,name,mimeType,version,headRevisionId,md5Checksum,modifiedTime)"
+
+ACTION_LINE = re.compile(
+    r"^\s*(?:[-*]\s*\[ \]\s*|(?:TODO|FIXME|action item|action|AI)\s*[:\-]\s*)(?P<text>\S.*?)\s*$",
+    re.IGNORECASE,
+)
+MENTION = re.compile(r"@([\w.\-]+)")
+
+
+def revision_of(file: Dict[str, Any]) -> Optional[str]:
+    """Drive's change marker for a file: version, then head revision, checksum or mtime."""
+    for key in ("version", "headRevisionId", "md5Checksum", "modifiedTime"):
+        if file.get(key):
+            return str(file[key])
+    return None
+
+
+class ActionItemParser:
+    """Finds action-item lines in text fed as byte chunks of any size.
+
+    Keeps only the current partial line (capped at `max_line_chars`) between
+    chunks; multi-byte characters split across chunks are decoded correctly.
+    """
+
+    def __init__(self, max_line_chars: int = 2000):
+        self.max_line_chars = max_line_chars
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = ""
+        self._overflow = False
+        self.lines = 0
+        self.max_buffered = 0
+
+    def feed(self, chunk: bytes) -> List[str]:
+        return self._lines(self._decoder.decode(chunk))
+
+    def close(self) -> List[str]:
+        found = self._lines(self._decoder.decode(b"", final=True))
+        if self._partial:
+            found += self._match(self._partial)
+            self._partial = ""
+        return found
+
+    def _lines(self, text: str) -> List[str]:
+        found: List[str] = []
+        parts = text.split("\n")
+        for part in parts[:-1]:
+            found += self._match(self._partial + part if not self._overflow else self._partial)
+            self._partial, self._overflow = "", False
+        tail = parts[-1]
+        if not self._overflow:
+            self._partial += tail
+            if len(self._partial) > self.max_line_chars:
+                # keep the start of an overlong line and drop the rest until its newline
+                self._partial, self._overflow = self._partial[: self.max_line_chars], True
+        self.max_buffered = max(self.max_buffered, len(self._partial))
+        return found
+
+    def _match(self, line: str) -> List[str]:
+        self.lines += 1
+        m = ACTION_LINE.match(line.rstrip("\r"))
+        return [m.group("text")] if m else []
+
+
+def _item_hash(file_id: str, text: str) -> str:
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha1(f"{file_id}\n{normalized}".encode()).hexdigest()[:16]
+
 
 class DriveAgent(BaseAgent):
-    async def poll(self) -> None:
-        # stub: scan Drive for documents with action items
-        return
+    name = "drive"
+
+    def __init__(self, router=None, store=None, client: Optional[httpx.AsyncClient] = None, max_concurrency: Optional[int] = None, chunk_size: int = 64 * 1024):
+        super().__init__(router, store)
+        self.token = settings.DRIVE_API_TOKEN
+        self.max_concurrency = max(1, max_concurrency or settings.DRIVE_MAX_CONCURRENT_DOWNLOADS)
+        self.chunk_size = chunk_size
+        # an injected client (tests, fake server) is used even without a token
+        self._client = client
+        self.stats_counters = {"listed": 0, "unchanged": 0, "downloaded": 0, "same_content": 0, "bytes": 0, "items": 0, "errors": 0}
+
+    async def _ensure_client(self) -> Optional[httpx.AsyncClient]:
+        if self._client is None and self.token:
+            self._client = httpx.AsyncClient(
+                base_url=settings.DRIVE_API_URL,
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=httpx.Timeout(30.0, connect=10.0),
+            )
+        return self._client
+
+    async def connect(self) -> Dict[str, Any]:
+        client = await self._ensure_client()
+        if client is None:
+            logger.info("No DRIVE_API_TOKEN provided; DriveAgent in mock mode")
+            return {"status": "mock"}
+        async with rate_limiter.limit("drive"):
+            resp = await client.get("/about", params={"fields": "user"})
+        return {"status": "connected" if resp.status_code == 200 else "error", "http_status": resp.status_code}
+
+    async def poll(self, folder_id: Optional[str] = None, page_size: int = 100) -> List[Dict[str, Any]]:
+        """Return action items from documents changed since their last scan."""
+        try:
+            return [item async for page in self.iter_items(folder_id, page_size=page_size) for item in page]
+        except Exception as e:
+            logger.exception("Drive poll failed: %s", e)
+            return []
+
+    async def iter_items(self, folder_id: Optional[str] = None, page_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the new action items of each changed document, one document per page.
+
+        A document's scan state is saved once the consumer has taken its page;
+        under `deferred_cursors()` it is held back until the items are stored.
+        """
+        client = await self._ensure_client()
+        if client is None:
+            return
+        async for files in self._list_files(client, folder_id, page_size):
+            known = await self.store.get_drive_documents([f["id"] for f in files]) if self.store is not None else {}
+            changed = []
+            for f in files:
+                if f.get("mimeType") not in (GOOGLE_DOC, *TEXT_MIME_TYPES):
+                    continue
+                self.stats_counters["listed"] += 1
+                if f["id"] in known and known[f["id"]]["revision_id"] == revision_of(f):
+                    self.stats_counters["unchanged"] += 1
+                    continue
+                changed.append(f)
+            async for f, result in self._scan_all(client, changed, known):
+                if isinstance(result, Exception):
+                    self.stats_counters["errors"] += 1
+                    logger.warning("Drive scan of %s failed: %s", f.get("id"), result)
+                    continue
+                content_hash, items, item_hashes = result
+                if items:
+                    search_index.index_items("drive", items)
+                    yield items
+                if self.store is not None:
+                    state = (f.get("name"), revision_of(f), content_hash, item_hashes)
+                    if not self._defer(f"document:{f['id']}", state):
+                        await self.store.save_drive_document(f["id"], *state)
+
+    async def commit_deferred(self, key: str, value: Any) -> None:
+        if key.startswith("document:"):
+            await self.store.save_drive_document(key.partition(":")[2], *value)
+        else:
+            await super().commit_deferred(key, value)
+
+    async def _list_files(self, client: httpx.AsyncClient, folder_id: Optional[str], page_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        query = "trashed = false" + (f" and '{folder_id}' in parents" if folder_id else "")
+        page_token: Optional[str] = None
+        while True:
+            params = {"q": query, "pageSize": page_size, "fields": FILE_FIELDS}
+            if page_token:
+                params["pageToken"] = page_token
+            async with rate_limiter.limit("drive"):
+                resp = await client.get("/files", params=params)
+            resp.raise_for_status()
+            body = resp.json()
+            yield body.get("files", [])
+            page_token = body.get("nextPageToken")
+            if not page_token:
+                return
+
+    async def _scan_all(
+        self, client: httpx.AsyncClient, files: List[Dict[str, Any]], known: Dict[str, Dict[str, Any]]
+    ) -> AsyncIterator[Tuple[Dict[str, Any], Any]]:
+        """Scan files with up to `max_concurrency` downloads in flight, yielding results as they finish.
+
+        The result queue holds at most `max_concurrency` finished documents, so
+        a slow consumer pauses the workers instead of buffering every result.
+        """
+        if not files:
+            return
+        queue: "asyncio.Queue[Tuple[Dict[str, Any], Any]]" = asyncio.Queue(maxsize=self.max_concurrency)
+        pending = iter(files)
+
+        async def worker() -> None:
+            for f in pending:
+                try:
+                    result: Any = await self._scan_document(client, f, known.get(f["id"]))
+                except Exception as e:
+                    result = e
+                await queue.put((f, result))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrency, len(files)))]
+        try:
+            for _ in range(len(files)):
+                yield await queue.get()
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _scan_document(self, client: httpx.AsyncClient, f: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]], List[str]]:
+        """Stream one document, returning (content hash, new items, hashes of all items)."""
+        if f.get("mimeType") == GOOGLE_DOC:
+            url, params = f"/files/{f['id']}/export", {"mimeType": "text/plain"}
+        else:
+            url, params = f"/files/{f['id']}", {"alt": "media"}
+        digest = hashlib.sha256()
+        parser = ActionItemParser()
+        texts: List[str] = []
+        async with rate_limiter.limit("drive"):
+            async with client.stream("GET", url, params=params) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_bytes(self.chunk_size):
+                    digest.update(chunk)
+                    self.stats_counters["bytes"] += len(chunk)
+                    texts += parser.feed(chunk)
+        texts += parser.close()
+        self.stats_counters["downloaded"] += 1
+        content_hash = digest.hexdigest()
+        if previous and previous.get("content_hash") == content_hash:
+            self.stats_counters["same_content"] += 1
+            return content_hash, [], previous.get("item_hashes") or []
+        seen = set((previous or {}).get("item_hashes") or [])
+        items, hashes = [], []
+        for text in texts:
+            h = _item_hash(f["id"], text)
+            if h in hashes:
+                continue
+            hashes.append(h)
+            if h not in seen:
+                mention = MENTION.search(text)
+                items.append(
+                    {
+                        "id": f"{f['id']}:{h}",
+                        "title": text,
+                        "description": f"From Drive document '{f.get('name')}'",
+                        "owner": mention.group(1) if mention else None,
+                        "file_id": f["id"],
+                    }
+                )
+        self.stats_counters["items"] += len(items)
+        return content_hash, items, hashes
 
     async def act(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         # stub: create document or add comment
         return {"status": "ok"}
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.stats_counters, max_concurrency=self.max_concurrency)
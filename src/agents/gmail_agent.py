@@ -1,9 +1,14 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 import asyncio
 from datetime import datetime
 
+from src.core.background_loop import background_loop
 from src.core.config import settings
 from src.utils.logger import get_logger
+from src.core.rate_limiter import rate_limiter
+from src.core.deadline import bounded
+from src.core.search_index import search_index
+from .base_agent import BaseAgent
 
 logger = get_logger("GmailAgent")
 
@@ -16,14 +21,17 @@ except Exception:
     GmailClient = None
 
 
-class GmailAgent:
+class GmailAgent(BaseAgent):
     """Simple Gmail agent (mock-first) that can poll and act on messages.
 
-    Methods are async to match the rest of the agents.
+    Methods are async to match the rest of the agents. With a `store`, polls
+    resume from the label's stored Gmail history id.
     """
 
-    def __init__(self, router=None):
-        self.router = router
+    name = "gmail"
+
+    def __init__(self, router=None, store=None):
+        super().__init__(router, store)
         self.token = getattr(settings, "GMAIL_API_KEY", None)
         self._client = None
 
@@ -49,27 +57,50 @@ class GmailAgent:
 
     async def poll(self, label: str = "STARRED", limit: int = 10) -> List[Dict[str, Any]]:
         """Return a list of message dicts. In mock mode returns sample messages."""
+        try:
+            return [m async for page in self.iter_items(label, page_size=limit) for m in page]
+        except Exception as e:
+            logger.exception("Gmail poll failed: %s", e)
+            return []
+
+    async def iter_items(self, label: str = "STARRED", page_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of messages added since the stored history id, fetching lazily."""
         if not self.token:
             now = datetime.utcnow().isoformat()
-            return [
+            msgs = [
                 {"id": "m1", "subject": "Weekly update", "from": "alice@example.com", "snippet": "Here are my updates", "ts": now},
                 {"id": "m2", "subject": "Action needed", "from": "bob@example.com", "snippet": "Please review", "ts": now},
             ]
+            async for page in self.iter_mock_items(label, msgs):
+                search_index.index_items("gmail", page)
+                yield page
+            return
 
         client = await self._ensure_client()
         if client:
             # integrate with real Gmail API
-            try:
-                res = client.fetch_messages(label=label, limit=limit)
+            async for page in self.iter_since_cursor(label, self._page_fetcher(client, label, page_size)):
+                search_index.index_items("gmail", page)
+                yield page
+
+    @staticmethod
+    def _page_fetcher(client: Any, label: str, limit: int):
+        async def fetch_page(history_id: Optional[str], page_token: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+            # the client returns either a plain list (one page) or
+            # {"messages", "next_page_token", "history_id"}; with a history id
+            # only messages added since then are returned
+            async with rate_limiter.limit("gmail"):
+                res = client.fetch_messages(label=label, limit=limit, history_id=history_id, page_token=page_token)
                 if asyncio.iscoroutine(res):
-                    msgs = await res  # type: ignore
-                else:
-                    msgs = res
-                return msgs
-            except Exception as e:
-                logger.exception("Gmail poll failed: %s", e)
-                return []
-        return []
+                    res = await bounded(res)  # type: ignore
+            if isinstance(res, dict):
+                msgs = res.get("messages", []) or []
+                return msgs, res.get("next_page_token"), res.get("history_id")
+            msgs = list(res or [])
+            newest = max((str(m["historyId"]) for m in msgs if m.get("historyId")), key=int, default=None)
+            return msgs, None, newest
+
+        return fetch_page
 
     async def act(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Perform actions like mark_processed or send_followup."""
@@ -81,14 +112,16 @@ class GmailAgent:
         if client:
             try:
                 if action == "mark_processed":
-                    res = client.mark_message(payload.get("id"))
-                    if asyncio.iscoroutine(res):
-                        res = await res  # type: ignore
+                    async with rate_limiter.limit("gmail"):
+                        res = client.mark_message(payload.get("id"))
+                        if asyncio.iscoroutine(res):
+                            res = await bounded(res)  # type: ignore
                     return {"status": "ok", "result": res}
                 elif action == "send_followup":
-                    res = client.send_message(payload)
-                    if asyncio.iscoroutine(res):
-                        res = await res  # type: ignore
+                    async with rate_limiter.limit("gmail"):
+                        res = client.send_message(payload)
+                        if asyncio.iscoroutine(res):
+                            res = await bounded(res)  # type: ignore
                     return {"status": "ok", "result": res}
             except Exception as e:
                 logger.exception("Gmail act failed: %s", e)
@@ -97,5 +130,5 @@ class GmailAgent:
 
     # sync compatibility
     def send(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        return asyncio.run(self.act(action, payload))
+        return background_loop.run(self.act(action, payload))
 
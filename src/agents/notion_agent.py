@@ -1,9 +1,13 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 import asyncio
 from datetime import datetime
 
+from src.core.background_loop import background_loop
 from src.core.config import settings
 from src.utils.logger import get_logger
+from src.core.rate_limiter import rate_limiter
+from src.core.deadline import bounded
+from src.core.search_index import search_index
 from .base_agent import BaseAgent
 
 logger = get_logger("NotionAgent")
@@ -16,8 +20,12 @@ except Exception:
 
 
 class NotionAgent(BaseAgent):
-    def __init__(self, router=None):
-        super().__init__(router)
+    """Notion agent; with a `store`, polls fetch only pages edited since the stored `last_edited_time`."""
+
+    name = "notion"
+
+    def __init__(self, router=None, store=None):
+        super().__init__(router, store)
         self.token = getattr(settings, "NOTION_API_KEY", None)
         self._client = None
 
@@ -40,25 +48,48 @@ class NotionAgent(BaseAgent):
         return {"status": "mock"}
 
     async def poll(self, database_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        try:
+            return [t async for page in self.iter_items(database_id, page_size=limit) for t in page]
+        except Exception as e:
+            logger.exception("Notion poll failed: %s", e)
+            return []
+
+    async def iter_items(self, database_id: Optional[str] = None, page_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of tasks edited since the stored cursor, fetching lazily."""
         if not self.token:
             now = datetime.utcnow().isoformat()
-            return [
+            tasks = [
                 {"id": "t1", "title": "Finish report", "status": "open", "ts": now},
                 {"id": "t2", "title": "Plan meeting", "status": "open", "ts": now},
             ]
+            async for page in self.iter_mock_items(database_id or "default", tasks):
+                search_index.index_items("notion", page)
+                yield page
+            return
         client = await self._ensure_client()
         if client:
-            try:
-                res = client.query_tasks(database_id=database_id, limit=limit)
+            async for page in self.iter_since_cursor(database_id or "default", self._page_fetcher(client, database_id, page_size)):
+                search_index.index_items("notion", page)
+                yield page
+
+    @staticmethod
+    def _page_fetcher(client: Any, database_id: Optional[str], limit: int):
+        async def fetch_page(edited_after: Optional[str], start_cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+            # the client returns a plain list (one page) or a Notion-style
+            # {"results", "has_more", "next_cursor"}
+            async with rate_limiter.limit("notion"):
+                res = client.query_tasks(database_id=database_id, limit=limit, edited_after=edited_after, start_cursor=start_cursor)
                 if asyncio.iscoroutine(res):
-                    tasks = await res  # type: ignore
-                else:
-                    tasks = res
-                return tasks
-            except Exception as e:
-                logger.exception("Notion poll failed: %s", e)
-                return []
-        return []
+                    res = await bounded(res)  # type: ignore
+            if isinstance(res, dict):
+                tasks = res.get("results", []) or []
+                next_cursor = res.get("next_cursor") if res.get("has_more") else None
+            else:
+                tasks, next_cursor = list(res or []), None
+            newest = max((t["last_edited_time"] for t in tasks if t.get("last_edited_time")), default=None)
+            return tasks, next_cursor, newest
+
+        return fetch_page
 
     async def act(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         # create page or update task
@@ -69,21 +100,24 @@ class NotionAgent(BaseAgent):
         if client:
             try:
                 if action == "create_summary_page":
-                    res = client.create_page(payload)
-                    if asyncio.iscoroutine(res):
-                        page = await res  # type: ignore
-                    else:
-                        page = res
+                    async with rate_limiter.limit("notion"):
+                        res = client.create_page(payload)
+                        if asyncio.iscoroutine(res):
+                            page = await bounded(res)  # type: ignore
+                        else:
+                            page = res
                     return {"status": "ok", "page_id": page.get("id")}
                 elif action == "update_task":
-                    res = client.update_task(payload.get("id"), payload)
-                    if asyncio.iscoroutine(res):
-                        res = await res  # type: ignore
+                    async with rate_limiter.limit("notion"):
+                        res = client.update_task(payload.get("id"), payload)
+                        if asyncio.iscoroutine(res):
+                            res = await bounded(res)  # type: ignore
                     return {"status": "ok", "result": res}
             except Exception as e:
                 logger.exception("Notion act failed: %s", e)
                 return {"status": "error", "error": str(e)}
         return {"status": "error", "error": "no-client"}
 
+    # sync compatibility
     def send(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        return asyncio.run(self.act(action, payload))
+        return background_loop.run(self.act(action, payload))
@@ -0,0 +1,111 @@
+"""Process-wide registry of long-lived agents.
+
+Each agent keeps its upstream client between requests. Status probes run
+concurrently with a per-agent timeout, and the combined result is cached for
+a short TTL. Concurrent refreshes share one probe.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from src.core.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger("AgentRegistry")
+
+
+class AgentRegistry:
+    """Named agent instances plus a TTL-cached, concurrently probed status."""
+
+    def __init__(self, status_ttl: float = 15.0, probe_timeout: float = 5.0):
+        self.status_ttl = status_ttl
+        self.probe_timeout = probe_timeout
+        self._agents: Dict[str, Any] = {}
+        self._status: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._refresh: Optional[asyncio.Future] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_settings(cls, router: Any = None, store: Any = None, slack_agent: Any = None) -> "AgentRegistry":
+        from src.agents.gmail_agent import GmailAgent
+        from src.agents.notion_agent import NotionAgent
+        from src.agents.slack_agent import SlackAgent
+
+        registry = cls(status_ttl=settings.AGENT_STATUS_TTL_SECONDS, probe_timeout=settings.AGENT_STATUS_TIMEOUT_SECONDS)
+        registry.register("slack", slack_agent or SlackAgent(router=router, store=store))
+        registry.register("gmail", GmailAgent(router=router, store=store))
+        registry.register("notion", NotionAgent(router=router, store=store))
+        return registry
+
+    def register(self, name: str, agent: Any) -> None:
+        self._agents[name] = agent
+        self.invalidate()
+
+    def get(self, name: str) -> Any:
+        if name not in self._agents:
+            raise KeyError(f"agent not found: {name}")
+        return self._agents[name]
+
+    def names(self) -> List[str]:
+        return list(self._agents)
+
+    def invalidate(self) -> None:
+        self._status = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._refresh = None
+
+    async def _probe(self, name: str, agent: Any) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(agent.connect(), timeout=self.probe_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Status probe for %s timed out after %ss", name, self.probe_timeout)
+            result = {"status": "timeout", "error": f"no response within {self.probe_timeout}s"}
+        except Exception as e:
+            logger.exception("Status probe for %s failed: %s", name, e)
+            result = {"status": "error", "error": str(e)}
+        result = dict(result or {})
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
+        return result
+
+    async def _probe_all(self) -> Dict[str, Any]:
+        names = self.names()
+        results = await asyncio.gather(*(self._probe(n, self._agents[n]) for n in names))
+        statuses = dict(zip(names, results))
+        self._status = (time.monotonic() + self.status_ttl, statuses)
+        return statuses
+
+    async def status(self, refresh: bool = False) -> Dict[str, Any]:
+        """Connectivity status per agent, served from cache while fresh."""
+        self._bind_loop()
+        if not refresh and self._status is not None and self._status[0] > time.monotonic():
+            return dict(self._status[1])
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._probe_all())
+        return dict(await asyncio.shield(self._refresh))
+
+    def expires_in(self) -> Optional[float]:
+        """Seconds until the cached status expires, or None if there is none."""
+        if self._status is None:
+            return None
+        return max(0.0, self._status[0] - time.monotonic())
+
+    async def aclose(self) -> None:
+        """Close agent clients that support it."""
+        for name, agent in self._agents.items():
+            client = getattr(agent, "_client", None)
+            close = getattr(client, "aclose", None) or getattr(client, "close", None)
+            if close is None:
+                continue
+            try:
+                res = close()
+                if asyncio.iscoroutine(res):
+                    await res
+            except Exception as e:
+                logger.warning("Failed to close %s client: %s", name, e)
+            agent._client = None
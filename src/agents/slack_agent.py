@@ -1,9 +1,14 @@
-from typing import Dict, Any, List
-import asyncio
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 
+from src.core.background_loop import background_loop
 from src.core.config import settings
 from src.utils.logger import get_logger
+from src.core.rate_limiter import rate_limiter
+from src.core.deadline import bounded
+from src.core.search_index import search_index
+from .base_agent import BaseAgent
+from .slack_outbox import SlackOutbox
 
 logger = get_logger("SlackAgent")
 
@@ -17,17 +22,28 @@ except Exception:
     AsyncWebClient = None  # type: ignore
 
 
-class SlackAgent:
+class SlackAgent(BaseAgent):
     """Simple Slack agent that can send messages and poll a channel.
 
     If SLACK_BOT_TOKEN is set in `settings`, it will attempt to use the async
     slack_sdk client. Otherwise it falls back to mock behavior for local dev.
+    With a `store`, polls are incremental: only messages newer than the
+    channel's stored `oldest` ts are fetched. Outgoing messages go through a
+    per-channel `SlackOutbox`, which paces and coalesces bursts.
     """
 
-    def __init__(self, router=None):
-        self.router = router
+    name = "slack"
+
+    def __init__(self, router=None, store=None):
+        super().__init__(router, store)
         self.token = getattr(settings, "SLACK_BOT_TOKEN", None)
         self._client = None
+        self.outbox = SlackOutbox(
+            self._post,
+            window=settings.SLACK_COALESCE_WINDOW_SECONDS,
+            max_batch=settings.SLACK_COALESCE_MAX_MESSAGES,
+            mode=settings.SLACK_COALESCE_MODE,
+        )
 
     async def _ensure_client(self):
         if not self.token:
@@ -62,41 +78,78 @@ class SlackAgent:
         return {"status": "mock"}
 
     async def poll(self, channel: str, limit: int = 20) -> List[Dict[str, Any]]:
-        """Fetch recent messages from a channel. In mock mode return sample data."""
+        """Fetch messages from a channel since the last poll. In mock mode return sample data.
+
+        `limit` is the page size; pages are followed until caught up.
+        """
+        try:
+            return [m async for page in self.iter_items(channel, page_size=limit) for m in page]
+        except Exception as e:
+            logger.exception("Failed to poll Slack: %s", e)
+            return []
+
+    async def iter_items(self, channel: str, page_size: int = 200) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of channel messages since the stored cursor, fetching lazily."""
         if not self.token:
             # return mock data
-            now = datetime.utcnow().isoformat()
-            return [{"text": "Mock message 1", "ts": now}, {"text": "Mock message 2", "ts": now}]
+            now = datetime.utcnow().timestamp()
+            yield self._index(channel, [{"text": "Mock message 1", "ts": f"{now:.6f}"}, {"text": "Mock message 2", "ts": f"{now + 0.000001:.6f}"}])
+            return
 
         client = await self._ensure_client()
         if client:
-            try:
-                res = await client.conversations_history(channel=channel, limit=limit)
-                return res.get("messages", [])
-            except Exception as e:
-                logger.exception("Failed to poll Slack: %s", e)
-                return []
-        return []
+            async for page in self.iter_since_cursor(channel, self._page_fetcher(client, channel, page_size)):
+                yield self._index(channel, page)
+
+    @staticmethod
+    def _page_fetcher(client: Any, channel: str, limit: int):
+        async def fetch_page(oldest: Optional[str], page_token: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+            kwargs: Dict[str, Any] = {"channel": channel, "limit": limit}
+            if oldest:
+                # `oldest` is exclusive unless inclusive=True
+                kwargs["oldest"] = oldest
+            if page_token:
+                kwargs["cursor"] = page_token
+            async with rate_limiter.limit("slack"):
+                res = await bounded(client.conversations_history(**kwargs))
+            messages = res.get("messages", []) or []
+            next_token = (res.get("response_metadata") or {}).get("next_cursor") if res.get("has_more") else None
+            newest = max((m["ts"] for m in messages if m.get("ts")), key=float, default=None)
+            return messages, next_token or None, newest
+
+        return fetch_page
+
+    @staticmethod
+    def _index(channel: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # ts is only unique within a channel
+        search_index.index_items("slack", ({**m, "id": f"{channel}:{m.get('ts')}", "channel": channel} for m in messages))
+        return messages
 
     async def act(self, channel: str, text: str) -> Dict[str, Any]:
-        """Send message to a Slack channel. Uses real client if token present, otherwise mock."""
+        """Send message to a Slack channel. Uses real client if token present, otherwise mock.
+
+        The message is queued on the channel's outbox and may be delivered
+        together with others; the result describes this message's delivery.
+        """
         if not self.token:
             logger.info("Mock send to %s: %s", channel, text)
             return {"status": "mock", "channel": channel, "text": text}
 
         client = await self._ensure_client()
         if client:
-            try:
-                resp = await client.chat_postMessage(channel=channel, text=text)
-                return {"status": "ok", "ts": resp.get("ts"), "channel": resp.get("channel")}
-            except Exception as e:
-                logger.exception("Failed to send Slack message: %s", e)
-                return {"status": "error", "error": str(e)}
+            return await self.outbox.send(channel, text)
 
         # Final fallback
         logger.info("Fallback send to %s: %s", channel, text)
         return {"status": "mock", "channel": channel, "text": text}
 
+    async def _post(self, channel: str, text: str, thread_ts: Optional[str] = None) -> Dict[str, Any]:
+        client = await self._ensure_client()
+        kwargs: Dict[str, Any] = {"channel": channel, "text": text}
+        if thread_ts:
+            kwargs["thread_ts"] = thread_ts
+        return await bounded(client.chat_postMessage(**kwargs))
+
     # sync compatibility
     def send(self, channel: str, text: str) -> Dict[str, Any]:
-        return asyncio.run(self.act(channel, text))
+        return background_loop.run(self.act(channel, text))
@@ -0,0 +1,172 @@
+"""Per-channel outbound queue for Slack messages.
+
+Messages for a channel are sent by one worker at a time, paced by the shared
+per-channel rate limit. Messages that pile up while the worker waits (or
+arrive within `window` seconds of the first one) are coalesced: joined into a
+single message ("merge") or posted as one parent message plus one threaded
+reply ("thread"). Every caller still gets its own delivery result.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from dataclasses import dataclass
+import asyncio
+
+from src.core.loop_state import LoopLocal
+from src.core.rate_limiter import RateLimiter, rate_limiter
+from src.utils.logger import get_logger
+
+logger = get_logger("SlackOutbox")
+
+# post(channel, text, thread_ts) -> Slack API response
+PostFn = Callable[[str, str, Optional[str]], Awaitable[Dict[str, Any]]]
+
+COALESCE_MODES = ("merge", "thread")
+
+
+@dataclass
+class _Pending:
+    text: str
+    future: asyncio.Future
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds to wait if `exc` is a Slack rate-limit (HTTP 429) error."""
+    response = getattr(exc, "response", None)
+    if response is None or getattr(response, "status_code", None) != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class SlackOutbox:
+    """Coalescing, rate-paced sender; one worker task per busy channel."""
+
+    def __init__(
+        self,
+        post: PostFn,
+        window: float = 0.0,
+        max_batch: int = 20,
+        max_chars: int = 3000,
+        mode: str = "merge",
+        max_retries: int = 3,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        if mode not in COALESCE_MODES:
+            raise ValueError(f"mode must be one of {COALESCE_MODES}, got {mode!r}")
+        self.post = post
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self.max_chars = max_chars
+        self.mode = mode
+        self.max_retries = max_retries
+        self.limiter = limiter or rate_limiter
+        # queues and workers of each loop sending through this outbox
+        self._pending: LoopLocal[Dict[str, List[_Pending]]] = LoopLocal(dict)
+        self._workers: LoopLocal[Dict[str, asyncio.Task]] = LoopLocal(dict)
+        self.sent_messages = 0
+        self.api_calls = 0
+
+    async def send(self, channel: str, text: str) -> Dict[str, Any]:
+        """Queue a message and wait for its delivery result."""
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending.get().setdefault(channel, []).append(_Pending(text, fut))
+        workers = self._workers.get()
+        worker = workers.get(channel)
+        if worker is None or worker.done():
+            workers[channel] = asyncio.create_task(self._drain(channel), name=f"slack-outbox:{channel}")
+        return await asyncio.shield(fut)
+
+    def _take_batch(self, channel: str) -> List[_Pending]:
+        queue = self._pending.get().get(channel) or []
+        batch: List[_Pending] = []
+        size = 0
+        while queue and len(batch) < self.max_batch:
+            nxt = queue[0]
+            if batch and size + len(nxt.text) + 1 > self.max_chars:
+                break
+            batch.append(queue.pop(0))
+            size += len(nxt.text) + 1
+        return batch
+
+    async def _drain(self, channel: str) -> None:
+        try:
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            while self._pending.get().get(channel):
+                # wait for the channel's rate-limit token first, so messages
+                # arriving meanwhile join this batch
+                async with self.limiter.limit("slack", key=channel):
+                    batch = self._take_batch(channel)
+                    await self._deliver(channel, batch)
+        finally:
+            self._workers.get().pop(channel, None)
+            # only non-empty if the worker was cancelled; never leave callers waiting
+            for pending in self._pending.get().pop(channel, []):
+                if not pending.future.done():
+                    pending.future.set_result({"status": "error", "error": "outbox stopped before delivery"})
+
+    async def _post_with_retry(self, channel: str, text: str, thread_ts: Optional[str] = None) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            self.api_calls += 1
+            try:
+                return await self.post(channel, text, thread_ts)
+            except Exception as e:
+                delay = _retry_after(e)
+                attempt += 1
+                if delay is None or attempt > self.max_retries:
+                    raise
+                logger.warning("Slack rate limited on %s; retrying in %.1fs", channel, delay)
+                await asyncio.sleep(delay)
+
+    async def _deliver(self, channel: str, batch: List[_Pending]) -> None:
+        if not batch:
+            return
+        texts = [p.text for p in batch]
+        try:
+            if len(batch) == 1 or self.mode == "merge":
+                resp = await self._post_with_retry(channel, "\n".join(texts))
+                results = [{"status": "ok", "ts": resp.get("ts"), "channel": resp.get("channel", channel)} for _ in batch]
+            else:
+                parent = await self._post_with_retry(channel, texts[0])
+                results = [{"status": "ok", "ts": parent.get("ts"), "channel": parent.get("channel", channel)}]
+                try:
+                    reply = await self._post_with_retry(channel, "\n".join(texts[1:]), parent.get("ts"))
+                    reply_result = {"status": "ok", "ts": reply.get("ts"), "thread_ts": parent.get("ts"), "channel": reply.get("channel", channel)}
+                except Exception as e:
+                    # the parent went out; only the threaded messages failed
+                    logger.exception("Failed to send threaded Slack reply to %s: %s", channel, e)
+                    reply_result = {"status": "error", "error": str(e), "thread_ts": parent.get("ts")}
+                results += [dict(reply_result) for _ in batch[1:]]
+        except Exception as e:
+            logger.exception("Failed to send %s Slack message(s) to %s: %s", len(batch), channel, e)
+            results = [{"status": "error", "error": str(e)} for _ in batch]
+        self.sent_messages += len(batch)
+        for idx, (pending, result) in enumerate(zip(batch, results)):
+            if len(batch) > 1:
+                result = {**result, "coalesced": len(batch), "position": idx}
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been delivered."""
+        workers = self._workers.get()
+        while workers:
+            await asyncio.gather(*list(workers.values()), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        queued: Dict[str, int] = {}
+        for pending in self._pending.values():
+            for ch, p in pending.items():
+                if p:
+                    queued[ch] = queued.get(ch, 0) + len(p)
+        return {
+            "queued": queued,
+            "messages": self.sent_messages,
+            "api_calls": self.api_calls,
+            "window_s": self.window,
+            "mode": self.mode,
+        }
@@ -1,4 +1,6 @@
-from .task_store import TaskStore
+from datetime import datetime
+
+from .task_store import ACTIVE_STATUSES, TaskStore
 
 
 class AnalyticsEngine:
@@ -9,7 +11,9 @@ class AnalyticsEngine:
         tasks = await self.store.list_tasks_async()
         if not tasks:
             return 0.0
-        overdue = [t for t in tasks if t.status == "overdue"]
+        now = datetime.utcnow().isoformat()
+        # active tasks past their due time count even before the reminder timer has marked them
+        overdue = [t for t in tasks if t.status == "overdue" or (t.status in ACTIVE_STATUSES and t.due_at and t.due_at < now)]
         return len(overdue) / len(tasks) * 100.0
 
     async def active_tasks_count(self) -> int:
@@ -0,0 +1,105 @@
+"""A long-lived event loop on a background thread for synchronous callers.
+
+`asyncio.run()` creates and closes a loop per call, so clients created inside
+it (and their keep-alive connections) are thrown away every time. Sync facades
+such as `SlackAgent.send` submit their coroutines here instead: the loop and
+everything bound to it live for the whole process.
+"""
+
+from typing import Any, Awaitable, Coroutine, Iterable, List, Optional
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+
+from src.utils.logger import get_logger
+
+logger = get_logger("BackgroundLoop")
+
+
+class BackgroundLoop:
+    """Runs coroutines submitted from any thread on one shared event loop thread."""
+
+    def __init__(self, name: str = "aiocc-background-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The loop, started on first use."""
+        with self._lock:
+            if self._loop is None or self._thread is None or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(target=self._serve, args=(loop, ready), name=self.name, daemon=True)
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+                logger.debug("Started background event loop thread %s", self.name)
+            return self._loop
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run `coro` on the background loop and block until it finishes.
+
+        On timeout the coroutine is cancelled and `TimeoutError` is raised.
+        """
+        if self._thread is not None and threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() called from the loop thread; await the coroutine instead")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                raise  # raised by the coroutine itself
+            future.cancel()
+            # distinct from the builtin before Python 3.11
+            raise TimeoutError(f"coroutine did not finish within {timeout}s") from None
+        except BaseException:
+            future.cancel()
+            raise
+
+    def run_many(self, coros: Iterable[Awaitable[Any]], max_concurrency: Optional[int] = None, timeout: Optional[float] = None) -> List[Any]:
+        """Run coroutines concurrently (at most `max_concurrency` at once).
+
+        Returns results in input order; an exception is returned in place of
+        the result of the coroutine that raised it.
+        """
+        return self.run(_gather_bounded(list(coros), max_concurrency), timeout)
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+
+async def _gather_bounded(coros: List[Awaitable[Any]], max_concurrency: Optional[int]) -> List[Any]:
+    if not max_concurrency or max_concurrency >= len(coros):
+        return await asyncio.gather(*coros, return_exceptions=True)
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def one(coro: Awaitable[Any]) -> Any:
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(*(one(c) for c in coros), return_exceptions=True)
+
+
+# shared by all sync facades so clients and connections outlive a single call
+background_loop = BackgroundLoop()
+atexit.register(background_loop.stop)
@@ -1,5 +1,5 @@
 from pydantic import BaseSettings, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -9,6 +9,77 @@ class Settings(BaseSettings):
     SLACK_BOT_TOKEN: Optional[str] = Field(default=None, env="SLACK_BOT_TOKEN")
     DATABASE_URL: str = Field(default="sqlite+aiosqlite:///data/tasks.db", env="DATABASE_URL")
     DEBUG: bool = Field(default=False, env="DEBUG")
+    LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
+    LOG_FORMAT: str = Field(default="text", env="LOG_FORMAT")
+    LOG_ASYNC: bool = Field(default=True, env="LOG_ASYNC")
+    # Hot-path limits per logger name, e.g. {"ToolRouterStub": {"sample_rate": 0.1}}
+    LOG_SAMPLING: Dict[str, Dict[str, float]] = Field(
+        default_factory=lambda: {"ToolRouterStub": {"max_per_second": 20}, "WorkflowPlanner": {"max_per_second": 20}},
+        env="LOG_SAMPLING",
+    )
+    SCHEDULER_ENABLED: bool = Field(default=True, env="SCHEDULER_ENABLED")
+    STEP_CACHE_TTL_SECONDS: float = Field(default=30.0, env="STEP_CACHE_TTL_SECONDS")
+    STEP_CACHE_MAX_ENTRIES: int = Field(default=256, env="STEP_CACHE_MAX_ENTRIES")
+    # summarize results cached on disk by hash of model, prompt and input; client is "router" or "local"
+    SUMMARY_CACHE_ENABLED: bool = Field(default=True, env="SUMMARY_CACHE_ENABLED")
+    SUMMARY_CACHE_DIR: str = Field(default="data/summary_cache", env="SUMMARY_CACHE_DIR")
+    SUMMARY_CACHE_MAX_BYTES: int = Field(default=50 * 1024 * 1024, env="SUMMARY_CACHE_MAX_BYTES")
+    SUMMARY_BATCH_MAX_TOKENS: int = Field(default=8000, env="SUMMARY_BATCH_MAX_TOKENS")
+    SUMMARY_BATCH_WINDOW_SECONDS: float = Field(default=0.02, env="SUMMARY_BATCH_WINDOW_SECONDS")
+    SUMMARY_MODEL_CLIENT: str = Field(default="router", env="SUMMARY_MODEL_CLIENT")
+    # 0 disables the corresponding deadline
+    WORKFLOW_RUN_TIMEOUT_SECONDS: float = Field(default=300.0, env="WORKFLOW_RUN_TIMEOUT_SECONDS")
+    WORKFLOW_STEP_TIMEOUT_SECONDS: float = Field(default=60.0, env="WORKFLOW_STEP_TIMEOUT_SECONDS")
+    OTEL_EXPORT_ENABLED: bool = Field(default=False, env="OTEL_EXPORT_ENABLED")
+    BATCH_MAX_CONCURRENCY: int = Field(default=8, env="BATCH_MAX_CONCURRENCY")
+    # Max simultaneously executing runs per workflow, e.g. {"weekly_review": 2}
+    WORKFLOW_MAX_CONCURRENCY: Dict[str, int] = Field(default_factory=dict, env="WORKFLOW_MAX_CONCURRENCY")
+    # Per-tool overrides, e.g. {"notion": {"rate": 3, "burst": 6, "max_in_flight": 2}}
+    TOOL_RATE_LIMITS: Dict[str, Dict[str, Any]] = Field(default_factory=dict, env="TOOL_RATE_LIMITS")
+    # Remote ToolRouter; when unset the in-process ToolRouterStub is used
+    TOOLROUTER_URL: Optional[str] = Field(default=None, env="TOOLROUTER_URL")
+    TOOLROUTER_MAX_CONNECTIONS: int = Field(default=100, env="TOOLROUTER_MAX_CONNECTIONS")
+    TOOLROUTER_MAX_KEEPALIVE: int = Field(default=20, env="TOOLROUTER_MAX_KEEPALIVE")
+    TOOLROUTER_HTTP2: bool = Field(default=True, env="TOOLROUTER_HTTP2")
+    TOOLROUTER_TIMEOUT_SECONDS: float = Field(default=30.0, env="TOOLROUTER_TIMEOUT_SECONDS")
+    # ToolRouterStub fault profiles for load testing, e.g. {"notion": {"latency": "longtail", "latency_ms": 80}}
+    TOOLROUTER_STUB_FAULTS: Dict[str, Dict[str, Any]] = Field(default_factory=dict, env="TOOLROUTER_STUB_FAULTS")
+    TOOLROUTER_STUB_SEED: Optional[int] = Field(default=None, env="TOOLROUTER_STUB_SEED")
+    POLLING_ENABLED: bool = Field(default=True, env="POLLING_ENABLED")
+    POLL_MAX_CONCURRENCY: int = Field(default=4, env="POLL_MAX_CONCURRENCY")
+    # Per-agent poll loop overrides, e.g. {"slack": {"args": {"channel": "#ops"}, "interval": 30}, "drive": {"enabled": false}}
+    POLL_TARGETS: Dict[str, Dict[str, Any]] = Field(default_factory=dict, env="POLL_TARGETS")
+    # Outbound Slack coalescing: extra wait before sending, batch cap and "merge" or "thread"
+    SLACK_COALESCE_WINDOW_SECONDS: float = Field(default=0.0, env="SLACK_COALESCE_WINDOW_SECONDS")
+    SLACK_COALESCE_MAX_MESSAGES: int = Field(default=20, env="SLACK_COALESCE_MAX_MESSAGES")
+    SLACK_COALESCE_MODE: str = Field(default="merge", env="SLACK_COALESCE_MODE")
+    # Push ingestion: Slack Events API signing secret and the token in the Gmail Pub/Sub push URL
+    SLACK_SIGNING_SECRET: Optional[str] = Field(default=None, env="SLACK_SIGNING_SECRET")
+    GMAIL_PUSH_TOKEN: Optional[str] = Field(default=None, env="GMAIL_PUSH_TOKEN")
+    GMAIL_PUSH_LABEL: str = Field(default="INBOX", env="GMAIL_PUSH_LABEL")
+    WEBHOOK_BATCH_SIZE: int = Field(default=100, env="WEBHOOK_BATCH_SIZE")
+    WEBHOOK_FLUSH_SECONDS: float = Field(default=0.5, env="WEBHOOK_FLUSH_SECONDS")
+    # ReminderAgent: how long before a task's due time the reminder goes out (0 = at the deadline)
+    REMINDER_LEAD_SECONDS: float = Field(default=3600.0, env="REMINDER_LEAD_SECONDS")
+    REMINDER_CHANNEL: str = Field(default="#reminders", env="REMINDER_CHANNEL")
+    # Escalation rules, e.g. [{"name": "stale-gmail", "when": {"source": "gmail", "status": "open"}, "status_for": "48h"}]
+    ESCALATION_RULES: List[Dict[str, Any]] = Field(default_factory=list, env="ESCALATION_RULES")
+    ESCALATION_CHANNEL: str = Field(default="#escalations", env="ESCALATION_CHANNEL")
+    # Near-duplicate task detection (MinHash/LSH); num_perm must be a multiple of bands
+    DEDUP_ENABLED: bool = Field(default=True, env="DEDUP_ENABLED")
+    DEDUP_THRESHOLD: float = Field(default=0.7, env="DEDUP_THRESHOLD")
+    DEDUP_NUM_PERM: int = Field(default=64, env="DEDUP_NUM_PERM")
+    DEDUP_BANDS: int = Field(default=16, env="DEDUP_BANDS")
+    # Google Drive scanning; DriveAgent stays in mock mode without a token
+    DRIVE_API_TOKEN: Optional[str] = Field(default=None, env="DRIVE_API_TOKEN")
+    DRIVE_API_URL: str = Field(default="https://www.googleapis.com/drive/v3", env="DRIVE_API_URL")
+    DRIVE_MAX_CONCURRENT_DOWNLOADS: int = Field(default=4, env="DRIVE_MAX_CONCURRENT_DOWNLOADS")
+    # responses at or above this size are gzip/brotli compressed when the client accepts it; 0 disables
+    RESPONSE_COMPRESSION_MIN_BYTES: int = Field(default=1024, env="RESPONSE_COMPRESSION_MIN_BYTES")
+    RESPONSE_GZIP_LEVEL: int = Field(default=6, env="RESPONSE_GZIP_LEVEL")
+    RESPONSE_BROTLI_QUALITY: int = Field(default=4, env="RESPONSE_BROTLI_QUALITY")
+    AGENT_STATUS_TTL_SECONDS: float = Field(default=15.0, env="AGENT_STATUS_TTL_SECONDS")
+    AGENT_STATUS_TIMEOUT_SECONDS: float = Field(default=5.0, env="AGENT_STATUS_TIMEOUT_SECONDS")
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,57 @@
+"""Deadline propagation for workflow runs.
+
+The planner opens a `deadline_scope` for each run; anything awaited inside it
+(router calls, agent client calls) can call `bounded()` so it never outlives
+the run's remaining time budget. Deadlines use the monotonic clock.
+"""
+
+from typing import Any, Awaitable, Iterator, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import asyncio
+import time
+
+_deadline: ContextVar[Optional[float]] = ContextVar("aiocc_deadline", default=None)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def effective_timeout(timeout: Optional[float]) -> Optional[float]:
+    """The smaller of `timeout` and the remaining time of the current deadline."""
+    remaining = remaining_time()
+    if timeout is None or timeout <= 0:
+        return remaining
+    if remaining is None:
+        return timeout
+    return min(timeout, remaining)
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """Set a deadline `timeout` seconds from now (never extending an outer one)."""
+    if timeout is None or timeout <= 0:
+        yield _deadline.get()
+        return
+    new = time.monotonic() + timeout
+    outer = _deadline.get()
+    if outer is not None:
+        new = min(new, outer)
+    token = _deadline.set(new)
+    try:
+        yield new
+    finally:
+        _deadline.reset(token)
+
+
+async def bounded(aw: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Await `aw`, raising asyncio.TimeoutError once the deadline passes."""
+    limit = effective_timeout(timeout)
+    if limit is None:
+        return await aw
+    return await asyncio.wait_for(aw, timeout=limit)
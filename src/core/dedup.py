@@ -0,0 +1,98 @@
+"""Near-duplicate detection for incoming tasks with MinHash and LSH banding.
+
+Title and description are normalized (lowercased, punctuation and stopwords
+removed) into word unigrams and bigrams. A MinHash signature of `num_perm`
+values estimates the Jaccard similarity of two such sets. Signatures are cut
+into `bands` bands; tasks sharing any band bucket become candidates, so a
+lookup touches a handful of buckets instead of every stored task. Candidates
+are then confirmed against `threshold` using their full signatures.
+
+With the defaults (64 values, 16 bands of 4) a pair at similarity 0.7 becomes
+a candidate with ~99% probability, and a pair at 0.3 with ~12%.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import hashlib
+import random
+import re
+
+_PRIME = (1 << 61) - 1
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have i in is it its of on or our please re fw fwd so that the this to was we will with you your".split()
+)
+
+
+def normalize(text: Optional[str]) -> List[str]:
+    return [t for t in _TOKEN.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def shingles(title: Optional[str], description: Optional[str] = None) -> Set[str]:
+    tokens = normalize(title) + normalize(description)
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class MinHashLSH:
+    """Signature and band-key computation; storage of the buckets is up to the caller."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.7, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self.checked = 0
+        self.candidates = 0
+        self.duplicates = 0
+
+    def signature(self, title: Optional[str], description: Optional[str] = None) -> Optional[List[int]]:
+        """MinHash of the task text, or None if nothing is left after normalization."""
+        hashes = [_hash64(s) for s in shingles(title, description)]
+        if not hashes:
+            return None
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms]
+
+    def band_keys(self, signature: Sequence[int]) -> List[Tuple[int, str]]:
+        """(band, bucket) pairs under which a signature is indexed; buckets are unique across bands."""
+        keys = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            keys.append((band, hashlib.blake2b(repr((band, *rows)).encode(), digest_size=8).hexdigest()))
+        return keys
+
+    @staticmethod
+    def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        if not a or len(a) != len(b):
+            return 0.0
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+    def best_match(self, signature: Sequence[int], candidates: Iterable[Tuple[Any, Sequence[int]]]) -> Optional[Tuple[Any, float]]:
+        """The most similar (id, score) among candidates at or above the threshold."""
+        self.checked += 1
+        best: Optional[Tuple[Any, float]] = None
+        for key, other in candidates:
+            self.candidates += 1
+            score = self.similarity(signature, other)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (key, score)
+        if best is not None:
+            self.duplicates += 1
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "checked": self.checked,
+            "candidates_compared": self.candidates,
+            "duplicates": self.duplicates,
+        }
@@ -1,3 +1,6 @@
+import asyncio
+
+
 class ToolConnectionError(Exception):
     """Raised when a tool connection cannot be established."""
 
@@ -6,5 +9,13 @@ class WorkflowExecutionError(Exception):
     """Raised when executing a workflow fails in the planner or router."""
 
 
+class ToolTimeoutError(WorkflowExecutionError, asyncio.TimeoutError):
+    """Raised when a tool call times out; an asyncio.TimeoutError, so the planner records the step as "timeout"."""
+
+
 class InvalidWorkflowError(Exception):
     """Raised when a requested workflow does not exist or is malformed."""
+
+
+class RunStateError(Exception):
+    """Raised when a workflow run is not in a state that allows the requested operation."""
@@ -0,0 +1,124 @@
+"""Latency and failure injection for ToolRouterStub.
+
+Profiles are looked up per execution by `tool.action`, then `tool`, then `*`.
+Each profile describes a latency distribution, error and timeout rates and an
+optional padding size for results, so planner retries, concurrency limits and
+step timeouts can be exercised locally. A seeded injector is reproducible.
+
+Example (TOOLROUTER_STUB_FAULTS):
+  {"notion.fetch_tasks": {"latency": "longtail", "latency_ms": 80, "error_rate": 0.05},
+   "slack": {"latency": "normal", "latency_ms": 40, "jitter_ms": 10, "timeout_rate": 0.01}}
+"""
+
+from typing import Any, Dict, Optional, Union
+from dataclasses import dataclass, fields
+import asyncio
+import random
+
+from src.core.exceptions import ToolConnectionError
+
+LATENCY_KINDS = ("fixed", "normal", "longtail")
+
+
+@dataclass
+class FaultProfile:
+    """How the stub misbehaves for one tool or tool action.
+
+    - latency: "fixed" (always latency_ms), "normal" (latency_ms +/- jitter_ms)
+      or "longtail" (log-normal with median latency_ms; `tail` sets the spread)
+    - error_rate: probability an execution raises ToolConnectionError
+    - timeout_rate: probability an execution hangs for `hang_seconds` and then
+      raises asyncio.TimeoutError (the planner's step timeout usually fires first)
+    - payload_bytes: size of the filler string added to each result as `data`
+    """
+
+    latency: str = "fixed"
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    tail: float = 1.0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang_seconds: float = 30.0
+    payload_bytes: int = 0
+
+    def validate(self) -> "FaultProfile":
+        if self.latency not in LATENCY_KINDS:
+            raise ValueError(f"latency must be one of {LATENCY_KINDS}, got {self.latency!r}")
+        for name in ("error_rate", "timeout_rate"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}")
+        return self
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FaultProfile":
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"unknown fault profile fields: {sorted(unknown)}")
+        return cls(**data).validate()
+
+
+class FaultInjector:
+    """Applies FaultProfiles to executions using its own (optionally seeded) RNG."""
+
+    def __init__(self, profiles: Optional[Dict[str, Union[FaultProfile, Dict[str, Any]]]] = None, seed: Optional[int] = None):
+        self.profiles: Dict[str, FaultProfile] = {}
+        for key, profile in (profiles or {}).items():
+            self.set_profile(key, profile)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.injected_errors = 0
+        self.injected_timeouts = 0
+
+    def set_profile(self, key: str, profile: Union[FaultProfile, Dict[str, Any]]) -> None:
+        self.profiles[key] = profile.validate() if isinstance(profile, FaultProfile) else FaultProfile.from_dict(profile)
+
+    def reseed(self, seed: Optional[int] = None) -> None:
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def profile_for(self, tool: Optional[str], action: Optional[str]) -> Optional[FaultProfile]:
+        for key in (f"{tool}.{action}", str(tool), "*"):
+            if key in self.profiles:
+                return self.profiles[key]
+        return None
+
+    def sample_latency(self, profile: FaultProfile) -> float:
+        """Latency in seconds for one execution."""
+        if profile.latency_ms <= 0:
+            return 0.0
+        if profile.latency == "normal":
+            ms = self.rng.gauss(profile.latency_ms, profile.jitter_ms)
+        elif profile.latency == "longtail":
+            ms = profile.latency_ms * self.rng.lognormvariate(0.0, profile.tail)
+        else:
+            ms = profile.latency_ms
+        return max(0.0, ms) / 1000.0
+
+    async def apply(self, tool: Optional[str], action: Optional[str]) -> Optional[FaultProfile]:
+        """Sleep, hang or raise according to the matching profile; return it."""
+        profile = self.profile_for(tool, action)
+        if profile is None:
+            return None
+        # draw every value up front so the sequence is reproducible for a seed
+        delay = self.sample_latency(profile)
+        roll = self.rng.random()
+        if delay:
+            await asyncio.sleep(delay)
+        if roll < profile.timeout_rate:
+            self.injected_timeouts += 1
+            await asyncio.sleep(profile.hang_seconds)
+            raise asyncio.TimeoutError(f"injected timeout for {tool}.{action}")
+        if roll < profile.timeout_rate + profile.error_rate:
+            self.injected_errors += 1
+            raise ToolConnectionError(f"injected failure for {tool}.{action}")
+        return profile
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "seed": self.seed,
+            "profiles": sorted(self.profiles),
+            "injected_errors": self.injected_errors,
+            "injected_timeouts": self.injected_timeouts,
+        }
@@ -0,0 +1,135 @@
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.core.config import settings
+from src.core.deadline import effective_timeout
+from src.core.exceptions import ToolConnectionError, ToolTimeoutError, WorkflowExecutionError
+from src.core.interfaces import AsyncToolRouterInterface
+from src.utils.logger import get_logger
+
+logger = get_logger("HttpToolRouter")
+
+try:
+    import h2  # type: ignore  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except Exception:
+    _HTTP2_AVAILABLE = False
+
+
+class HttpToolRouter(AsyncToolRouterInterface):
+    """ToolRouter client speaking JSON over HTTP.
+
+    All calls share one `httpx.AsyncClient`, so connections are pooled and kept
+    alive across workflow runs. HTTP/2 is used when requested and the `h2`
+    package is installed. Each request's timeout is capped by the current run
+    deadline (see `src.core.deadline`).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.http2 = http2 and _HTTP2_AVAILABLE
+        if http2 and not _HTTP2_AVAILABLE:
+            logger.info("h2 not installed; HttpToolRouter using HTTP/1.1")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_settings(cls) -> "HttpToolRouter":
+        return cls(
+            base_url=settings.TOOLROUTER_URL or "",
+            api_key=settings.COMPOSIO_API_KEY,
+            max_connections=settings.TOOLROUTER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.TOOLROUTER_MAX_KEEPALIVE,
+            http2=settings.TOOLROUTER_HTTP2,
+            timeout=settings.TOOLROUTER_TIMEOUT_SECONDS,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                limits=self.limits,
+                http2=self.http2,
+                timeout=self.timeout,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        json: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        limit = effective_timeout(timeout or self.timeout)
+        try:
+            resp = await self.client.request(method, path, json=json, timeout=limit, headers=headers)
+        except httpx.TimeoutException as e:
+            raise ToolTimeoutError(f"ToolRouter {path} timed out") from e
+        except httpx.TransportError as e:
+            raise ToolConnectionError(f"ToolRouter {path} unreachable: {e}") from e
+        if resp.status_code >= 400:
+            raise WorkflowExecutionError(f"ToolRouter {path} failed with HTTP {resp.status_code}: {resp.text[:200]}")
+        return resp.json()
+
+    async def connect(self, name: str, token: Optional[str] = None) -> Dict[str, Any]:
+        return await self._request("POST", "/connect", json={"name": name, "token": token})
+
+    async def plan(self, plan_definition: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request("POST", "/plan", json=plan_definition)
+
+    async def multi_execute(self, executions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        headers = {}
+        keys = [ex.get("idempotency_key") for ex in executions if ex.get("idempotency_key")]
+        if len(keys) == 1:
+            headers["Idempotency-Key"] = str(keys[0])
+        timeouts = [ex["timeout"] for ex in executions if ex.get("timeout")]
+        data = await self._request(
+            "POST",
+            "/multi_execute",
+            json={"executions": executions},
+            timeout=min(timeouts) if timeouts else None,
+            headers=headers or None,
+        )
+        return data.get("results", []) if isinstance(data, dict) else data
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        return await self._request("POST", "/search", json={"query": query})
+
+    async def manage_connections(self) -> Dict[str, Any]:
+        return await self._request("GET", "/connections")
+
+    async def remote_workbench(self, tool: str, test_payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request("POST", "/remote_workbench", json={"tool": tool, "payload": test_payload})
+
+    async def invoke(self, tool: str, method: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self._request("POST", "/invoke", json={"tool": tool, "method": method, "payload": payload or {}})
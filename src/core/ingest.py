@@ -0,0 +1,308 @@
+"""Streaming ingestion of polled and pushed agent items into the TaskStore.
+
+A producer pulls pages from an agent's `iter_items()` into a bounded queue and
+a consumer writes them to the store in batches. When the store falls behind,
+the queue fills and the producer stops requesting upstream pages, so memory
+use stays at roughly `max_buffered` pages regardless of backfill size.
+
+Pushed events (webhooks) go through `IngestQueue`, a background writer that
+groups tasks submitted within `flush_interval` into one store transaction.
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass
+import asyncio
+
+from src.agents.base_agent import deferred_cursors
+from src.core.loop_state import LoopLocal
+from src.utils.logger import get_logger
+
+logger = get_logger("Ingest")
+
+_DONE = object()
+
+
+def item_to_task(source: str, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a Slack message, Gmail message or Notion page to add_tasks_async arguments."""
+    title = item.get("title") or item.get("subject") or item.get("text")
+    if not title:
+        return None
+    title = str(title)
+    external_id = item.get("id") or item.get("ts")
+    return {
+        "source": source,
+        "title": title[:255],
+        "description": item.get("snippet") or item.get("description") or (title if len(title) > 255 else None),
+        "owner": item.get("owner") or item.get("from") or item.get("user"),
+        "metadata": {"external_id": external_id} if external_id is not None else {},
+    }
+
+
+async def ingest_pages(
+    store: Any,
+    source: str,
+    pages: AsyncIterator[List[Dict[str, Any]]],
+    to_task: Callable[[str, Dict[str, Any]], Optional[Dict[str, Any]]] = item_to_task,
+    batch_size: int = 100,
+    max_buffered: int = 4,
+) -> Dict[str, int]:
+    """Stream `pages` into `store`, returning counts of pages, items and tasks written."""
+    queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_buffered)
+    stats = {"pages": 0, "items": 0, "tasks": 0, "batches": 0}
+
+    async def produce() -> None:
+        async for page in pages:
+            stats["pages"] += 1
+            stats["items"] += len(page)
+            # blocks while the consumer is `max_buffered` pages behind
+            await queue.put(page)
+        await queue.put(_DONE)
+
+    async def flush(batch: List[Dict[str, Any]]) -> None:
+        if batch:
+            await store.add_tasks_async(batch)
+            stats["tasks"] += len(batch)
+            stats["batches"] += 1
+
+    async def consume() -> None:
+        batch: List[Dict[str, Any]] = []
+        while True:
+            page = await queue.get()
+            if page is _DONE:
+                break
+            for item in page:
+                task = to_task(source, item)
+                if task is None:
+                    continue
+                batch.append(task)
+                if len(batch) >= batch_size:
+                    await flush(batch)
+                    batch = []
+        await flush(batch)
+
+    producer = asyncio.ensure_future(produce())
+    consumer = asyncio.ensure_future(consume())
+    try:
+        await asyncio.gather(producer, consumer)
+    except BaseException:
+        producer.cancel()
+        consumer.cancel()
+        await asyncio.gather(producer, consumer, return_exceptions=True)
+        raise
+    finally:
+        aclose = getattr(pages, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    logger.info("Ingested %s tasks from %s (%s items, %s pages)", stats["tasks"], source, stats["items"], stats["pages"])
+    return stats
+
+
+async def ingest_agent(store: Any, agent: Any, batch_size: int = 100, max_buffered: int = 4, **poll_args: Any) -> Dict[str, int]:
+    """Ingest everything an agent's `iter_items(**poll_args)` yields.
+
+    Sync cursors (and Drive scan state) advance only after every batch has been
+    written, so a failed ingest is retried from the previous cursor on the next run.
+    """
+    source = getattr(agent, "name", "agent")
+    with deferred_cursors() as pending:
+        stats = await ingest_pages(store, source, agent.iter_items(**poll_args), batch_size=batch_size, max_buffered=max_buffered)
+    for (owner, key), value in pending.items():
+        await owner.commit_deferred(key, value)
+    return stats
+
+
+@dataclass
+class _Queued:
+    task: Dict[str, Any]
+    # upstream event id (e.g. the dedup key), reported if the task is dead-lettered
+    key: Optional[str] = None
+    attempts: int = 0
+
+
+class _QueueState:
+    """One loop's queue, writer task and running syncs."""
+
+    def __init__(self, max_queued: int):
+        self.queue: "asyncio.Queue[_Queued]" = asyncio.Queue(maxsize=max_queued)
+        self.full = asyncio.Event()
+        self.worker: Optional[asyncio.Task] = None
+        self.syncs: Dict[str, asyncio.Task] = {}
+        self.rerun: Dict[str, bool] = {}
+
+
+class IngestQueue:
+    """Background batch writer for tasks submitted one at a time (e.g. by webhooks).
+
+    `submit` never waits on the store: it enqueues and returns, so callers can
+    acknowledge upstream immediately. A worker writes up to `batch_size` tasks
+    per transaction, waiting at most `flush_interval` seconds to fill a batch.
+    A batch that fails to write is queued again (up to `max_retries` times,
+    with exponential backoff); tasks that still fail are kept in
+    `dead_letters` and their event keys are passed to `on_dead_letter`, so the
+    caller can accept a redelivery of those events. `request_sync` runs an agent sync in the background, coalescing requests
+    that arrive while the same sync is already running into one rerun.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_queued: int = 10000,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        on_dead_letter: Optional[Callable[[List[str]], None]] = None,
+        max_dead_letters: int = 1000,
+    ):
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_queued = max_queued
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.on_dead_letter = on_dead_letter
+        # most recent tasks that could not be written, oldest dropped first
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=max_dead_letters)
+        self._state: LoopLocal[_QueueState] = LoopLocal(lambda: _QueueState(self.max_queued))
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.dropped = 0
+        self.syncs_run = 0
+        self.syncs_coalesced = 0
+
+    def submit(self, task: Dict[str, Any], key: Optional[str] = None) -> bool:
+        """Queue add_tasks_async arguments; False if the queue is full.
+
+        `key` identifies the upstream event and is reported to `on_dead_letter`
+        if the task can't be written.
+        """
+        state = self._state.get()
+        try:
+            state.queue.put_nowait(_Queued(task, key))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Ingest queue full (%s); dropping task from %s", self.max_queued, task.get("source"))
+            return False
+        self.submitted += 1
+        if state.queue.qsize() >= self.batch_size:
+            state.full.set()
+        if state.worker is None or state.worker.done():
+            state.worker = asyncio.create_task(self._run(state), name="ingest-queue")
+        return True
+
+    def request_sync(self, key: str, sync: Callable[[], Awaitable[Any]]) -> bool:
+        """Run `sync()` in the background; True if it started, False if folded into a running one."""
+        state = self._state.get()
+        running = state.syncs.get(key)
+        if running is not None and not running.done():
+            state.rerun[key] = True
+            self.syncs_coalesced += 1
+            return False
+        state.syncs[key] = asyncio.create_task(self._run_sync(state, key, sync), name=f"ingest-sync:{key}")
+        return True
+
+    async def _run_sync(self, state: _QueueState, key: str, sync: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            while True:
+                state.rerun[key] = False
+                self.syncs_run += 1
+                try:
+                    await sync()
+                except Exception as e:
+                    logger.exception("Ingest sync %s failed: %s", key, e)
+                if not state.rerun.get(key):
+                    break
+        finally:
+            state.syncs.pop(key, None)
+            state.rerun.pop(key, None)
+
+    async def _run(self, state: _QueueState) -> None:
+        queue = state.queue
+        while True:
+            first = await queue.get()
+            if queue.qsize() + 1 < self.batch_size and self.flush_interval > 0:
+                try:
+                    await asyncio.wait_for(state.full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            state.full.clear()
+            batch = [first]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self.store.add_tasks_async([entry.task for entry in batch])
+                self.written += len(batch)
+                self.batches += 1
+            except Exception as e:
+                self.failed += len(batch)
+                logger.exception("Failed to write %s queued task(s): %s", len(batch), e)
+                # re-queued before task_done(), so flush() also waits for the retries
+                await self._retry_or_dead_letter(queue, batch, e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _retry_or_dead_letter(self, queue: "asyncio.Queue[_Queued]", batch: List[_Queued], error: Exception) -> None:
+        attempt = max(entry.attempts for entry in batch)
+        if attempt < self.max_retries and self.retry_backoff > 0:
+            await asyncio.sleep(self.retry_backoff * (2**attempt))
+        dead: List[_Queued] = []
+        for entry in batch:
+            entry.attempts += 1
+            if entry.attempts > self.max_retries:
+                dead.append(entry)
+                continue
+            try:
+                queue.put_nowait(entry)
+                self.retried += 1
+            except asyncio.QueueFull:
+                dead.append(entry)
+        if not dead:
+            return
+        self.dead_lettered += len(dead)
+        for entry in dead:
+            self.dead_letters.append({"task": entry.task, "key": entry.key, "attempts": entry.attempts, "error": str(error) or type(error).__name__})
+        logger.error("Dead-lettered %s task(s) after %s failed write(s): %s", len(dead), max(e.attempts for e in dead), error)
+        keys = [entry.key for entry in dead if entry.key is not None]
+        if keys and self.on_dead_letter is not None:
+            try:
+                self.on_dead_letter(keys)
+            except Exception as e:
+                logger.exception("Dead-letter callback failed: %s", e)
+
+    async def flush(self) -> None:
+        """Wait until every submitted task is written and running syncs have finished."""
+        state = self._state.get()
+        while state.syncs:
+            await asyncio.gather(*list(state.syncs.values()), return_exceptions=True)
+        await state.queue.join()
+
+    async def stop(self) -> None:
+        """Flush, then stop the writer."""
+        await self.flush()
+        state = self._state.get()
+        if state.worker is not None:
+            state.worker.cancel()
+            await asyncio.gather(state.worker, return_exceptions=True)
+            state.worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        states = self._state.values()
+        return {
+            "queued": sum(state.queue.qsize() for state in states),
+            "submitted": self.submitted,
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "dropped": self.dropped,
+            "syncs_run": self.syncs_run,
+            "syncs_coalesced": self.syncs_coalesced,
+            "syncs_running": sorted(key for state in states for key in state.syncs),
+        }
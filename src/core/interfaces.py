@@ -37,3 +37,40 @@ class ToolRouterInterface(ABC):
     @abstractmethod
     def invoke(self, tool: str, method: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         raise NotImplementedError()
+
+
+class AsyncToolRouterInterface(ABC):
+    """Async counterpart of ToolRouterInterface.
+
+    The WorkflowPlanner and agents talk to routers through this interface so
+    network-backed routers never block the event loop. Sync routers are
+    wrapped with `SyncRouterAdapter` (see `src.core.router_adapter`).
+    """
+
+    @abstractmethod
+    async def connect(self, name: str, token: Optional[str] = None) -> Dict[str, Any]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def plan(self, plan_definition: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def multi_execute(self, executions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def search(self, query: str) -> Dict[str, Any]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def manage_connections(self) -> Dict[str, Any]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def remote_workbench(self, tool: str, test_payload: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def invoke(self, tool: str, method: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        raise NotImplementedError()
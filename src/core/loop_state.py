@@ -0,0 +1,39 @@
+"""State kept separately for each event loop.
+
+asyncio primitives (locks, semaphores, queues, futures, tasks) belong to the
+loop they were created on. Shared objects such as the rate limiter or an
+agent's Slack outbox are used from the server's loop and from the background
+loop of the sync facades at the same time, so they keep such state in a
+`LoopLocal` instead of resetting it whenever the running loop changes.
+"""
+
+from typing import Callable, Dict, Generic, List, TypeVar
+import asyncio
+import threading
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    """One `factory()` instance per event loop; entries of closed loops are dropped."""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._states: Dict[asyncio.AbstractEventLoop, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """The running loop's instance, created on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None:
+                for closed in [l for l in self._states if l.is_closed()]:
+                    del self._states[closed]
+                state = self._states[loop] = self._factory()
+            return state
+
+    def values(self) -> List[T]:
+        """Instances of every loop still open, e.g. for stats."""
+        with self._lock:
+            return [state for loop, state in self._states.items() if not loop.is_closed()]
@@ -0,0 +1,237 @@
+"""Background supervisor running each agent's poll loop concurrently.
+
+Every loop adapts its interval to the source: it speeds up while polls return
+items, relaxes while the source is quiet and backs off exponentially on
+errors, always within [min_interval, max_interval] and with random jitter so
+loops do not align. A shared semaphore caps how many polls run at once, and a
+failing loop never affects the others.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+import asyncio
+import random
+import time
+
+from src.core.config import settings
+from src.core.ingest import ingest_agent
+from src.utils.logger import get_logger
+
+logger = get_logger("PollSupervisor")
+
+# agent name -> loop options; POLL_TARGETS overrides or extends these
+DEFAULT_POLL_TARGETS: Dict[str, Dict[str, Any]] = {
+    "gmail": {"interval": 60},
+    "notion": {"interval": 120},
+    "drive": {"interval": 300},
+}
+
+
+@dataclass
+class PollLoop:
+    name: str
+    poll: Callable[[], Awaitable[Any]]
+    interval: float = 60.0
+    min_interval: float = 15.0
+    max_interval: float = 900.0
+    jitter: float = 0.1  # fraction of the interval
+    speedup: float = 0.5
+    slowdown: float = 1.5
+    # runtime state
+    current_interval: float = 0.0
+    polls: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    items_total: int = 0
+    last_items: int = 0
+    last_error: Optional[str] = None
+    last_lag_ms: float = 0.0
+    max_lag_ms: float = 0.0
+    last_duration_ms: float = 0.0
+    next_due: Optional[float] = None
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        self.current_interval = self.current_interval or self.interval
+
+    def adapt(self, items: Optional[int], error: bool) -> float:
+        """Update and return the interval after a poll."""
+        if error:
+            self.current_interval = self.interval * (2 ** self.consecutive_errors)
+        elif items:
+            self.current_interval *= self.speedup
+        else:
+            self.current_interval *= self.slowdown
+        self.current_interval = min(self.max_interval, max(self.min_interval, self.current_interval))
+        return self.current_interval
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "interval_s": round(self.current_interval, 3),
+            "polls": self.polls,
+            "errors": self.errors,
+            "consecutive_errors": self.consecutive_errors,
+            "last_error": self.last_error,
+            "items_last_poll": self.last_items,
+            "items_total": self.items_total,
+            "items_per_poll": round(self.items_total / self.polls, 2) if self.polls else 0.0,
+            "lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+            "last_duration_ms": self.last_duration_ms,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+def count_items(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, bool):
+        return int(result)
+    if isinstance(result, int):
+        return result
+    if isinstance(result, dict):
+        for key in ("count", "items", "tasks", "ingested"):
+            if key in result:
+                return count_items(result[key])
+        return 0
+    try:
+        return len(result)
+    except TypeError:
+        return 0
+
+
+class PollSupervisor:
+    """Owns the poll loops and the shared concurrency budget."""
+
+    def __init__(self, max_concurrency: int = 4, rng: Optional[random.Random] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rng = rng or random.Random()
+        self.loops: Dict[str, PollLoop] = {}
+        self._budget: Optional[asyncio.Semaphore] = None
+        self._started = False
+
+    def add(self, name: str, poll: Callable[[], Awaitable[Any]], **options: Any) -> PollLoop:
+        """Register (or replace) a loop; starts it immediately if the supervisor is running."""
+        self._cancel(name)
+        loop = PollLoop(name=name, poll=poll, **options)
+        self.loops[name] = loop
+        if self._started:
+            self._start_loop(loop)
+        return loop
+
+    def remove(self, name: str) -> bool:
+        self._cancel(name)
+        return self.loops.pop(name, None) is not None
+
+    async def start(self) -> None:
+        self._budget = asyncio.Semaphore(self.max_concurrency)
+        self._started = True
+        for loop in self.loops.values():
+            self._start_loop(loop)
+        logger.info("Poll supervisor started with %s loop(s)", len(self.loops))
+
+    async def stop(self) -> None:
+        self._started = False
+        tasks = [l._task for l in self.loops.values() if l._task is not None]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for l in self.loops.values():
+            l._task = None
+
+    def _start_loop(self, loop: PollLoop) -> None:
+        loop._task = asyncio.create_task(self._run(loop), name=f"poll:{loop.name}")
+
+    def _cancel(self, name: str) -> None:
+        loop = self.loops.get(name)
+        if loop is not None and loop._task is not None:
+            loop._task.cancel()
+            loop._task = None
+
+    def _jittered(self, loop: PollLoop, delay: float) -> float:
+        if not loop.jitter:
+            return delay
+        return max(0.0, delay * (1 + self.rng.uniform(-loop.jitter, loop.jitter)))
+
+    async def _run(self, loop: PollLoop) -> None:
+        # stagger the first poll so loops started together do not fire together
+        delay = self._jittered(loop, self.rng.uniform(0, loop.min_interval))
+        while True:
+            loop.next_due = time.monotonic() + delay
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                return
+            await self.poll_once(loop)
+            delay = self._jittered(loop, loop.current_interval)
+
+    async def poll_once(self, loop: PollLoop) -> None:
+        """Run one poll under the shared budget and adapt the loop's interval."""
+        budget = self._budget or asyncio.Semaphore(self.max_concurrency)
+        async with budget:
+            started = time.monotonic()
+            if loop.next_due is not None:
+                # time spent past the due time: event-loop delay plus budget wait
+                loop.last_lag_ms = round(max(0.0, started - loop.next_due) * 1000.0, 1)
+                loop.max_lag_ms = max(loop.max_lag_ms, loop.last_lag_ms)
+                loop.next_due = None
+            try:
+                result = await loop.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                loop.polls += 1
+                loop.errors += 1
+                loop.consecutive_errors += 1
+                loop.last_error = str(e) or type(e).__name__
+                loop.last_items = 0
+                interval = loop.adapt(None, error=True)
+                logger.exception("Poll %s failed (%s in a row); next poll in %.1fs", loop.name, loop.consecutive_errors, interval)
+            else:
+                loop.polls += 1
+                loop.consecutive_errors = 0
+                loop.last_error = None
+                loop.last_items = count_items(result)
+                loop.items_total += loop.last_items
+                interval = loop.adapt(loop.last_items, error=False)
+                logger.debug("Poll %s returned %s item(s); next poll in %.1fs", loop.name, loop.last_items, interval)
+            finally:
+                loop.last_duration_ms = round((time.monotonic() - started) * 1000.0, 1)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "loops": {name: loop.metrics() for name, loop in self.loops.items()},
+        }
+
+    @staticmethod
+    def targets_from_settings() -> Dict[str, Dict[str, Any]]:
+        """Merge DEFAULT_POLL_TARGETS with POLL_TARGETS; `"enabled": false` drops a target."""
+        targets = {name: dict(opts) for name, opts in DEFAULT_POLL_TARGETS.items()}
+        for name, opts in (settings.POLL_TARGETS or {}).items():
+            targets.setdefault(name, {}).update(opts)
+        return {name: opts for name, opts in targets.items() if opts.pop("enabled", True)}
+
+    def add_agents(self, agents: Dict[str, Any], targets: Optional[Dict[str, Dict[str, Any]]] = None, store: Any = None) -> List[str]:
+        """Register a loop per target whose agent is known.
+
+        Target options are PollLoop settings plus `args`, passed to the agent.
+        With a `store`, agents whose items are tasks are synced with
+        `ingest_agent`, so items are written and cursors advance only after
+        the write; other agents (and all agents without a store) run `poll`.
+        """
+        added = []
+        for name, opts in (targets if targets is not None else self.targets_from_settings()).items():
+            agent = agents.get(name)
+            if agent is None:
+                logger.warning("No agent named %s; poll target ignored", name)
+                continue
+            opts = dict(opts)
+            args = opts.pop("args", {}) or {}
+            if store is not None and getattr(agent, "ingests_items", False):
+                poll = lambda agent=agent, args=args: ingest_agent(store, agent, **args)
+            else:
+                poll = lambda agent=agent, args=args: agent.poll(**args)
+            self.add(name, poll, **opts)
+            added.append(name)
+        return added
@@ -0,0 +1,178 @@
+"""Shared per-tool rate limiting for calls to upstream tools (Slack, Gmail, Notion).
+
+Every caller (WorkflowPlanner, agents, API endpoints) acquires a slot from the
+process-wide `rate_limiter` before calling a tool. A slot requires a token
+from the tool's bucket, a token from the per-key bucket when a key is given
+(e.g. the Slack channel for `chat_postMessage`) and a free in-flight slot.
+Waiters are served in FIFO order and wait times are exported as metrics.
+"""
+
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import asyncio
+import time
+
+from src.core.config import settings
+from src.core.loop_state import LoopLocal
+from src.utils.logger import get_logger
+
+logger = get_logger("RateLimiter")
+
+
+@dataclass
+class ToolLimit:
+    rate: float  # tokens added per second
+    burst: float  # bucket capacity
+    max_in_flight: int
+    key_rate: Optional[float] = None  # per-key (e.g. per channel) rate
+    key_burst: float = 1.0
+
+
+# Conservative defaults based on the documented upstream limits.
+DEFAULT_LIMITS: Dict[str, ToolLimit] = {
+    "slack": ToolLimit(rate=5.0, burst=10.0, max_in_flight=4, key_rate=1.0, key_burst=3.0),
+    "gmail": ToolLimit(rate=10.0, burst=20.0, max_in_flight=4),
+    "notion": ToolLimit(rate=3.0, burst=6.0, max_in_flight=3),
+    "drive": ToolLimit(rate=10.0, burst=20.0, max_in_flight=8),
+    "default": ToolLimit(rate=10.0, burst=20.0, max_in_flight=8),
+}
+
+
+class TokenBucket:
+    """Async token bucket. Waiters queue on a lock, so tokens are granted FIFO."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            self._refill()
+            if self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+class _ToolStats:
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "acquired": self.acquired,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "total_wait_seconds": round(self.total_wait, 6),
+            "avg_wait_seconds": round(self.total_wait / self.acquired, 6) if self.acquired else 0.0,
+            "max_wait_seconds": round(self.max_wait, 6),
+        }
+
+
+class RateLimiter:
+    """Per-tool token buckets, per-key buckets and in-flight semaphores."""
+
+    def __init__(self, limits: Optional[Dict[str, ToolLimit]] = None):
+        self.limits: Dict[str, ToolLimit] = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        # asyncio primitives are bound to the loop that first waits on them, so
+        # every loop using the limiter (the server's, the sync facades'
+        # background loop, a new loop per test) gets its own buckets/semaphores
+        self._buckets: LoopLocal[Dict[Tuple[str, Optional[str]], TokenBucket]] = LoopLocal(dict)
+        self._semaphores: LoopLocal[Dict[str, asyncio.Semaphore]] = LoopLocal(dict)
+        self._stats: Dict[str, _ToolStats] = {}
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        overrides: Dict[str, ToolLimit] = {}
+        for tool, cfg in (settings.TOOL_RATE_LIMITS or {}).items():
+            base = DEFAULT_LIMITS.get(tool, DEFAULT_LIMITS["default"])
+            overrides[tool] = ToolLimit(
+                rate=float(cfg.get("rate", base.rate)),
+                burst=float(cfg.get("burst", base.burst)),
+                max_in_flight=int(cfg.get("max_in_flight", base.max_in_flight)),
+                key_rate=cfg.get("key_rate", base.key_rate),
+                key_burst=float(cfg.get("key_burst", base.key_burst)),
+            )
+        return cls(overrides)
+
+    def _limit_for(self, tool: str) -> ToolLimit:
+        return self.limits.get(tool) or self.limits["default"]
+
+    def _bucket(self, tool: str, key: Optional[str]) -> Optional[TokenBucket]:
+        limit = self._limit_for(tool)
+        if key is not None and not limit.key_rate:
+            return None
+        buckets = self._buckets.get()
+        bucket = buckets.get((tool, key))
+        if bucket is None:
+            if key is None:
+                bucket = TokenBucket(limit.rate, limit.burst)
+            else:
+                bucket = TokenBucket(float(limit.key_rate or 0.0), limit.key_burst)
+            buckets[(tool, key)] = bucket
+        return bucket
+
+    def _semaphore(self, tool: str) -> asyncio.Semaphore:
+        semaphores = self._semaphores.get()
+        sem = semaphores.get(tool)
+        if sem is None:
+            sem = asyncio.Semaphore(self._limit_for(tool).max_in_flight)
+            semaphores[tool] = sem
+        return sem
+
+    @asynccontextmanager
+    async def limit(self, tool: Optional[str], key: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold a rate-limited, concurrency-limited slot for one call to `tool`."""
+        tool = tool or "default"
+        stats = self._stats.setdefault(tool, _ToolStats())
+        started = time.monotonic()
+        stats.waiting += 1
+        sem = self._semaphore(tool)
+        try:
+            key_bucket = self._bucket(tool, key) if key is not None else None
+            if key_bucket is not None:
+                await key_bucket.acquire()
+            await self._bucket(tool, None).acquire()  # type: ignore[union-attr]
+            await sem.acquire()
+        finally:
+            stats.waiting -= 1
+        waited = time.monotonic() - started
+        stats.acquired += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        stats.in_flight += 1
+        if waited > 1.0:
+            logger.info("Waited %.2fs for %s rate limit slot", waited, tool)
+        try:
+            yield
+        finally:
+            stats.in_flight -= 1
+            sem.release()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {tool: stats.as_dict() for tool, stats in self._stats.items()}
+
+
+def limit_key(tool: Optional[str], action: Optional[str], payload: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Return the per-key bucket name for an execution, if the action has one."""
+    if tool == "slack" and action in ("post_message", "chat_postMessage"):
+        channel = (payload or {}).get("channel")
+        return str(channel) if channel else None
+    return None
+
+
+rate_limiter = RateLimiter.from_settings()
@@ -0,0 +1,193 @@
+"""Fast JSON rendering and negotiated response compression for the API.
+
+`FastJSONResponse` renders with orjson when it is installed (several times
+faster than the stdlib encoder on large run logs) and falls back to compact
+`json.dumps`. Endpoints returning large payloads build it directly, which also
+skips FastAPI's `jsonable_encoder` pass.
+
+`CompressionMiddleware` compresses responses at or above `minimum_size` bytes
+with brotli (when the `brotli` package is installed) or gzip, chosen from the
+request's Accept-Encoding q-values. Streaming responses are compressed chunk
+by chunk.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import zlib
+
+from fastapi.encoders import jsonable_encoder
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson  # type: ignore
+
+    _ORJSON_AVAILABLE = True
+except Exception:
+    orjson = None  # type: ignore
+    _ORJSON_AVAILABLE = False
+
+try:
+    import brotli  # type: ignore
+
+    _BROTLI_AVAILABLE = True
+except Exception:
+    brotli = None  # type: ignore
+    _BROTLI_AVAILABLE = False
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # pydantic models, Decimals, enums and anything else orjson can't encode
+    return jsonable_encoder(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize `content` to compact UTF-8 JSON, with orjson when available."""
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles them
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, honouring q-values; None for identity."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+    supported = ["br", "gzip"] if _BROTLI_AVAILABLE else ["gzip"]
+    best: Optional[Tuple[float, str]] = None
+    for coding in supported:
+        q = weights.get(coding, weights.get("*", 0.0))
+        # ties keep the earlier (better-compressing) coding
+        if q > 0 and (best is None or q > best[0]):
+            best = (q, coding)
+    return best[1] if best else None
+
+
+class _Compressor:
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int):
+        self.coding = coding
+        if coding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.coding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.coding == "br":
+            return self._br.process(data) + self._br.finish()
+        return self._gz.compress(data) + self._gz.flush()
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware applying negotiated brotli/gzip compression."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponder(self, coding, send).run(scope, receive)
+
+
+class _CompressedResponder:
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.start: Optional[Message] = None
+        # None until the first body chunk decides whether to compress
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.on_send)
+
+    def _eligible(self, headers: Headers) -> bool:
+        status = self.start["status"] if self.start else 200
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _start_message(self, body_length: Optional[int]) -> Message:
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["content-encoding"] = self.coding
+        if body_length is None:
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            headers["content-length"] = str(body_length)
+        vary = headers.get("vary")
+        if not vary:
+            headers["vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["vary"] = f"{vary}, Accept-Encoding"
+        return {**self.start, "headers": headers.raw}
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.passthrough = not self._eligible(Headers(raw=message["headers"]))
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.compressor is None:
+            if not more_body:
+                if len(body) < self.middleware.minimum_size:
+                    await self.send(self.start)
+                    await self.send(message)
+                    return
+                compressed = _Compressor(self.coding, self.middleware.gzip_level, self.middleware.brotli_quality).finish(body)
+                await self.send(self._start_message(len(compressed)))
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            self.compressor = _Compressor(self.coding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            await self.send(self._start_message(None))
+        data = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+def supported_encodings() -> List[str]:
+    return (["br"] if _BROTLI_AVAILABLE else []) + ["gzip"]
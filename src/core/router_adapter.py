@@ -0,0 +1,61 @@
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+
+from src.core.interfaces import AsyncToolRouterInterface, ToolRouterInterface
+
+
+class SyncRouterAdapter(AsyncToolRouterInterface):
+    """Expose a sync ToolRouterInterface through the async interface.
+
+    Calls run inline by default, which suits in-process routers such as
+    ToolRouterStub. Set `offload=True` for routers that do blocking I/O so each
+    call runs in a worker thread instead of on the event loop. Methods that a
+    router implements as coroutines are awaited directly, and an `amulti_execute`
+    coroutine (as on ToolRouterStub) is preferred over `multi_execute`.
+    """
+
+    def __init__(self, router: ToolRouterInterface, offload: bool = False):
+        self.router = router
+        self.offload = offload
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if asyncio.iscoroutinefunction(fn):
+            return await fn(*args)
+        if self.offload:
+            result = await asyncio.to_thread(fn, *args)
+        else:
+            result = fn(*args)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def connect(self, name: str, token: Optional[str] = None) -> Dict[str, Any]:
+        return await self._call(self.router.connect, name, token)
+
+    async def plan(self, plan_definition: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call(self.router.plan, plan_definition)
+
+    async def multi_execute(self, executions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        amulti = getattr(self.router, "amulti_execute", None)
+        if amulti is not None:
+            return await amulti(executions)
+        return await self._call(self.router.multi_execute, executions)
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        return await self._call(self.router.search, query)
+
+    async def manage_connections(self) -> Dict[str, Any]:
+        return await self._call(self.router.manage_connections)
+
+    async def remote_workbench(self, tool: str, test_payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call(self.router.remote_workbench, tool, test_payload)
+
+    async def invoke(self, tool: str, method: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self._call(self.router.invoke, tool, method, payload)
+
+
+def as_async_router(router: Any) -> AsyncToolRouterInterface:
+    """Return `router` if it is already async, otherwise wrap it in SyncRouterAdapter."""
+    if isinstance(router, AsyncToolRouterInterface):
+        return router
+    return SyncRouterAdapter(router)
@@ -0,0 +1,302 @@
+"""In-process cron scheduler for recurring workflows and agent polls.
+
+Schedules are persisted in the TaskStore `schedules` table and loaded when the
+app starts. Each schedule has its own asyncio loop that sleeps until the next
+cron fire time (plus optional jitter) and then triggers either a workflow via
+the WorkflowPlanner or a registered agent poll coroutine.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+import asyncio
+import random
+
+from src.utils.logger import get_logger
+
+logger = get_logger("Scheduler")
+
+
+OVERLAP_POLICIES = ("skip", "queue")
+SCHEDULE_KINDS = ("workflow", "agent_poll")
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+class CronExpression:
+    """A minimal 5-field cron expression (minute hour day-of-month month day-of-week).
+
+    Supports `*`, numbers, ranges (`1-5`), steps (`*/15`, `0-30/10`), lists
+    (`1,15`) and the common `@hourly`/`@daily`/`@weekly`/`@monthly` aliases.
+    Day-of-week uses 0 (or 7) for Sunday. As in classic cron, when both
+    day-of-month and day-of-week are restricted a day matches if either does.
+    """
+
+    def __init__(self, expr: str):
+        self.expr = expr.strip()
+        spec = _ALIASES.get(self.expr, self.expr)
+        parts = spec.split()
+        if len(parts) != 5:
+            raise ValueError(f"invalid cron expression (expected 5 fields): {expr}")
+        fields: List[Set[int]] = []
+        for part, (lo, hi) in zip(parts, _FIELD_RANGES):
+            # day-of-week accepts 7 as an alias for Sunday
+            fields.append(self._parse_field(part, lo, 7 if hi == 6 else hi))
+        self.minutes, self.hours, self.days, self.months, dow = fields
+        self.weekdays = {d % 7 for d in dow}
+        self._dom_restricted = parts[2] != "*"
+        self._dow_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(part: str, lo: int, hi: int) -> Set[int]:
+        values: Set[int] = set()
+        for item in part.split(","):
+            step = 1
+            if "/" in item:
+                item, step_s = item.split("/", 1)
+                step = int(step_s)
+                if step <= 0:
+                    raise ValueError(f"invalid cron step: {part}")
+            if item == "*":
+                start, end = lo, hi
+            elif "-" in item:
+                a, b = item.split("-", 1)
+                start, end = int(a), int(b)
+            else:
+                start = int(item)
+                end = hi if step != 1 else start
+            if start < lo or end > hi or start > end:
+                raise ValueError(f"cron field out of range: {part}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom_ok = dt.day in self.days
+        # python weekday(): Monday=0; cron: Sunday=0
+        dow_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._dom_restricted and self._dow_restricted:
+            return dom_ok or dow_ok
+        return dom_ok and dow_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Return the first fire time strictly after `after` (minute resolution)."""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Bound the search so an impossible expression (e.g. Feb 30) terminates.
+        limit = dt + timedelta(days=366 * 5)
+        while dt <= limit:
+            if dt.month not in self.months:
+                year, month = (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+                dt = dt.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+                continue
+            if dt.minute not in self.minutes:
+                dt = dt + timedelta(minutes=1)
+                continue
+            return dt
+        raise ValueError(f"cron expression never fires: {self.expr}")
+
+
+@dataclass
+class Schedule:
+    name: str
+    kind: str
+    target: str
+    cron: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    overlap: str = "skip"
+    jitter_seconds: float = 0.0
+    enabled: bool = True
+    last_run_at: Optional[str] = None
+
+    def validate(self) -> None:
+        if self.kind not in SCHEDULE_KINDS:
+            raise ValueError(f"unknown schedule kind: {self.kind}")
+        if self.overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"unknown overlap policy: {self.overlap}")
+        if self.jitter_seconds < 0:
+            raise ValueError("jitter_seconds must be >= 0")
+        CronExpression(self.cron)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def next_fire_time(schedule: Schedule, now: datetime) -> Tuple[datetime, int]:
+    """Return the next fire time for `schedule` and how many runs were missed.
+
+    Missed runs (fire times between `last_run_at` and `now`) are coalesced into
+    a single run that is due immediately.
+    """
+    cron = CronExpression(schedule.cron)
+    if schedule.last_run_at:
+        try:
+            last = datetime.fromisoformat(schedule.last_run_at)
+        except ValueError:
+            last = None
+        if last is not None:
+            missed = 0
+            t = cron.next_after(last)
+            while t <= now and missed < 1000:
+                missed += 1
+                t = cron.next_after(t)
+            if missed:
+                return now, missed
+    return cron.next_after(now), 0
+
+
+class WorkflowScheduler:
+    """Runs persisted cron schedules inside the application's event loop.
+
+    `pollers` maps an agent name (e.g. "reminder") to a zero-argument coroutine
+    function that performs one poll. Workflows are executed through `planner`.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        planner: Any,
+        pollers: Optional[Dict[str, Callable[[], Awaitable[Any]]]] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.store = store
+        self.planner = planner
+        self.pollers: Dict[str, Callable[[], Awaitable[Any]]] = dict(pollers or {})
+        self.clock = clock
+        self.schedules: Dict[str, Schedule] = {}
+        self._loops: Dict[str, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._inflight: Dict[str, int] = {}
+        self._running: Set[asyncio.Task] = set()
+        self._started = False
+
+    async def start(self) -> None:
+        """Load schedules from the store and start one loop per enabled schedule."""
+        try:
+            rows = await self.store.list_schedules()
+        except Exception:
+            logger.exception("Failed to load schedules; scheduler starting empty")
+            rows = []
+        for sched in rows:
+            self.schedules[sched.name] = sched
+        self._started = True
+        for sched in self.schedules.values():
+            self._start_loop(sched)
+        logger.info("Scheduler started with %s schedule(s)", len(self._loops))
+
+    async def stop(self) -> None:
+        self._started = False
+        tasks = list(self._loops.values()) + list(self._running)
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loops.clear()
+        self._running.clear()
+
+    def list_schedules(self) -> List[Dict[str, Any]]:
+        return [s.to_dict() for s in self.schedules.values()]
+
+    async def add_schedule(self, schedule: Schedule) -> Schedule:
+        schedule.validate()
+        if schedule.kind == "workflow" and schedule.target not in self.planner.list_workflows():
+            raise KeyError(f"workflow not found: {schedule.target}")
+        if schedule.kind == "agent_poll" and schedule.target not in self.pollers:
+            raise KeyError(f"agent poller not found: {schedule.target}")
+        existing = self.schedules.get(schedule.name)
+        if existing is not None and schedule.last_run_at is None:
+            schedule.last_run_at = existing.last_run_at
+        await self.store.upsert_schedule(schedule)
+        self._stop_loop(schedule.name)
+        self.schedules[schedule.name] = schedule
+        if self._started:
+            self._start_loop(schedule)
+        return schedule
+
+    async def remove_schedule(self, name: str) -> bool:
+        if name not in self.schedules:
+            return False
+        self._stop_loop(name)
+        del self.schedules[name]
+        await self.store.delete_schedule(name)
+        return True
+
+    def _start_loop(self, schedule: Schedule) -> None:
+        if not schedule.enabled:
+            return
+        self._loops[schedule.name] = asyncio.create_task(self._loop(schedule))
+
+    def _stop_loop(self, name: str) -> None:
+        task = self._loops.pop(name, None)
+        if task is not None:
+            task.cancel()
+
+    async def _loop(self, schedule: Schedule) -> None:
+        while True:
+            now = self.clock()
+            fire_at, missed = next_fire_time(schedule, now)
+            if missed > 1:
+                logger.info("Schedule %s missed %s runs; coalescing into one", schedule.name, missed)
+            delay = max(0.0, (fire_at - now).total_seconds())
+            if schedule.jitter_seconds:
+                delay += random.uniform(0, schedule.jitter_seconds)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                return
+            if self.clock() < fire_at:
+                # woke up marginally early; recompute rather than firing twice
+                continue
+            await self.trigger(schedule.name)
+
+    async def trigger(self, name: str) -> Optional[asyncio.Task]:
+        """Fire a schedule now, honouring its overlap policy.
+
+        Returns the task executing the run, or None if it was skipped.
+        """
+        schedule = self.schedules[name]
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        if self._inflight.get(name, 0) and schedule.overlap == "skip":
+            logger.info("Schedule %s still running; skipping this tick", name)
+            # record the tick so it is not treated as a missed run on restart
+            await self._mark_run(schedule)
+            return None
+        await self._mark_run(schedule)
+        self._inflight[name] = self._inflight.get(name, 0) + 1
+        task = asyncio.create_task(self._execute(schedule, lock))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        return task
+
+    async def _mark_run(self, schedule: Schedule) -> None:
+        schedule.last_run_at = self.clock().isoformat()
+        try:
+            await self.store.mark_schedule_run(schedule.name, schedule.last_run_at)
+        except Exception:
+            logger.exception("Failed to persist last run for schedule %s", schedule.name)
+
+    async def _execute(self, schedule: Schedule, lock: asyncio.Lock) -> None:
+        try:
+            # For the "queue" policy concurrent ticks wait here in FIFO order.
+            async with lock:
+                if schedule.kind == "workflow":
+                    await self.planner.run(schedule.target, params=dict(schedule.params))
+                else:
+                    await self.pollers[schedule.target]()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Scheduled run %s failed", schedule.name)
+        finally:
+            self._inflight[schedule.name] -= 1
@@ -0,0 +1,163 @@
+"""Local inverted index for cross-tool search.
+
+Tasks, Gmail messages, Slack messages and Notion pages are indexed as agents
+poll them and workflow steps fetch them, so `search` answers from memory
+instead of querying every upstream API. Documents are keyed by
+(source, id); re-indexing a document replaces its postings. Results are
+ranked with BM25.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+import heapq
+import math
+import re
+import time
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+# fields searched, and the fields tried (in order) for a document's id and title
+TEXT_FIELDS = ("title", "subject", "text", "snippet", "description", "body", "from", "owner", "user")
+ID_FIELDS = ("id", "page_id", "ts")
+TITLE_FIELDS = ("title", "subject", "text")
+
+# keys of tool results that hold lists of fetched items
+RESULT_ITEM_KEYS = ("messages", "tasks", "pages", "items")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+@dataclass
+class Document:
+    source: str
+    doc_id: str
+    title: str
+    length: int
+    terms: Dict[str, int]
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class SearchIndex:
+    """In-memory inverted index with BM25 ranking and incremental updates."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[Tuple[str, str], Document] = {}
+        self._postings: Dict[str, Dict[Tuple[str, str], int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def index_document(self, source: str, doc_id: Any, text: str, title: Optional[str] = None, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Add or replace one document."""
+        key = (source, str(doc_id))
+        self.remove(source, doc_id)
+        tokens = tokenize(text)
+        if not tokens:
+            return
+        terms: Dict[str, int] = {}
+        for tok in tokens:
+            terms[tok] = terms.get(tok, 0) + 1
+        self._docs[key] = Document(source=source, doc_id=str(doc_id), title=title or text[:80], length=len(tokens), terms=terms, meta=meta or {})
+        self._total_length += len(tokens)
+        for tok, tf in terms.items():
+            self._postings.setdefault(tok, {})[key] = tf
+
+    def remove(self, source: str, doc_id: Any) -> bool:
+        doc = self._docs.pop((source, str(doc_id)), None)
+        if doc is None:
+            return False
+        key = (source, doc.doc_id)
+        self._total_length -= doc.length
+        for tok in doc.terms:
+            postings = self._postings.get(tok)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[tok]
+        return True
+
+    def update_meta(self, source: str, doc_id: Any, **meta: Any) -> bool:
+        doc = self._docs.get((source, str(doc_id)))
+        if doc is None:
+            return False
+        doc.meta.update(meta)
+        return True
+
+    def index_item(self, source: str, item: Dict[str, Any]) -> bool:
+        """Index a fetched item (message, page, task dict) using its common fields."""
+        doc_id = next((item[f] for f in ID_FIELDS if item.get(f) is not None), None)
+        if doc_id is None:
+            return False
+        text = " ".join(str(item[f]) for f in TEXT_FIELDS if item.get(f))
+        title = next((str(item[f]) for f in TITLE_FIELDS if item.get(f)), None)
+        meta = {k: v for k, v in item.items() if k not in TEXT_FIELDS and isinstance(v, (str, int, float, bool))}
+        self.index_document(source, doc_id, text, title=title, meta=meta)
+        return True
+
+    def index_items(self, source: str, items: Iterable[Dict[str, Any]]) -> int:
+        return sum(1 for item in items or [] if isinstance(item, dict) and self.index_item(source, item))
+
+    def index_task(self, task: Any) -> None:
+        data = task if isinstance(task, dict) else task.__dict__
+        item = {k: v for k, v in data.items() if k != "metadata"}
+        self.index_item("task", item)
+
+    def index_result(self, result: Dict[str, Any]) -> int:
+        """Index the items carried by a tool execution result, if any."""
+        if not isinstance(result, dict) or result.get("status") not in (None, "ok", "success"):
+            return 0
+        source = str(result.get("tool") or "unknown")
+        return sum(self.index_items(source, result[k]) for k in RESULT_ITEM_KEYS if isinstance(result.get(k), list))
+
+    def search(self, query: str, limit: int = 10, sources: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        allowed: Optional[Set[str]] = set(sources) if sources else None
+        terms = list(dict.fromkeys(tokenize(query)))
+        n = len(self._docs)
+        avg_len = (self._total_length / n) if n else 0.0
+        scores: Dict[Tuple[str, str], float] = {}
+        for tok in terms:
+            postings = self._postings.get(tok)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, tf in postings.items():
+                if allowed is not None and key[0] not in allowed:
+                    continue
+                doc_len = self._docs[key].length
+                norm = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * doc_len / avg_len))
+                scores[key] = scores.get(key, 0.0) + idf * norm
+        top = heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1])
+        results = []
+        for key, score in top:
+            doc = self._docs[key]
+            results.append({"source": doc.source, "id": doc.doc_id, "title": doc.title, "score": round(score, 4), "meta": doc.meta})
+        return {
+            "query": query,
+            "results": results,
+            "total": len(scores),
+            "took_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        }
+
+    def clear(self) -> None:
+        self._docs.clear()
+        self._postings.clear()
+        self._total_length = 0
+
+    def stats(self) -> Dict[str, Any]:
+        by_source: Dict[str, int] = {}
+        for source, _ in self._docs:
+            by_source[source] = by_source.get(source, 0) + 1
+        return {"documents": len(self._docs), "terms": len(self._postings), "by_source": by_source}
+
+
+# shared by the router stub, agents, planner and API
+search_index = SearchIndex()
@@ -0,0 +1,127 @@
+"""Single-flight execution and TTL/LRU caching for read-only workflow steps.
+
+Cacheable steps (e.g. `notion.fetch_tasks`, `gmail.fetch_messages`) are keyed
+by tool, action and normalized payload. Concurrent identical calls share one
+in-flight execution and successful results are reused until they expire.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import copy
+import json
+import time
+
+from src.core.config import settings
+
+
+def normalize_payload(payload: Any) -> Any:
+    """Drop None values recursively so equivalent payloads produce the same key."""
+    if isinstance(payload, dict):
+        return {k: normalize_payload(v) for k, v in payload.items() if v is not None}
+    if isinstance(payload, (list, tuple)):
+        return [normalize_payload(v) for v in payload]
+    return payload
+
+
+class StepCache:
+    """Bounded LRU cache with per-entry TTL and single-flight deduplication."""
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls) -> "StepCache":
+        return cls(ttl_seconds=settings.STEP_CACHE_TTL_SECONDS, max_entries=settings.STEP_CACHE_MAX_ENTRIES)
+
+    @staticmethod
+    def make_key(tool: Optional[str], action: Optional[str], payload: Optional[Dict[str, Any]]) -> str:
+        return json.dumps([tool, action, normalize_payload(payload or {})], sort_keys=True, default=str)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_execute(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Return a cached value, join an identical in-flight call, or run `fn`.
+
+        Callers always receive a private copy so they can mutate results freely.
+        """
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return copy.deepcopy(value)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this caller was cancelled
+                # the leading call was cancelled (e.g. its run timed out);
+                # run it ourselves rather than failing an unrelated caller
+                return await self.get_or_execute(key, fn, should_cache)
+
+        self.misses += 1
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            # mark retrieved so an exception nobody waited on is not logged
+            fut.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if should_cache(value):
+            self.put(key, value)
+        fut.set_result(value)
+        return copy.deepcopy(value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_inflight": self.shared,
+            "evictions": self.evictions,
+        }
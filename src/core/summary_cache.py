@@ -0,0 +1,331 @@
+"""Content-addressed caching and request batching for the `summarize` step.
+
+A summary is keyed by a SHA-256 of (model client, model, prompt, input
+content), so a run whose input tasks are unchanged reuses the stored result
+instead of calling the model again. Results live in a size-bounded directory
+of JSON files with LRU eviction (file mtimes record recency, so the order
+survives restarts).
+
+Misses go through `Summarizer`: identical concurrent requests share one call,
+and distinct ones arriving within `batch_window` seconds are sent to the model
+client together, split so that no batch exceeds `max_batch_tokens`.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from src.core.config import settings
+from src.core.loop_state import LoopLocal
+from src.core.rate_limiter import RateLimiter, rate_limiter
+from src.utils.logger import get_logger
+
+logger = get_logger("SummaryCache")
+
+DEFAULT_SUMMARY_PROMPT = "Summarize the current tasks for a weekly review: progress, blockers and what is overdue."
+
+
+def summary_key(model: Optional[str], prompt: str, content: Any, client: Optional[str] = None) -> str:
+    """Cache key; `client` identifies the backend (router URL, stand-in model) producing the summary."""
+    raw = json.dumps([client, model, prompt, content], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), enough for batch budgeting."""
+    return max(1, len(text) // 4)
+
+
+class DiskLRUCache:
+    """JSON values stored as one file per key, evicted least-recently-used beyond `max_bytes`.
+
+    Methods do blocking file I/O; async callers run them in a worker thread.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> file size, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(".json"):
+                st = os.stat(os.path.join(directory, name))
+                entries.append((st.st_mtime, name[:-5], st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.bytes += size
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return False, None
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as fh:
+                    value = json.load(fh)
+                os.utime(self._path(key))
+            except (OSError, ValueError):
+                # removed or corrupted on disk; forget it
+                self.bytes -= self._index.pop(key)
+                self.misses += 1
+                return False, None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(value, default=str).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, self._path(key))
+            self.bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._index),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class LocalModelClient:
+    """Offline stand-in for the summarization model.
+
+    Each call sleeps `latency + per_token_seconds * prompt tokens` and returns a
+    deterministic extractive summary, so hit rates and latency savings can be
+    measured without a network or API key.
+    """
+
+    def __init__(self, latency: float = 0.5, per_token_seconds: float = 0.0002, max_chars: int = 280):
+        self.latency = latency
+        self.per_token_seconds = per_token_seconds
+        self.max_chars = max_chars
+        self.identity = f"local:{max_chars}"
+        self.calls = 0
+        self.prompts = 0
+        self.tokens = 0
+
+    async def complete(self, model: Optional[str], prompts: List[str]) -> List[Dict[str, Any]]:
+        tokens = sum(estimate_tokens(p) for p in prompts)
+        self.calls += 1
+        self.prompts += len(prompts)
+        self.tokens += tokens
+        await asyncio.sleep(self.latency + self.per_token_seconds * tokens)
+        results = []
+        for prompt in prompts:
+            body = prompt.split("\n\n", 1)[-1]
+            text = " ".join(body.split())
+            results.append({"tool": "openai", "action": "summarize", "status": "ok", "model": model, "summary": text[: self.max_chars]})
+        return results
+
+
+def router_identity(arouter: Any) -> str:
+    """Router class plus its base URL, if any; sync routers are unwrapped from their adapter."""
+    router = getattr(arouter, "router", arouter)
+    base_url = getattr(router, "base_url", None)
+    name = type(router).__name__
+    return f"{name}:{base_url}" if base_url else name
+
+
+class RouterModelClient:
+    """Sends a batch of summarize requests to ToolRouter in one `multi_execute` call."""
+
+    def __init__(self, arouter: Any, limiter: Optional[RateLimiter] = None):
+        self.arouter = arouter
+        self.limiter = limiter or rate_limiter
+        self.identity = router_identity(arouter)
+
+    async def complete(self, model: Optional[str], prompts: List[str]) -> List[Dict[str, Any]]:
+        executions = [{"tool": "openai", "action": "summarize", "payload": {"model": model, "prompt": p}} for p in prompts]
+        async with self.limiter.limit("openai"):
+            results = await self.arouter.multi_execute(executions)
+        if len(results) != len(prompts):
+            raise RuntimeError(f"router returned {len(results)} results for {len(prompts)} summarize requests")
+        return results
+
+
+class _BatchState:
+    """A loop's in-flight and queued summaries; futures and timer handles belong to one loop."""
+
+    def __init__(self) -> None:
+        self.inflight: Dict[str, asyncio.Future] = {}
+        # model -> queued (key, prompt, tokens, future) waiting for the next flush
+        self.pending: Dict[Optional[str], List[Tuple[str, str, int, asyncio.Future]]] = {}
+        self.pending_tokens: Dict[Optional[str], int] = {}
+        self.flush_handles: Dict[Optional[str], asyncio.TimerHandle] = {}
+
+
+class Summarizer:
+    """Cache lookup, single-flight deduplication and token-budgeted batching for summaries."""
+
+    def __init__(self, client: Any, cache: Optional[DiskLRUCache] = None, max_batch_tokens: int = 8000, batch_window: float = 0.02):
+        self.client = client
+        self.cache = cache
+        self.max_batch_tokens = max(1, max_batch_tokens)
+        self.batch_window = batch_window
+        self._state: LoopLocal[_BatchState] = LoopLocal(_BatchState)
+        self.requests = 0
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+        self.batches = 0
+        self.tokens_sent = 0
+        self.tokens_saved = 0
+        self.model_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, arouter: Any, limiter: Optional[RateLimiter] = None) -> "Summarizer":
+        client = LocalModelClient() if settings.SUMMARY_MODEL_CLIENT == "local" else RouterModelClient(arouter, limiter)
+        return cls(
+            client,
+            cache=DiskLRUCache(settings.SUMMARY_CACHE_DIR, settings.SUMMARY_CACHE_MAX_BYTES),
+            max_batch_tokens=settings.SUMMARY_BATCH_MAX_TOKENS,
+            batch_window=settings.SUMMARY_BATCH_WINDOW_SECONDS,
+        )
+
+    async def summarize(self, model: Optional[str], prompt: str, content: Any) -> Dict[str, Any]:
+        """Return the summary result for `content`, with `cached` set when no model call was made."""
+        state = self._state.get()
+        self.requests += 1
+        key = summary_key(model, prompt, content, getattr(self.client, "identity", type(self.client).__name__))
+        text = f"{prompt}\n\n{content if isinstance(content, str) else json.dumps(content, sort_keys=True, default=str)}"
+        if self.cache is not None:
+            found, value = await asyncio.to_thread(self.cache.get, key)
+            if found:
+                self.hits += 1
+                self.tokens_saved += estimate_tokens(text)
+                return dict(value, cached=True)
+        pending = state.inflight.get(key)
+        if pending is not None:
+            self.shared += 1
+            self.tokens_saved += estimate_tokens(text)
+            return dict(copy.deepcopy(await asyncio.shield(pending)), cached=True)
+
+        self.misses += 1
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        state.inflight[key] = fut
+        self._enqueue(model, key, text, fut)
+        try:
+            value = await asyncio.shield(fut)
+        finally:
+            if state.inflight.get(key) is fut:
+                del state.inflight[key]
+        return dict(copy.deepcopy(value), cached=False)
+
+    def _enqueue(self, model: Optional[str], key: str, text: str, fut: asyncio.Future) -> None:
+        state = self._state.get()
+        tokens = estimate_tokens(text)
+        state.pending.setdefault(model, []).append((key, text, tokens, fut))
+        state.pending_tokens[model] = state.pending_tokens.get(model, 0) + tokens
+        if state.pending_tokens[model] >= self.max_batch_tokens or self.batch_window <= 0:
+            self._flush(model)
+        elif model not in state.flush_handles:
+            state.flush_handles[model] = asyncio.get_running_loop().call_later(self.batch_window, self._flush, model)
+
+    def _flush(self, model: Optional[str]) -> None:
+        state = self._state.get()
+        handle = state.flush_handles.pop(model, None)
+        if handle is not None:
+            handle.cancel()
+        queued = state.pending.pop(model, [])
+        state.pending_tokens.pop(model, None)
+        batch: List[Tuple[str, str, int, asyncio.Future]] = []
+        used = 0
+        for entry in queued:
+            if batch and used + entry[2] > self.max_batch_tokens:
+                asyncio.ensure_future(self._send(model, batch))
+                batch, used = [], 0
+            batch.append(entry)
+            used += entry[2]
+        if batch:
+            asyncio.ensure_future(self._send(model, batch))
+
+    async def _send(self, model: Optional[str], batch: List[Tuple[str, str, int, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.tokens_sent += sum(tokens for _, _, tokens, _ in batch)
+        started = time.perf_counter()
+        try:
+            results = await self.client.complete(model, [text for _, text, _, _ in batch])
+        except BaseException as e:
+            for _, _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e if isinstance(e, Exception) else RuntimeError("summarize batch cancelled"))
+                    fut.exception()  # waiters re-raise it; don't log as unretrieved
+            if not isinstance(e, Exception):
+                raise
+            return
+        finally:
+            self.model_seconds += time.perf_counter() - started
+        for (key, _, _, fut), result in zip(batch, results):
+            if self.cache is not None and result.get("status") == "ok":
+                try:
+                    await asyncio.to_thread(self.cache.put, key, result)
+                except OSError as e:
+                    logger.warning("Failed to cache summary %s: %s", key[:12], e)
+            if not fut.done():
+                fut.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        served = self.hits + self.shared
+        per_miss = self.model_seconds / self.misses if self.misses else 0.0
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "shared_inflight": self.shared,
+            "misses": self.misses,
+            "hit_rate": round(served / self.requests, 3) if self.requests else 0.0,
+            "batches": self.batches,
+            "tokens_sent": self.tokens_sent,
+            "tokens_saved": self.tokens_saved,
+            "model_seconds": round(self.model_seconds, 3),
+            # each cache hit or shared call avoided roughly one miss's model time
+            "est_seconds_saved": round(served * per_miss, 3),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
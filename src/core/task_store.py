@@ -1,16 +1,23 @@
-from typing import Optional, List, Dict, Any, Union
+from typing import Callable, Optional, List, Dict, Any, Union
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 import json
 from pathlib import Path
 import tempfile
 
 import asyncio
 from databases import Database
-from sqlalchemy import (create_engine, MetaData, Table, Column, Integer, String, Text)
+from sqlalchemy import (and_, create_engine, inspect, text, MetaData, Table, Column, Index, Integer, String, Text, Float, Boolean, UniqueConstraint)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from src.utils.logger import get_logger
 from src.core.config import settings
+from src.core.dedup import MinHashLSH
 from src.core.exceptions import WorkflowExecutionError
+from src.core.loop_state import LoopLocal
+from src.core.scheduler import Schedule
+from src.core.search_index import search_index
 
 logger = get_logger("TaskStore")
 
@@ -24,6 +31,30 @@ class Task:
     owner: Optional[str] = None
     status: str = "open"
     metadata: Dict[str, Any] = field(default_factory=dict)
+    due_at: Optional[str] = None
+    reminded_at: Optional[str] = None
+    created_at: Optional[str] = None
+    status_changed_at: Optional[str] = None
+
+
+# statuses whose tasks can still become overdue
+ACTIVE_STATUSES = ("open", "in_progress")
+
+# dialects with an INSERT ... ON CONFLICT DO UPDATE construct; others upsert via select-then-write
+UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+# on_change(task_id, changed fields); a new task reports all of its fields
+TaskListener = Callable[[int, Dict[str, Any]], None]
+
+
+def normalize_timestamp(value: Union[str, datetime, None]) -> Optional[str]:
+    """Naive-UTC ISO string (the format used throughout the store), so stored values sort chronologically."""
+    if value is None or value == "":
+        return None
+    dt = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat()
 
 
 metadata_obj = MetaData()
@@ -37,6 +68,14 @@ tasks_table = Table(
     Column("owner", String(255)),
     Column("status", String(50)),
     Column("metadata", Text),
+    # naive-UTC ISO timestamps; see normalize_timestamp
+    Column("due_at", String(64)),
+    Column("reminded_at", String(64)),
+    Column("created_at", String(64)),
+    Column("status_changed_at", String(64)),
+    # JSON MinHash signature of title + description; "[]" when the text has no tokens
+    Column("minhash", Text),
+    Index("ix_tasks_status_due_at", "status", "due_at"),
 )
 
 workflow_runs_table = Table(
@@ -50,11 +89,89 @@ workflow_runs_table = Table(
     Column("log", Text),
 )
 
+workflow_steps_table = Table(
+    "workflow_steps",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("run_id", Integer, index=True),
+    Column("step_index", Integer),
+    Column("tool", String(255)),
+    Column("action", String(255)),
+    Column("idempotency_key", String(255), unique=True),
+    Column("status", String(50)),
+    Column("result", Text),
+    Column("updated_at", String(64)),
+)
+
+schedules_table = Table(
+    "schedules",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(255), unique=True),
+    Column("kind", String(50)),
+    Column("target", String(255)),
+    Column("cron", String(255)),
+    Column("params", Text),
+    Column("overlap", String(20)),
+    Column("jitter_seconds", Float),
+    Column("enabled", Boolean),
+    Column("last_run_at", String(64)),
+)
+
+# LSH buckets of canonical (non-duplicate) tasks' MinHash signatures
+task_lsh_table = Table(
+    "task_lsh",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("band", Integer),
+    Column("bucket", String(32)),
+    Column("task_id", Integer),
+    Index("ix_task_lsh_bucket", "bucket"),
+)
+
+# last scanned revision and content hash per Drive document, so unchanged documents are skipped
+drive_documents_table = Table(
+    "drive_documents",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("file_id", String(255), unique=True),
+    Column("name", String(1024)),
+    Column("revision_id", String(255)),
+    Column("content_hash", String(64)),
+    Column("item_hashes", Text),
+    Column("scanned_at", String(64)),
+)
+
+# per-agent, per-source polling cursors (Slack oldest ts, Gmail history id, ...)
+sync_state_table = Table(
+    "sync_state",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("agent", String(100)),
+    Column("source", String(255)),
+    Column("cursor", String(255)),
+    Column("updated_at", String(64)),
+    UniqueConstraint("agent", "source", name="uq_sync_state_agent_source"),
+)
+
+# escalations already posted, keyed by the rule's anchor value (e.g. status_changed_at; "" for rules
+# without one), so a restart does not post them again while the task still matches
+escalations_fired_table = Table(
+    "escalations_fired",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("rule", String(255)),
+    Column("task_id", Integer),
+    Column("anchor", String(64)),
+    Column("fired_at", String(64)),
+    UniqueConstraint("rule", "task_id", "anchor", name="uq_escalations_fired_rule_task_anchor"),
+)
+
 
 class TaskStore:
     """Async TaskStore using databases and SQLAlchemy table definitions."""
 
-    def __init__(self, db_url: Optional[str] = None, db_path: Optional[str] = None):
+    def __init__(self, db_url: Optional[str] = None, db_path: Optional[str] = None, dedup: Optional[bool] = None):
         # Backwards-compatible constructor: if db_path provided (tests), map to a sqlite URL
         if db_path is not None:
             if db_path == ":memory" or db_path == ":memory:":
@@ -97,9 +214,109 @@ class TaskStore:
         # use a temporary file above in that case.
         engine = create_engine(self.db_url.replace("+aiosqlite", ""))
         metadata_obj.create_all(engine)
+        _add_missing_columns(engine)
+        self._dialect = engine.dialect.name
+        self._listeners: List[TaskListener] = []
+        # near-duplicate detection on insert; duplicates are stored with status "duplicate"
+        enabled = settings.DEDUP_ENABLED if dedup is None else dedup
+        self.dedup = MinHashLSH(num_perm=settings.DEDUP_NUM_PERM, bands=settings.DEDUP_BANDS, threshold=settings.DEDUP_THRESHOLD) if enabled else None
+        self._insert_locks: LoopLocal[asyncio.Lock] = LoopLocal(asyncio.Lock)
+
+    async def _upsert(self, table: Table, keys: Dict[str, Any], values: Dict[str, Any]) -> None:
+        """Insert or update the row identified by the unique `keys` in one statement.
+
+        Unlike a select followed by an insert/update, the statement takes SQLite's
+        write lock up front, so it waits for concurrent writers instead of failing
+        with "database is locked" on lock upgrade. Dialects without ON CONFLICT
+        fall back to select-then-write in a transaction under the insert lock.
+        """
+        insert = UPSERT_INSERTS.get(self._dialect)
+        if insert is not None:
+            query = insert(table).values(**keys, **values).on_conflict_do_update(index_elements=list(keys), set_=values)
+            await self._db.execute(query)
+            return
+        where = and_(*(table.c[name] == value for name, value in keys.items()))
+        async with self._inserting(), self._db.transaction():
+            if await self._db.fetch_one(table.select().where(where)):
+                await self._db.execute(table.update().where(where).values(**values))
+            else:
+                await self._db.execute(table.insert().values(**keys, **values))
+
+    def _inserting(self) -> asyncio.Lock:
+        """Serializes task inserts and other read-then-write upserts: two such SQLite
+        transactions on separate connections would deadlock on lock upgrade."""
+        return self._insert_locks.get()
+
+    def subscribe(self, listener: TaskListener) -> None:
+        """Call `listener(task_id, changes)` after every task insert or update."""
+        self._listeners.append(listener)
+
+    def _notify(self, task_id: int, changes: Dict[str, Any]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(task_id, changes)
+            except Exception as e:
+                logger.exception("Task listener failed: %s", e)
 
     async def connect(self):
         await self._db.connect()
+        if self.dedup is not None:
+            await self.backfill_dedup_index()
+
+    async def backfill_dedup_index(self) -> int:
+        """Sign and bucket tasks stored before dedup was enabled; returns how many were indexed."""
+        try:
+            query = tasks_table.select().where(tasks_table.c.minhash.is_(None) & (tasks_table.c.status != "duplicate"))
+            rows = await self._db.fetch_all(query)
+            async with self._inserting(), self._db.transaction():
+                for r in rows:
+                    signature = self.dedup.signature(r["title"], r["description"])
+                    await self._db.execute(tasks_table.update().where(tasks_table.c.id == r["id"]).values(minhash=json.dumps(signature or [])))
+                    await self._index_signature(r["id"], signature)
+            if rows:
+                logger.info("Indexed %s existing task(s) for duplicate detection", len(rows))
+            return len(rows)
+        except Exception as e:
+            logger.exception("Failed to backfill dedup index: %s", e)
+            raise WorkflowExecutionError("Failed to backfill dedup index") from e
+
+    async def _index_signature(self, task_id: int, signature: Optional[List[int]]) -> None:
+        if signature:
+            rows = [{"band": band, "bucket": bucket, "task_id": task_id} for band, bucket in self.dedup.band_keys(signature)]
+            # one multi-row INSERT; execute_many would compile the statement once per row
+            await self._db.execute(task_lsh_table.insert().values(rows))
+
+    async def _find_duplicate(self, signature: List[int]) -> Optional[Dict[str, Any]]:
+        """Active canonical task most similar to `signature` (bucket lookups, then signature comparison)."""
+        buckets = [bucket for _, bucket in self.dedup.band_keys(signature)]
+        rows = await self._db.fetch_all(task_lsh_table.select().where(task_lsh_table.c.bucket.in_(buckets)))
+        ids = {r["task_id"] for r in rows}
+        if not ids:
+            self.dedup.best_match(signature, [])
+            return None
+        query = tasks_table.select().where(tasks_table.c.id.in_(ids) & tasks_table.c.status.in_(ACTIVE_STATUSES))
+        candidates = {r["id"]: r for r in await self._db.fetch_all(query)}
+        match = self.dedup.best_match(signature, ((tid, json.loads(r["minhash"] or "[]")) for tid, r in candidates.items()))
+        if match is None:
+            return None
+        return {"id": match[0], "similarity": round(match[1], 3), "metadata": json.loads(candidates[match[0]]["metadata"] or "{}")}
+
+    async def _insert_task(self, values: Dict[str, Any], metadata: Dict[str, Any]) -> Task:
+        """Insert one task (inside the caller's transaction), linking it to a near-duplicate if there is one."""
+        signature = self.dedup.signature(values["title"], values["description"]) if self.dedup is not None else None
+        duplicate = await self._find_duplicate(signature) if signature else None
+        if duplicate is not None:
+            values = {**values, "status": "duplicate"}
+            metadata = {**metadata, "duplicate_of": duplicate["id"], "similarity": duplicate["similarity"]}
+        query = tasks_table.insert().values(metadata=json.dumps(metadata), minhash=json.dumps(signature) if self.dedup is not None else None, **values)
+        task_id = int(await self._db.execute(query))
+        if duplicate is None:
+            await self._index_signature(task_id, signature)
+        else:
+            canonical = duplicate["metadata"]
+            canonical["duplicates"] = canonical.get("duplicates", []) + [task_id]
+            await self._db.execute(tasks_table.update().where(tasks_table.c.id == duplicate["id"]).values(metadata=json.dumps(canonical)))
+        return Task(id=task_id, metadata=metadata, **values)
 
     async def create_run(self, workflow_name: str, started_at: str, status: str = "pending", log: Optional[Union[dict, list, str]] = None) -> int:
         try:
@@ -124,6 +341,44 @@ class TaskStore:
             logger.exception("Failed to update workflow run: %s", e)
             raise WorkflowExecutionError("Failed to update workflow run") from e
 
+    async def create_runs(self, runs: List[Dict[str, Any]]) -> List[int]:
+        """Create many run records in one transaction.
+
+        Each item has `workflow_name`, `started_at` and optional `status`/`log`.
+        """
+        try:
+            ids: List[int] = []
+            async with self._db.transaction():
+                for r in runs:
+                    query = workflow_runs_table.insert().values(
+                        workflow_name=r["workflow_name"],
+                        started_at=r["started_at"],
+                        finished_at="",
+                        status=r.get("status", "pending"),
+                        log=json.dumps(r.get("log") or {}),
+                    )
+                    ids.append(int(await self._db.execute(query)))
+            return ids
+        except Exception as e:
+            logger.exception("Failed to create workflow runs: %s", e)
+            raise WorkflowExecutionError("Failed to create workflow runs") from e
+
+    async def update_runs(self, runs: List[Dict[str, Any]]) -> None:
+        """Finish many run records in one transaction.
+
+        Each item has `id`, `finished_at`, `status` and optional `log`.
+        """
+        try:
+            async with self._db.transaction():
+                for r in runs:
+                    query = workflow_runs_table.update().where(workflow_runs_table.c.id == r["id"]).values(
+                        finished_at=r["finished_at"], status=r["status"], log=json.dumps(r.get("log") or {})
+                    )
+                    await self._db.execute(query)
+        except Exception as e:
+            logger.exception("Failed to update workflow runs: %s", e)
+            raise WorkflowExecutionError("Failed to update workflow runs") from e
+
     async def list_runs(self, limit: int = 20, offset: int = 0, query: Optional[str] = None):
         try:
             import json as _json
@@ -152,6 +407,185 @@ class TaskStore:
             logger.exception("Failed to list workflow runs: %s", e)
             raise WorkflowExecutionError("Failed to list workflow runs") from e
 
+    async def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            r = await self._db.fetch_one(workflow_runs_table.select().where(workflow_runs_table.c.id == run_id))
+            if not r:
+                return None
+            obj = dict(r)
+            try:
+                obj["log"] = json.loads(obj.get("log") or "{}")
+            except Exception:
+                obj["log"] = obj.get("log")
+            return obj
+        except Exception as e:
+            logger.exception("Failed to get workflow run: %s", e)
+            raise WorkflowExecutionError("Failed to get workflow run") from e
+
+    async def save_step(self, run_id: int, step_index: int, tool: Optional[str], action: Optional[str], idempotency_key: str, status: str, result: Optional[Union[dict, list]] = None, updated_at: Optional[str] = None) -> None:
+        """Insert or update the checkpoint for one step of a workflow run."""
+        try:
+            values = dict(run_id=run_id, step_index=step_index, tool=tool, action=action, status=status, result=json.dumps(result or []), updated_at=updated_at or "")
+            # concurrent runs checkpoint at once; a single upsert never deadlocks on lock upgrade
+            await self._upsert(workflow_steps_table, {"idempotency_key": idempotency_key}, values)
+        except Exception as e:
+            logger.exception("Failed to checkpoint workflow step: %s", e)
+            raise WorkflowExecutionError("Failed to checkpoint workflow step") from e
+
+    async def list_steps(self, run_id: int) -> List[Dict[str, Any]]:
+        try:
+            query = workflow_steps_table.select().where(workflow_steps_table.c.run_id == run_id).order_by(workflow_steps_table.c.step_index)
+            rows = await self._db.fetch_all(query)
+            out = []
+            for r in rows:
+                obj = dict(r)
+                obj["result"] = json.loads(obj.get("result") or "[]")
+                out.append(obj)
+            return out
+        except Exception as e:
+            logger.exception("Failed to list workflow steps: %s", e)
+            raise WorkflowExecutionError("Failed to list workflow steps") from e
+
+    async def list_schedules(self) -> List[Schedule]:
+        try:
+            rows = await self._db.fetch_all(schedules_table.select().order_by(schedules_table.c.id))
+            return [
+                Schedule(
+                    name=r["name"],
+                    kind=r["kind"],
+                    target=r["target"],
+                    cron=r["cron"],
+                    params=json.loads(r["params"] or "{}"),
+                    overlap=r["overlap"] or "skip",
+                    jitter_seconds=float(r["jitter_seconds"] or 0.0),
+                    enabled=bool(r["enabled"]),
+                    last_run_at=r["last_run_at"] or None,
+                )
+                for r in rows
+            ]
+        except Exception as e:
+            logger.exception("Failed to list schedules: %s", e)
+            raise WorkflowExecutionError("Failed to list schedules") from e
+
+    async def upsert_schedule(self, schedule: Schedule) -> None:
+        try:
+            values = dict(
+                kind=schedule.kind,
+                target=schedule.target,
+                cron=schedule.cron,
+                params=json.dumps(schedule.params or {}),
+                overlap=schedule.overlap,
+                jitter_seconds=schedule.jitter_seconds,
+                enabled=schedule.enabled,
+                last_run_at=schedule.last_run_at or "",
+            )
+            # API edits and the scheduler's own bookkeeping save schedules concurrently
+            await self._upsert(schedules_table, {"name": schedule.name}, values)
+        except Exception as e:
+            logger.exception("Failed to save schedule: %s", e)
+            raise WorkflowExecutionError("Failed to save schedule") from e
+
+    async def mark_schedule_run(self, name: str, ran_at: str) -> None:
+        try:
+            query = schedules_table.update().where(schedules_table.c.name == name).values(last_run_at=ran_at)
+            await self._db.execute(query)
+        except Exception as e:
+            logger.exception("Failed to update schedule: %s", e)
+            raise WorkflowExecutionError("Failed to update schedule") from e
+
+    async def delete_schedule(self, name: str) -> None:
+        try:
+            await self._db.execute(schedules_table.delete().where(schedules_table.c.name == name))
+        except Exception as e:
+            logger.exception("Failed to delete schedule: %s", e)
+            raise WorkflowExecutionError("Failed to delete schedule") from e
+
+    async def get_cursor(self, agent: str, source: str) -> Optional[str]:
+        try:
+            query = sync_state_table.select().where((sync_state_table.c.agent == agent) & (sync_state_table.c.source == source))
+            r = await self._db.fetch_one(query)
+            return (r["cursor"] or None) if r else None
+        except Exception as e:
+            logger.exception("Failed to get sync cursor: %s", e)
+            raise WorkflowExecutionError("Failed to get sync cursor") from e
+
+    async def set_cursor(self, agent: str, source: str, cursor: Optional[str], updated_at: Optional[str] = None) -> None:
+        try:
+            values = dict(cursor=cursor or "", updated_at=updated_at or datetime.utcnow().isoformat())
+            # poll loops, webhook syncs and ingest save cursors concurrently
+            await self._upsert(sync_state_table, {"agent": agent, "source": source}, values)
+        except Exception as e:
+            logger.exception("Failed to save sync cursor: %s", e)
+            raise WorkflowExecutionError("Failed to save sync cursor") from e
+
+    async def list_sync_state(self) -> List[Dict[str, Any]]:
+        try:
+            rows = await self._db.fetch_all(sync_state_table.select().order_by(sync_state_table.c.agent, sync_state_table.c.source))
+            return [{"agent": r["agent"], "source": r["source"], "cursor": r["cursor"] or None, "updated_at": r["updated_at"]} for r in rows]
+        except Exception as e:
+            logger.exception("Failed to list sync state: %s", e)
+            raise WorkflowExecutionError("Failed to list sync state") from e
+
+    async def list_fired_escalations(self) -> List[Dict[str, Any]]:
+        try:
+            rows = await self._db.fetch_all(escalations_fired_table.select().order_by(escalations_fired_table.c.id))
+            return [{"rule": r["rule"], "task_id": r["task_id"], "anchor": r["anchor"] or "", "fired_at": r["fired_at"]} for r in rows]
+        except Exception as e:
+            logger.exception("Failed to list fired escalations: %s", e)
+            raise WorkflowExecutionError("Failed to list fired escalations") from e
+
+    async def mark_escalation_fired(self, rule: str, task_id: int, anchor: str = "", fired_at: Optional[str] = None) -> None:
+        try:
+            keys = {"rule": rule, "task_id": task_id, "anchor": anchor or ""}
+            await self._upsert(escalations_fired_table, keys, {"fired_at": fired_at or datetime.utcnow().isoformat()})
+        except Exception as e:
+            logger.exception("Failed to record fired escalation: %s", e)
+            raise WorkflowExecutionError("Failed to record fired escalation") from e
+
+    async def clear_fired_escalation(self, rule: str, task_id: int) -> None:
+        """Forget that `rule` fired for the task (it stopped matching), so a new match fires again."""
+        try:
+            where = (escalations_fired_table.c.rule == rule) & (escalations_fired_table.c.task_id == task_id)
+            await self._db.execute(escalations_fired_table.delete().where(where))
+        except Exception as e:
+            logger.exception("Failed to clear fired escalation: %s", e)
+            raise WorkflowExecutionError("Failed to clear fired escalation") from e
+
+    async def get_drive_documents(self, file_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored scan state for the given Drive file ids (missing ids were never scanned)."""
+        if not file_ids:
+            return {}
+        try:
+            rows = await self._db.fetch_all(drive_documents_table.select().where(drive_documents_table.c.file_id.in_(file_ids)))
+            return {
+                r["file_id"]: {
+                    "name": r["name"],
+                    "revision_id": r["revision_id"] or None,
+                    "content_hash": r["content_hash"] or None,
+                    "item_hashes": json.loads(r["item_hashes"] or "[]"),
+                    "scanned_at": r["scanned_at"],
+                }
+                for r in rows
+            }
+        except Exception as e:
+            logger.exception("Failed to get Drive documents: %s", e)
+            raise WorkflowExecutionError("Failed to get Drive documents") from e
+
+    async def save_drive_document(self, file_id: str, name: Optional[str], revision_id: Optional[str], content_hash: Optional[str], item_hashes: List[str]) -> None:
+        try:
+            values = dict(
+                name=name,
+                revision_id=revision_id or "",
+                content_hash=content_hash or "",
+                item_hashes=json.dumps(item_hashes),
+                scanned_at=datetime.utcnow().isoformat(),
+            )
+            # Drive scans save documents while tasks are being ingested
+            await self._upsert(drive_documents_table, {"file_id": file_id}, values)
+        except Exception as e:
+            logger.exception("Failed to save Drive document: %s", e)
+            raise WorkflowExecutionError("Failed to save Drive document") from e
+
     async def disconnect(self):
         await self._db.disconnect()
 
@@ -159,22 +593,59 @@ class TaskStore:
     def _run_sync(self, coro):
         return asyncio.run(coro)
 
-    async def add_task_async(self, source: str, title: str, description: Optional[str] = None, owner: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Task:
+    async def add_task_async(
+        self,
+        source: str,
+        title: str,
+        description: Optional[str] = None,
+        owner: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        due_at: Union[str, datetime, None] = None,
+    ) -> Task:
         try:
-            query = tasks_table.insert().values(
-                source=source,
-                title=title,
-                description=description,
-                owner=owner,
-                status="open",
-                metadata=json.dumps(metadata or {}),
-            )
-            task_id = await self._db.execute(query)
-            return Task(id=int(task_id), source=source, title=title, description=description, owner=owner, status="open", metadata=metadata or {})
+            due_at = normalize_timestamp(due_at)
+            now = datetime.utcnow().isoformat()
+            values = dict(source=source, title=title, description=description, owner=owner, status="open", due_at=due_at, created_at=now, status_changed_at=now)
+            async with self._inserting(), self._db.transaction():
+                task = await self._insert_task(values, metadata or {})
+            search_index.index_task(task)
+            self._notify(task.id, dict(task.__dict__))
+            return task
         except Exception as e:
             logger.exception("Failed to add task: %s", e)
             raise WorkflowExecutionError("Failed to add task") from e
 
+    async def add_tasks_async(self, tasks: List[Dict[str, Any]]) -> List[Task]:
+        """Insert several tasks in one transaction. Each dict takes add_task_async's arguments.
+
+        Near-duplicates (of stored tasks or of earlier tasks in the batch) are
+        stored with status "duplicate" and `metadata.duplicate_of`; the original
+        lists them under `metadata.duplicates`.
+        """
+        try:
+            created: List[Task] = []
+            now = datetime.utcnow().isoformat()
+            async with self._inserting(), self._db.transaction():
+                for t in tasks:
+                    values = dict(
+                        source=t["source"],
+                        title=t["title"],
+                        description=t.get("description"),
+                        owner=t.get("owner"),
+                        status="open",
+                        due_at=normalize_timestamp(t.get("due_at")),
+                        created_at=now,
+                        status_changed_at=now,
+                    )
+                    created.append(await self._insert_task(values, t.get("metadata") or {}))
+            for task in created:
+                search_index.index_task(task)
+                self._notify(task.id, dict(task.__dict__))
+            return created
+        except Exception as e:
+            logger.exception("Failed to add tasks: %s", e)
+            raise WorkflowExecutionError("Failed to add tasks") from e
+
     async def list_tasks_async(self, status: Optional[str] = None) -> List[Task]:
         try:
             if status:
@@ -182,7 +653,7 @@ class TaskStore:
             else:
                 query = tasks_table.select()
             rows = await self._db.fetch_all(query)
-            return [Task(id=r["id"], source=r["source"], title=r["title"], description=r["description"], owner=r["owner"], status=r["status"], metadata=json.loads(r["metadata"] or "{}")) for r in rows]
+            return [_row_to_task(r) for r in rows]
         except Exception as e:
             logger.exception("Failed to list tasks: %s", e)
             raise WorkflowExecutionError("Failed to list tasks") from e
@@ -193,19 +664,92 @@ class TaskStore:
             r = await self._db.fetch_one(query)
             if not r:
                 return None
-            return Task(id=r["id"], source=r["source"], title=r["title"], description=r["description"], owner=r["owner"], status=r["status"], metadata=json.loads(r["metadata"] or "{}"))
+            return _row_to_task(r)
         except Exception as e:
             logger.exception("Failed to get task: %s", e)
             raise WorkflowExecutionError("Failed to get task") from e
 
     async def update_status_async(self, task_id: int, status: str) -> bool:
         try:
-            query = tasks_table.update().where(tasks_table.c.id == task_id).values(status=status)
+            changed_at = datetime.utcnow().isoformat()
+            query = tasks_table.update().where(tasks_table.c.id == task_id).values(status=status, status_changed_at=changed_at)
             await self._db.execute(query)
+            search_index.update_meta("task", task_id, status=status)
+            self._notify(task_id, {"status": status, "status_changed_at": changed_at})
             return True
         except Exception as e:
             logger.exception("Failed to update status: %s", e)
             raise WorkflowExecutionError("Failed to update status") from e
 
+    async def set_due_async(self, task_id: int, due_at: Union[str, datetime, None]) -> Optional[str]:
+        """Set (or clear, with None) a task's due time; clears reminded_at so the new deadline is reminded.
+
+        Listeners are told the task's status, title and owner along with the
+        new deadline, so they can schedule it without loading the task.
+        """
+        due_at = normalize_timestamp(due_at)
+        try:
+            query = tasks_table.update().where(tasks_table.c.id == task_id).values(due_at=due_at, reminded_at=None)
+            await self._db.execute(query)
+            row = await self._db.fetch_one(tasks_table.select().where(tasks_table.c.id == task_id))
+        except Exception as e:
+            logger.exception("Failed to set due date: %s", e)
+            raise WorkflowExecutionError("Failed to set due date") from e
+        if row is not None:
+            self._notify(task_id, {"due_at": due_at, "reminded_at": None, "status": row["status"], "title": row["title"], "owner": row["owner"]})
+        return due_at
+
+    async def mark_reminded_async(self, task_id: int, reminded_at: Optional[str] = None) -> None:
+        try:
+            query = tasks_table.update().where(tasks_table.c.id == task_id).values(reminded_at=reminded_at or datetime.utcnow().isoformat())
+            await self._db.execute(query)
+        except Exception as e:
+            logger.exception("Failed to mark task reminded: %s", e)
+            raise WorkflowExecutionError("Failed to mark task reminded") from e
+
+    async def list_due_tasks_async(self, before: Optional[str] = None) -> List[Task]:
+        """Active tasks with a due time (optionally due before `before`), soonest first."""
+        try:
+            query = tasks_table.select().where(tasks_table.c.status.in_(ACTIVE_STATUSES) & tasks_table.c.due_at.isnot(None))
+            if before is not None:
+                query = query.where(tasks_table.c.due_at < normalize_timestamp(before))
+            rows = await self._db.fetch_all(query.order_by(tasks_table.c.due_at))
+            return [_row_to_task(r) for r in rows]
+        except Exception as e:
+            logger.exception("Failed to list due tasks: %s", e)
+            raise WorkflowExecutionError("Failed to list due tasks") from e
+
     # Removed synchronous wrappers for full async API surface.
 
+
+def _row_to_task(r: Any) -> Task:
+    return Task(
+        id=r["id"],
+        source=r["source"],
+        title=r["title"],
+        description=r["description"],
+        owner=r["owner"],
+        status=r["status"],
+        metadata=json.loads(r["metadata"] or "{}"),
+        due_at=r["due_at"] or None,
+        reminded_at=r["reminded_at"] or None,
+        created_at=r["created_at"] or None,
+        status_changed_at=r["status_changed_at"] or None,
+    )
+
+
+def _add_missing_columns(engine: Any) -> None:
+    """Add columns and indexes introduced after a database file was created.
+
+    `create_all` only creates missing tables, so older files would otherwise
+    lack new columns such as tasks.due_at.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in metadata_obj.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
@@ -1,9 +1,11 @@
 from typing import Any, Dict, List, Optional
+import asyncio
 
 from src.utils.logger import get_logger
 from src.core.interfaces import ToolRouterInterface
 from src.core.config import settings
-
+from src.core.fault_injection import FaultInjector
+from src.core.search_index import SearchIndex, search_index
 
 
 logger = get_logger("ToolRouterStub")
@@ -13,12 +15,20 @@ class ToolRouterStub(ToolRouterInterface):
     """A lightweight stub for Composio ToolRouter used for local development and testing.
 
     In production, swap this for the real Composio ToolRouter client and remove the stub.
+
+    For load testing, `faults` configures per tool/action latency, errors,
+    timeouts and result sizes (see `src.core.fault_injection`). Faults apply
+    to `amulti_execute`, which async callers such as the planner prefer.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, faults: Optional[FaultInjector] = None, index: Optional[SearchIndex] = None):
         # Prefer pydantic settings for validated config
         self.api_key = api_key or settings.COMPOSIO_API_KEY
         self.connections: Dict[str, Any] = {}
+        if faults is None and settings.TOOLROUTER_STUB_FAULTS:
+            faults = FaultInjector(settings.TOOLROUTER_STUB_FAULTS, seed=settings.TOOLROUTER_STUB_SEED)
+        self.faults = faults
+        self.index = index if index is not None else search_index
 
     # Connection management
     def connect(self, name: str, token: Optional[str] = None) -> Dict[str, str]:
@@ -37,7 +47,7 @@ class ToolRouterStub(ToolRouterInterface):
         plan_definition: a dict describing steps. Returns a plan record with id.
         """
         plan_id = f"plan_{len(plan_definition.get('steps', []))}"
-        logger.info("Registered plan %s", plan_id)
+        logger.debug("Registered plan %s", plan_id)
         return {"plan_id": plan_id, "plan": plan_definition}
 
     def multi_execute(self, executions: List[dict]) -> List[dict]:
@@ -51,7 +61,7 @@ class ToolRouterStub(ToolRouterInterface):
             tool = ex.get("tool")
             action = ex.get("action")
             payload = ex.get("payload")
-            logger.info("Stub executing %s.%s with payload %s", tool, action, payload)
+            logger.debug("Stub executing %s.%s with payload %s", tool, action, payload)
             # For cross-tool orchestration, inject realistic mappings
             if tool == "gmail":
                 # return some messages
@@ -64,10 +74,30 @@ class ToolRouterStub(ToolRouterInterface):
                 results.append({"tool": tool, "action": action, "status": "ok", "payload": payload})
         return results
 
+    async def _execute(self, executions: List[dict]) -> List[dict]:
+        # subclasses may override multi_execute with a coroutine
+        result = self.multi_execute(executions)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def amulti_execute(self, executions: List[dict]) -> List[dict]:
+        """Async multi_execute with fault injection applied to each execution."""
+        if self.faults is None:
+            return await self._execute(executions)
+        results = []
+        for ex in executions:
+            profile = await self.faults.apply(ex.get("tool"), ex.get("action"))
+            for result in await self._execute([ex]):
+                if profile is not None and profile.payload_bytes:
+                    result["data"] = "x" * profile.payload_bytes
+                results.append(result)
+        return results
+
     def search(self, query: str) -> Dict[str, Any]:
-        """Stub for contextual search across connected tools."""
-        logger.info("Stub search: %s", query)
-        return {"query": query, "results": []}
+        """Contextual search across tools, answered from the local search index."""
+        logger.debug("Stub search: %s", query)
+        return self.index.search(query)
 
     def remote_workbench(self, tool: str, test_payload: dict) -> Dict[str, Any]:
         """Simulate remote workbench testing of a tool action."""
@@ -76,5 +106,5 @@ class ToolRouterStub(ToolRouterInterface):
 
     def invoke(self, tool: str, method: str, payload: Optional[dict] = None) -> dict:
         # Simple local stub behavior for direct tool invocation
-        logger.info("Invoking %s.%s with %s", tool, method, payload)
+        logger.debug("Invoking %s.%s with %s", tool, method, payload)
         return {"tool": tool, "method": method, "payload": payload or {}, "status": "ok"}
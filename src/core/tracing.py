@@ -0,0 +1,150 @@
+"""Lightweight span instrumentation for workflow runs.
+
+A `RunTrace` collects spans measured with the monotonic `perf_counter` clock.
+The planner activates one trace per run; code running inside it opens spans
+with `span(name, **attributes)` without needing a handle to the trace. When
+no trace is active `span()` is a cheap no-op. Traces serialize to a timeline
+dict stored with the run and can optionally be exported to OpenTelemetry.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import itertools
+import time
+import uuid
+
+from src.core.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger("Tracing")
+
+try:
+    from opentelemetry import trace as otel_trace  # type: ignore
+except Exception:
+    otel_trace = None
+
+_current_trace: ContextVar[Optional["RunTrace"]] = ContextVar("aiocc_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("aiocc_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: int = 0
+    parent_id: Optional[int] = None
+    start: float = 0.0
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class RunTrace:
+    """Spans recorded for one workflow run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.origin = time.perf_counter()
+        self.origin_wall_ns = time.time_ns()
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+
+    @contextmanager
+    def activate(self) -> Iterator["RunTrace"]:
+        token = _current_trace.set(self)
+        try:
+            yield self
+        finally:
+            _current_trace.reset(token)
+
+    def _start(self, name: str, attributes: Dict[str, Any]) -> Span:
+        parent = _current_span.get()
+        sp = Span(
+            name=name,
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent is not None else None,
+            start=time.perf_counter(),
+            attributes=attributes,
+        )
+        self.spans.append(sp)
+        return sp
+
+    def _ms(self, t: float) -> float:
+        return round((t - self.origin) * 1000.0, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.perf_counter()
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at_ns": self.origin_wall_ns,
+            "duration_ms": self._ms(now),
+            "spans": [
+                {
+                    "id": sp.span_id,
+                    "parent_id": sp.parent_id,
+                    "name": sp.name,
+                    "start_ms": self._ms(sp.start),
+                    "duration_ms": round(((sp.end if sp.end is not None else now) - sp.start) * 1000.0, 3),
+                    "attributes": sp.attributes,
+                }
+                for sp in self.spans
+            ],
+        }
+
+
+def current_trace() -> Optional[RunTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Record a span in the active trace; yields the span so callers can add attributes."""
+    tr = _current_trace.get()
+    if tr is None:
+        yield Span(name=name, attributes=attributes)
+        return
+    sp = tr._start(name, attributes)
+    token = _current_span.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.attributes.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        sp.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+def export_otel(trace: RunTrace) -> bool:
+    """Replay a finished trace into OpenTelemetry if it is installed and enabled.
+
+    Span start/end times are converted from monotonic offsets to wall-clock
+    nanoseconds anchored at the trace's start.
+    """
+    if otel_trace is None or not settings.OTEL_EXPORT_ENABLED:
+        return False
+    try:
+        tracer = otel_trace.get_tracer("aiocc.workflows")
+
+        def ns(t: float) -> int:
+            return trace.origin_wall_ns + int((t - trace.origin) * 1e9)
+
+        exported: Dict[int, Any] = {}
+        root = tracer.start_span(f"workflow {trace.name}", start_time=trace.origin_wall_ns)
+        root.set_attribute("aiocc.trace_id", trace.trace_id)
+        for sp in trace.spans:
+            parent = exported.get(sp.parent_id) if sp.parent_id else root
+            ctx = otel_trace.set_span_in_context(parent or root)
+            o = tracer.start_span(sp.name, context=ctx, start_time=ns(sp.start))
+            for k, v in sp.attributes.items():
+                if isinstance(v, (str, bool, int, float)):
+                    o.set_attribute(k, v)
+            o.end(end_time=ns(sp.end if sp.end is not None else sp.start))
+            exported[sp.span_id] = o
+        root.end()
+        return True
+    except Exception:
+        logger.exception("OpenTelemetry export failed")
+        return False
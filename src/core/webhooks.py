@@ -0,0 +1,135 @@
+"""Verification and parsing for pushed Slack and Gmail events.
+
+Slack Events API requests are signed with the app's signing secret
+(`X-Slack-Signature: v0=<hmac-sha256 of "v0:<timestamp>:<body>">`) and are
+rejected when the timestamp is outside a five-minute window. Gmail changes
+arrive as Pub/Sub push messages whose base64 `data` carries the mailbox and
+its new history id; the push subscription URL includes a shared token.
+
+Both providers redeliver on slow or failed acknowledgements, so events are
+deduplicated by id before being queued.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+SLACK_SIGNATURE_VERSION = "v0"
+SLACK_MAX_SKEW_SECONDS = 300
+# message subtypes that are edits, bot posts or housekeeping rather than new messages
+SLACK_IGNORED_SUBTYPES = {"bot_message", "message_changed", "message_deleted", "channel_join", "channel_leave"}
+
+
+def slack_signature(secret: str, timestamp: str, body: bytes) -> str:
+    base = f"{SLACK_SIGNATURE_VERSION}:{timestamp}:".encode() + body
+    return f"{SLACK_SIGNATURE_VERSION}=" + hmac.new(secret.encode(), base, hashlib.sha256).hexdigest()
+
+
+def verify_slack_signature(
+    secret: str,
+    timestamp: Optional[str],
+    body: bytes,
+    signature: Optional[str],
+    now: Optional[float] = None,
+    max_skew: float = SLACK_MAX_SKEW_SECONDS,
+) -> bool:
+    """Check a Slack request signature and reject stale (replayed) timestamps."""
+    if not secret or not timestamp or not signature:
+        return False
+    try:
+        ts = int(timestamp)
+    except ValueError:
+        return False
+    if abs((now if now is not None else time.time()) - ts) > max_skew:
+        return False
+    return hmac.compare_digest(slack_signature(secret, timestamp, body), signature)
+
+
+def sign_slack_request(secret: str, body: bytes, timestamp: Optional[int] = None) -> Dict[str, str]:
+    """Headers Slack would send with `body`; used by the replay tool and tests."""
+    ts = str(int(timestamp if timestamp is not None else time.time()))
+    return {
+        "X-Slack-Request-Timestamp": ts,
+        "X-Slack-Signature": slack_signature(secret, ts, body),
+        "Content-Type": "application/json",
+    }
+
+
+def verify_token(expected: Optional[str], given: Optional[str]) -> bool:
+    return bool(expected) and given is not None and hmac.compare_digest(expected, given)
+
+
+def slack_event_to_item(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Turn an `event_callback` message into a polled-style Slack item, or None to ignore it."""
+    event = payload.get("event") or {}
+    if event.get("type") not in ("message", "app_mention"):
+        return None
+    if event.get("subtype") in SLACK_IGNORED_SUBTYPES or event.get("bot_id"):
+        return None
+    channel, ts = event.get("channel"), event.get("ts")
+    if not event.get("text") or not ts:
+        return None
+    return {"id": f"{channel}:{ts}", "ts": ts, "channel": channel, "text": event["text"], "user": event.get("user")}
+
+
+def decode_pubsub_push(payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Return (message id, decoded data) of a Pub/Sub push body; ValueError if malformed."""
+    message = payload.get("message") if isinstance(payload, dict) else None
+    if not isinstance(message, dict):
+        raise ValueError("missing Pub/Sub message")
+    message_id = message.get("messageId") or message.get("message_id")
+    if not message_id:
+        raise ValueError("missing Pub/Sub messageId")
+    try:
+        data = json.loads(base64.b64decode(message.get("data") or "") or b"{}")
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"undecodable Pub/Sub data: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError("Pub/Sub data is not an object")
+    return str(message_id), data
+
+
+def build_pubsub_push(data: Dict[str, Any], message_id: str, subscription: str = "projects/aiocc/subscriptions/gmail") -> Dict[str, Any]:
+    """Pub/Sub push body wrapping `data`; used by the replay tool and tests."""
+    return {
+        "message": {
+            "data": base64.b64encode(json.dumps(data).encode()).decode(),
+            "messageId": message_id,
+            "publishTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "subscription": subscription,
+    }
+
+
+class EventDeduper:
+    """Remembers recently seen event ids (bounded LRU with a TTL)."""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self.duplicates = 0
+
+    def seen(self, key: str) -> bool:
+        """True if `key` was seen within the TTL; otherwise records it and returns False."""
+        now = time.monotonic()
+        while self._seen:
+            _, at = next(iter(self._seen.items()))
+            if now - at <= self.ttl_seconds and len(self._seen) < self.max_size:
+                break
+            self._seen.popitem(last=False)
+        if key in self._seen:
+            self.duplicates += 1
+            return True
+        self._seen[key] = now
+        return False
+
+    def forget(self, key: str) -> None:
+        self._seen.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tracked": len(self._seen), "duplicates": self.duplicates}
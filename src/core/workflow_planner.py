@@ -1,15 +1,37 @@
-from typing import Dict, Any, List, Optional
-from src.core.interfaces import ToolRouterInterface
-from src.core.task_store import TaskStore
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+from src.core.interfaces import AsyncToolRouterInterface, ToolRouterInterface
+from src.core.loop_state import LoopLocal
+from src.core.router_adapter import as_async_router
+from src.core.task_store import ACTIVE_STATUSES, TaskStore
+from src.core.rate_limiter import RateLimiter, limit_key, rate_limiter
+from src.core.step_cache import StepCache
+from src.core.summary_cache import DEFAULT_SUMMARY_PROMPT, Summarizer
+from src.core.search_index import SearchIndex, search_index
+from src.core.config import settings
+from src.core.exceptions import RunStateError
+from src.core.deadline import bounded, deadline_scope, effective_timeout
+from src.core.tracing import RunTrace, export_otel, span
 from src.utils.logger import get_logger
 from src.workflows.workflow_templates.weekly_review import weekly_review_plan
 from src.workflows.workflow_templates.weekly_review_cross_tool import weekly_review_cross_tool_plan
 from datetime import datetime
 import asyncio
+import copy
+import hashlib
+import json
 
 
 logger = get_logger("WorkflowPlanner")
 
+# terminal run statuses from which `resume` may re-run the remaining steps
+RESUMABLE_STATUSES = ("error", "timeout", "cancelled")
+
+# Read-only (tool, action) pairs whose results may be shared between runs.
+DEFAULT_CACHEABLE_ACTIONS: Set[Tuple[str, str]] = {
+    ("notion", "fetch_tasks"),
+    ("gmail", "fetch_messages"),
+}
+
 
 class WorkflowPlanner:
     """Loads workflow templates and executes them via ToolRouter meta-tools (stubbed).
@@ -18,15 +40,54 @@ class WorkflowPlanner:
     placeholders in plan step payloads. Placeholders use the format {{param}}.
     """
 
-    def __init__(self, router: ToolRouterInterface, store: TaskStore):
+    def __init__(
+        self,
+        router: Union[ToolRouterInterface, AsyncToolRouterInterface],
+        store: TaskStore,
+        limiter: Optional[RateLimiter] = None,
+        step_cache: Optional[StepCache] = None,
+        index: Optional[SearchIndex] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
         self.router = router
+        # all router calls go through the async interface; sync routers are adapted
+        self.arouter = as_async_router(router)
         self.store = store
+        # shared with the agents so all callers of a tool draw from one budget
+        self.limiter = limiter or rate_limiter
+        self.step_cache = step_cache or StepCache.from_settings()
+        # summarize steps are cached by input content and batched across concurrent runs
+        if summarizer is None and settings.SUMMARY_CACHE_ENABLED:
+            summarizer = Summarizer.from_settings(self.arouter, self.limiter)
+        self.summarizer = summarizer
+        # items fetched by steps (messages, pages, tasks) feed the local search index
+        self.search_index = index if index is not None else search_index
+        self.max_attempts = 3
+        self.retry_backoff = 0.5
+        # routers may declare extra read-only actions via `cacheable_actions`
+        self.cacheable_actions: Set[Tuple[str, str]] = set(DEFAULT_CACHEABLE_ACTIONS)
+        self.cacheable_actions.update(getattr(router, "cacheable_actions", set()) or set())
+        # per-workflow cap on simultaneously executing runs; excess runs queue
+        self.max_concurrency: Dict[str, int] = dict(settings.WORKFLOW_MAX_CONCURRENCY or {})
+        # semaphores and futures belong to one event loop; each loop gets its own
+        self._workflow_slots: LoopLocal[Dict[str, asyncio.Semaphore]] = LoopLocal(dict)
+        self._inflight_runs: LoopLocal[Dict[str, asyncio.Future]] = LoopLocal(dict)
+        # run_id -> task executing that run's steps, used by cancel()
+        self._run_tasks: Dict[int, asyncio.Task] = {}
+        # runs currently being resumed; a second resume of the same run is rejected
+        self._resuming: Set[int] = set()
+        self.run_timeout: Optional[float] = settings.WORKFLOW_RUN_TIMEOUT_SECONDS or None
+        self.step_timeout: Optional[float] = settings.WORKFLOW_STEP_TIMEOUT_SECONDS or None
         # registry maps workflow name to a function returning plan
         self.registry: Dict[str, Any] = {
             "weekly_review": weekly_review_plan,
             "weekly_review_cross_tool": weekly_review_cross_tool_plan,
         }
 
+    def register_cacheable(self, tool: str, action: str) -> None:
+        """Declare a read-only tool action whose results can be cached and shared."""
+        self.cacheable_actions.add((tool, action))
+
     def list_workflows(self) -> List[str]:
         return list(self.registry.keys())
 
@@ -34,7 +95,7 @@ class WorkflowPlanner:
         if workflow_name not in self.registry:
             raise KeyError(f"workflow not found: {workflow_name}")
         plan_def = self.registry[workflow_name]()
-        logger.info("Loaded plan for %s", workflow_name)
+        logger.debug("Loaded plan for %s", workflow_name)
         return plan_def
 
     @staticmethod
@@ -53,30 +114,8 @@ class WorkflowPlanner:
         else:
             return obj
 
-    async def run(self, workflow_name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Run the named workflow and return a summary of actions taken (stubbed).
-
-        params: optional runtime parameters used to fill placeholders in step payloads.
-        """
-        params = params or {}
-        plan_def = self.load_plan(workflow_name)
-
-        # Apply params to plan-level fields (deep replace)
-        plan_def = WorkflowPlanner._replace_placeholders(plan_def, params)
-
-        plan_record = self.router.plan(plan_def)
-
-        # Persist run start
-        started_at = datetime.utcnow().isoformat()
-        run_id = None
-        try:
-            if hasattr(self.store, "create_run"):
-                run_id = await self.store.create_run(workflow_name, started_at, status="pending")
-        except Exception as e:
-            logger.exception("Failed to persist run: %s", e)
-
-
-        # Create a sequence of executions from the plan steps (mapping)
+    def _build_executions(self, plan_def: Dict[str, Any], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Create a sequence of executions from the plan steps (mapping)."""
         executions: List[Dict[str, Any]] = []
         for step in plan_def.get("steps", []):
             step_name = step.get("step")
@@ -85,64 +124,458 @@ class WorkflowPlanner:
 
             # Map to simple tool actions for demo. Add cross-tool mapping.
             if step_name == "fetch_tasks":
-                executions.append({"tool": "notion", "action": "fetch_tasks", "payload": payload})
+                ex = {"tool": "notion", "action": "fetch_tasks", "payload": payload}
             elif step_name == "summarize":
-                executions.append({"tool": "openai", "action": "summarize", "payload": payload})
+                ex = {"tool": "openai", "action": "summarize", "payload": payload}
             elif step_name == "notify":
-                executions.append({"tool": "slack", "action": "post_message", "payload": payload})
+                ex = {"tool": "slack", "action": "post_message", "payload": payload}
             elif step_name == "fetch_emails":
-                executions.append({"tool": "gmail", "action": "fetch_messages", "payload": payload})
+                ex = {"tool": "gmail", "action": "fetch_messages", "payload": payload}
             elif step_name == "persist_summary":
-                executions.append({"tool": "notion", "action": "create_summary_page", "payload": payload})
+                ex = {"tool": "notion", "action": "create_summary_page", "payload": payload}
             else:
-                executions.append({"tool": "generic", "action": step_name, "payload": payload})
+                ex = {"tool": "generic", "action": step_name, "payload": payload}
+            # templates can also mark individual steps as cacheable
+            if step.get("cacheable"):
+                ex["cacheable"] = True
+            executions.append(ex)
+        return executions
 
-        # Execute with basic retry/backoff
+    def _is_cacheable(self, ex: Dict[str, Any]) -> bool:
+        return bool(ex.get("cacheable")) or (ex.get("tool"), ex.get("action")) in self.cacheable_actions
+
+    async def _execute_step(self, ex: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Execute one step, sharing results of identical read-only steps."""
+        if not self._is_cacheable(ex):
+            return await self._execute_with_retry(ex)
+        key = StepCache.make_key(ex.get("tool"), ex.get("action"), ex.get("payload"))
+        return await self.step_cache.get_or_execute(
+            key,
+            lambda: self._execute_with_retry(ex),
+            should_cache=lambda res: all(r.get("status") == "ok" for r in res),
+        )
+
+    async def _execute_with_retry(self, ex: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Execute with basic retry/backoff; failures become an error result."""
         results: List[Dict[str, Any]] = []
-        for idx, ex in enumerate(executions):
-            attempt = 0
-            max_attempts = 3
-            backoff = 0.5
-            while attempt < max_attempts:
-                try:
-                    # router.multi_execute may be async or sync and may return a coroutine or value
-                    execute_result = self.router.multi_execute([ex])
-                    if asyncio.iscoroutine(execute_result):
-                        res = await execute_result
-                    else:
-                        res = execute_result
-                    # router.multi_execute returns list; extend results
-                    if isinstance(res, list):
-                        results.extend(res)
-                    else:
-                        results.append(res)
-                    break
-                except Exception as e:
-                    attempt += 1
+        attempt = 0
+        max_attempts = self.max_attempts
+        backoff = self.retry_backoff
+        while attempt < max_attempts:
+            try:
+                # each attempt gets the step timeout, capped by the run deadline;
+                # the budget is passed along so routers can bound upstream calls
+                timeout = effective_timeout(self.step_timeout)
+                if timeout is not None:
+                    ex["timeout"] = round(timeout, 3)
+                with span("multi_execute", tool=ex.get("tool"), action=ex.get("action"), attempt=attempt + 1):
+                    res = await bounded(self._invoke(ex), timeout)
+                # router.multi_execute returns list; extend results
+                if isinstance(res, list):
+                    results.extend(res)
+                else:
+                    results.append(res)
+                for r in results:
+                    self.search_index.index_result(r)
+                break
+            except Exception as e:
+                attempt += 1
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                if timed_out:
+                    logger.warning("Execution timed out for %s.%s, attempt %s", ex.get("tool"), ex.get("action"), attempt)
+                else:
                     logger.exception("Execution failed for %s, attempt %s: %s", ex, attempt, e)
-                    if attempt >= max_attempts:
-                        results.append({"tool": ex.get("tool"), "action": ex.get("action"), "status": "error", "error": str(e)})
-                    else:
-                        # sleep synchronously since this run() is sync
-                        import time
+                if attempt >= max_attempts:
+                    results.append({"tool": ex.get("tool"), "action": ex.get("action"), "status": "timeout" if timed_out else "error", "error": str(e) or "step timed out"})
+                else:
+                    # yield the loop while backing off so other runs keep their slots
+                    await asyncio.sleep(backoff * attempt)
+        return results
+
+    async def _invoke(self, ex: Dict[str, Any]) -> Any:
+        if self.summarizer is not None and (ex.get("tool"), ex.get("action")) == ("openai", "summarize"):
+            # rate limited per model call inside the summarizer, so cache hits cost nothing
+            return [await self._summarize(ex)]
+        key = limit_key(ex.get("tool"), ex.get("action"), ex.get("payload"))
+        async with self.limiter.limit(ex.get("tool"), key=key):
+            return await self.arouter.multi_execute([ex])
+
+    async def _summarize(self, ex: Dict[str, Any]) -> Dict[str, Any]:
+        payload = ex.get("payload") or {}
+        content = payload["input"] if "input" in payload else await self._summary_input()
+        return await self.summarizer.summarize(payload.get("model"), payload.get("prompt") or DEFAULT_SUMMARY_PROMPT, content)
+
+    async def _summary_input(self) -> List[Dict[str, Any]]:
+        """The tasks a summary covers: every active or overdue task, in a stable order."""
+        if not hasattr(self.store, "list_tasks_async"):
+            return []
+        tasks = await self.store.list_tasks_async()
+        return [
+            {"id": t.id, "source": t.source, "title": t.title, "owner": t.owner, "status": t.status, "due_at": t.due_at}
+            for t in sorted(tasks, key=lambda t: t.id)
+            if t.status in ACTIVE_STATUSES or t.status == "overdue"
+        ]
+
+    @staticmethod
+    def idempotency_key(run_id: int, step_index: int) -> str:
+        return f"run-{run_id}-step-{step_index}"
+
+    async def _checkpoint(self, run_id: Optional[int], idx: int, ex: Dict[str, Any], status: str, results: Optional[List[Dict[str, Any]]] = None) -> None:
+        if not run_id or not hasattr(self.store, "save_step"):
+            return
+        try:
+            with span("store.save_step", step=idx, status=status):
+                # shielded so cancelling a run never interrupts a DB transaction
+                await asyncio.shield(
+                    self.store.save_step(
+                        run_id,
+                        idx,
+                        ex.get("tool"),
+                        ex.get("action"),
+                        self.idempotency_key(run_id, idx),
+                        status,
+                        results or [],
+                        datetime.utcnow().isoformat(),
+                    )
+                )
+        except Exception:
+            logger.exception("Failed to checkpoint step %s of run %s", idx, run_id)
 
-                        time.sleep(backoff * attempt)
+    async def _execute_run(
+        self,
+        run_id: Optional[int],
+        executions: List[Dict[str, Any]],
+        completed: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+        results: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Execute steps in order, checkpointing each one.
+
+        `completed` maps step index to results from an earlier attempt; those
+        steps are not executed again. Results are appended to `results` as
+        steps finish so partial progress survives a timeout or cancellation.
+        """
+        completed = completed or {}
+        results = [] if results is None else results
+        for idx, ex in enumerate(executions):
+            if idx in completed:
+                results.extend(completed[idx])
+                continue
+            if run_id:
+                # lets a real router drop duplicates of side-effecting calls
+                ex["idempotency_key"] = self.idempotency_key(run_id, idx)
+            with span("step", index=idx, tool=ex.get("tool"), action=ex.get("action")) as sp:
+                await self._checkpoint(run_id, idx, ex, "running")
+                step_results = await self._execute_step(ex)
+                status = "ok" if all(r.get("status") == "ok" for r in step_results) else "error"
+                sp.attributes["status"] = status
+                await self._checkpoint(run_id, idx, ex, status, step_results)
+            results.extend(step_results)
+        return results
+
+    @staticmethod
+    def _run_status(results: List[Dict[str, Any]]) -> str:
+        return "success" if all(r.get("status") == "ok" for r in results) else "error"
 
+    async def _execute_tracked(
+        self,
+        run_id: Optional[int],
+        executions: List[Dict[str, Any]],
+        completed: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Execute a run's steps under its deadline as a cancellable task.
 
+        Returns the (possibly partial) results and the run status: success,
+        error, timeout or cancelled.
+        """
+        results: List[Dict[str, Any]] = []
+        timeout = self.run_timeout if timeout is None else timeout
+        with deadline_scope(timeout):
+            task = asyncio.create_task(self._execute_run(run_id, executions, completed, results))
+        if run_id:
+            self._run_tasks[run_id] = task
+        try:
+            await bounded(asyncio.shield(task), timeout)
+            return results, self._run_status(results)
+        except asyncio.TimeoutError:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            logger.warning("Run %s exceeded its %ss deadline", run_id, timeout)
+            return results, "timeout"
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                # the caller itself was cancelled; stop the run and propagate
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise
+            logger.info("Run %s cancelled", run_id)
+            return results, "cancelled"
+        finally:
+            if run_id and self._run_tasks.get(run_id) is task:
+                del self._run_tasks[run_id]
+
+    async def cancel(self, run_id: int) -> bool:
+        """Cancel an in-flight run. Returns False if the run is not executing."""
+        task = self._run_tasks.get(run_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        # let the run unwind (releasing limiter slots) before returning
+        await asyncio.gather(task, return_exceptions=True)
+        return True
+
+    async def _finish_run(
+        self,
+        run_id: Optional[int],
+        results: List[Dict[str, Any]],
+        params: Dict[str, Any],
+        status: Optional[str] = None,
+        trace: Optional[RunTrace] = None,
+    ) -> None:
+        try:
+            if run_id and hasattr(self.store, "update_run"):
+                finished_at = datetime.utcnow().isoformat()
+                status = status or self._run_status(results)
+                log: Dict[str, Any] = {"executions": results, "params": params}
+                if trace is not None:
+                    # spans still open (this final write) are recorded up to now
+                    log["timeline"] = trace.to_dict()
+                await self.store.update_run(run_id, finished_at, status, log)
+        except Exception:
+            logger.exception("Failed to update run record")
+
+    @staticmethod
+    def concurrency_key(workflow_name: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Default concurrency key: a hash of the workflow name and its params."""
+        raw = json.dumps([workflow_name, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _slot(self, workflow_name: str) -> Optional[asyncio.Semaphore]:
+        limit = self.max_concurrency.get(workflow_name)
+        if not limit:
+            return None
+        slots = self._workflow_slots.get()
+        sem = slots.get(workflow_name)
+        if sem is None:
+            sem = asyncio.Semaphore(limit)
+            slots[workflow_name] = sem
+        return sem
+
+    async def run(
+        self,
+        workflow_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        concurrency_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Run the named workflow and return a summary of actions taken (stubbed).
+
+        params: optional runtime parameters used to fill placeholders in step payloads.
+        concurrency_key: identifies identical requests (defaults to a hash of the
+        workflow name and params). A request whose key matches a run that is
+        still in flight attaches to that run instead of starting a new one.
+        timeout: run deadline in seconds (defaults to WORKFLOW_RUN_TIMEOUT_SECONDS).
+        """
+        params = params or {}
+        self.load_plan(workflow_name)  # fail fast (KeyError) before any queueing
+        key = concurrency_key or self.concurrency_key(workflow_name, params)
+
+        inflight = self._inflight_runs.get()
+        pending = inflight.get(key)
+        if pending is not None:
+            logger.info("Attaching duplicate %s request to in-flight run (key %s)", workflow_name, key)
+            summary = copy.deepcopy(await asyncio.shield(pending))
+            summary["deduplicated"] = True
+            return summary
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        inflight[key] = fut
+        try:
+            slot = self._slot(workflow_name)
+            if slot is not None:
+                async with slot:
+                    summary = await self._run(workflow_name, params, timeout)
+            else:
+                summary = await self._run(workflow_name, params, timeout)
+            summary["concurrency_key"] = key
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                fut.cancel()
+            else:
+                fut.set_exception(e)
+                fut.exception()  # attached callers re-raise it; don't log as unretrieved
+            raise
+        finally:
+            if inflight.get(key) is fut:
+                del inflight[key]
+        fut.set_result(summary)
+        return copy.deepcopy(summary)
+
+    async def _run(self, workflow_name: str, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        trace = RunTrace(workflow_name)
+        with trace.activate():
+            with span("load_plan"):
+                plan_def = self.load_plan(workflow_name)
+
+            # Apply params to plan-level fields (deep replace)
+            with span("resolve_placeholders"):
+                plan_def = WorkflowPlanner._replace_placeholders(plan_def, params)
+
+            with span("router.plan"):
+                plan_record = await self.arouter.plan(plan_def)
+
+            # Persist run start; params are stored so the run can be resumed
+            started_at = datetime.utcnow().isoformat()
+            run_id = None
+            try:
+                if hasattr(self.store, "create_run"):
+                    with span("store.create_run"):
+                        run_id = await self.store.create_run(workflow_name, started_at, status="pending", log={"params": params})
+            except Exception as e:
+                logger.exception("Failed to persist run: %s", e)
+
+            with span("build_executions"):
+                executions = self._build_executions(plan_def, params)
+            results, status = await self._execute_tracked(run_id, executions, timeout=timeout)
+
+            with span("store.update_run"):
+                await self._finish_run(run_id, results, params, status, trace)
         summary = {
             "plan_id": plan_record.get("plan_id"),
             "executions": results,
             "params": params,
             "run_id": run_id,
+            "status": status,
+            "timeline": trace.to_dict(),
         }
-        # Persist run finish
+        export_otel(trace)
+        logger.info("Workflow %s executed: run_id=%s status=%s", workflow_name, run_id, status)
+        # the full summary (executions + timeline) is large; only format it when debugging
+        logger.debug("Workflow %s summary: %s", workflow_name, summary)
+        return summary
+
+    async def run_many(
+        self,
+        workflow_name: str,
+        param_sets: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Run one workflow once per parameter set with bounded concurrency.
+
+        The template is loaded and planned once, cacheable fetch steps are
+        shared between the runs, and run records are created and finished in
+        batched transactions. Returns per-parameter-set outcomes.
+        """
+        template = self.load_plan(workflow_name)
+        plan_record = await self.arouter.plan(template)
+        param_sets = [p or {} for p in param_sets]
+
+        started_at = datetime.utcnow().isoformat()
+        run_ids: List[Optional[int]] = [None] * len(param_sets)
         try:
-            if run_id and hasattr(self.store, "update_run"):
-                finished_at = datetime.utcnow().isoformat()
-                status = "success" if all(r.get("status") == "ok" for r in results) else "error"
-                log = {"executions": results, "params": params}
-                await self.store.update_run(run_id, finished_at, status, log)
+            if param_sets and hasattr(self.store, "create_runs"):
+                rows = [{"workflow_name": workflow_name, "started_at": started_at, "status": "pending", "log": {"params": p}} for p in param_sets]
+                run_ids = list(await self.store.create_runs(rows))
+        except Exception as e:
+            logger.exception("Failed to persist batch runs: %s", e)
+
+        sem = asyncio.Semaphore(max(1, max_concurrency or settings.BATCH_MAX_CONCURRENCY))
+
+        async def run_one(idx: int, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str, RunTrace]:
+            async with sem:
+                trace = RunTrace(workflow_name)
+                with trace.activate():
+                    with span("resolve_placeholders"):
+                        plan_def = WorkflowPlanner._replace_placeholders(template, params)
+                        executions = self._build_executions(plan_def, params)
+                    results, status = await self._execute_tracked(run_ids[idx], executions)
+                export_otel(trace)
+                return results, status, trace
+
+        outcomes = await asyncio.gather(*[run_one(i, p) for i, p in enumerate(param_sets)], return_exceptions=True)
+
+        finished_at = datetime.utcnow().isoformat()
+        items: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        for idx, (params, outcome) in enumerate(zip(param_sets, outcomes)):
+            item: Dict[str, Any] = {"index": idx, "params": params, "run_id": run_ids[idx]}
+            log: Dict[str, Any] = {"params": params}
+            if isinstance(outcome, BaseException):
+                item.update(status="error", error=str(outcome), executions=[])
+            else:
+                results, status, trace = outcome
+                item.update(status=status, executions=results)
+                log["timeline"] = trace.to_dict()
+            log["executions"] = item["executions"]
+            items.append(item)
+            if run_ids[idx]:
+                updates.append({"id": run_ids[idx], "finished_at": finished_at, "status": item["status"], "log": log})
+        try:
+            if updates and hasattr(self.store, "update_runs"):
+                await self.store.update_runs(updates)
         except Exception:
-            logger.exception("Failed to update run record")
-        logger.info("Workflow %s executed: %s", workflow_name, summary)
+            logger.exception("Failed to update batch run records")
+
+        succeeded = sum(1 for i in items if i["status"] == "success")
+        summary = {
+            "plan_id": plan_record.get("plan_id"),
+            "workflow": workflow_name,
+            "total": len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "runs": items,
+        }
+        logger.info("Workflow %s batch executed: %s/%s succeeded", workflow_name, succeeded, len(items))
+        return summary
+
+    async def resume(self, run_id: int) -> Dict[str, Any]:
+        """Re-run only the failed and remaining steps of a previous run.
+
+        Steps checkpointed as `ok` are reused as-is, so side-effecting steps
+        that already succeeded (e.g. Slack posts) are never repeated. Only runs
+        that ended in error, timeout or cancellation can be resumed; anything
+        else (including a run still executing) raises RunStateError.
+        """
+        # claimed before the first await so two resumes of one run cannot both pass the checks
+        if run_id in self._resuming or run_id in self._run_tasks:
+            raise RunStateError(f"run {run_id} is still executing")
+        self._resuming.add(run_id)
+        try:
+            return await self._resume(run_id)
+        finally:
+            self._resuming.discard(run_id)
+
+    async def _resume(self, run_id: int) -> Dict[str, Any]:
+        run = await self.store.get_run(run_id)
+        if run is None:
+            raise KeyError(f"run not found: {run_id}")
+        if run.get("status") not in RESUMABLE_STATUSES:
+            raise RunStateError(f"run {run_id} has status {run.get('status')!r}; only {', '.join(RESUMABLE_STATUSES)} runs can be resumed")
+        workflow_name = run["workflow_name"]
+        log = run.get("log") if isinstance(run.get("log"), dict) else {}
+        params = log.get("params") or {}
+
+        plan_def = WorkflowPlanner._replace_placeholders(self.load_plan(workflow_name), params)
+        plan_record = await self.arouter.plan(plan_def)
+        executions = self._build_executions(plan_def, params)
+
+        completed = {s["step_index"]: s["result"] for s in await self.store.list_steps(run_id) if s.get("status") == "ok"}
+        await self.store.update_run(run_id, "", "pending", log)
+        trace = RunTrace(workflow_name)
+        with trace.activate():
+            results, status = await self._execute_tracked(run_id, executions, completed)
+            await self._finish_run(run_id, results, params, status, trace)
+        export_otel(trace)
+
+        summary = {
+            "plan_id": plan_record.get("plan_id"),
+            "executions": results,
+            "params": params,
+            "run_id": run_id,
+            "status": status,
+            "resumed": True,
+            "skipped_steps": sorted(completed),
+        }
+        logger.info("Workflow %s resumed: run_id=%s status=%s", workflow_name, run_id, status)
+        logger.debug("Workflow %s summary: %s", workflow_name, summary)
         return summary
@@ -1,12 +1,188 @@
+"""Application logging.
+
+`get_logger` returns a named logger wired to one shared output pipeline. By
+default records are handed to a `QueueHandler` and formatted/written by a
+`QueueListener` thread, so the event loop never blocks on formatting or I/O.
+Messages whose arguments are immutable primitives are interpolated only when
+the listener emits the record; other arguments (which the caller may mutate
+afterwards) and exception tracebacks are rendered before enqueueing.
+
+Settings (see `src.core.config`):
+- LOG_LEVEL: level for application loggers (default INFO)
+- LOG_FORMAT: "text" or "json" (one JSON object per line)
+- LOG_ASYNC: set false to write synchronously from the calling thread
+- LOG_SAMPLING: per-logger hot-path limits, e.g.
+  {"ToolRouterStub": {"sample_rate": 0.1}, "WorkflowPlanner": {"max_per_second": 20}}
+"""
+
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+_STD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+# message arguments safe to format later on the listener thread
+_IMMUTABLE_ARGS = (str, bytes, int, float, complex, type(None))
+
+_lock = threading.Lock()
+_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON; `extra=` fields become top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: Dict[str, Any] = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STD_ATTRS and not key.startswith("_"):
+                out[key] = value
+        if record.exc_info:
+            out["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            out["exc_info"] = record.exc_text
+        return json.dumps(out, default=str)
+
+
+def _immutable(value: Any) -> bool:
+    if isinstance(value, tuple):
+        return all(_immutable(v) for v in value)
+    return isinstance(value, _IMMUTABLE_ARGS)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread where it is safe.
+
+    The stock `prepare()` formats the message eagerly on the caller's thread.
+    Here `getMessage()` runs on the listener when every argument is an
+    immutable primitive; any other argument could change (or be unsafe to
+    read) by then, so the message is interpolated now. Exceptions are always
+    rendered to `exc_text` here and `exc_info` is dropped, so queued records
+    do not keep traceback frames and their locals alive.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        args = record.args
+        # a lone mapping argument (`%(name)s` style) is itself mutable
+        if args and (isinstance(args, Mapping) or not _immutable(args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class HotPathFilter(logging.Filter):
+    """Sample and/or rate-limit records at or below `level` (INFO by default).
+
+    Warnings and errors always pass. Dropped records are counted and the
+    count is attached to the next record that passes as `suppressed`.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, max_per_second: Optional[float] = None, level: int = logging.INFO):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self.level = level
+        self.suppressed = 0
+        self._tokens = float(max_per_second or 0)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        with self._lock:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                self.suppressed += 1
+                return False
+            if self.max_per_second:
+                now = time.monotonic()
+                self._tokens = min(self.max_per_second, self._tokens + (now - self._last) * self.max_per_second)
+                self._last = now
+                if self._tokens < 1:
+                    self.suppressed += 1
+                    return False
+                self._tokens -= 1
+            if self.suppressed:
+                record.suppressed = self.suppressed
+                self.suppressed = 0
+        return True
+
+
+def _settings() -> Any:
+    # imported lazily: config must stay importable without logging set up
+    from src.core.config import settings
+
+    return settings
+
+
+def _build_formatter(fmt: str) -> logging.Formatter:
+    if fmt == "json":
+        return JsonFormatter()
+    return logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+
+def _shared_handler() -> logging.Handler:
+    global _handler, _listener
+    with _lock:
+        if _handler is not None:
+            return _handler
+        cfg = _settings()
+        stream = logging.StreamHandler()
+        stream.setFormatter(_build_formatter(str(getattr(cfg, "LOG_FORMAT", "text")).lower()))
+        if getattr(cfg, "LOG_ASYNC", True):
+            q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            _listener = logging.handlers.QueueListener(q, stream, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+            _handler = _DeferredQueueHandler(q)
+        else:
+            _handler = stream
+        return _handler
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def configure_sampling(name: str, sample_rate: float = 1.0, max_per_second: Optional[float] = None) -> HotPathFilter:
+    """Attach (or replace) the hot-path filter on a named logger."""
+    logger = logging.getLogger(name)
+    for f in list(logger.filters):
+        if isinstance(f, HotPathFilter):
+            logger.removeFilter(f)
+    flt = HotPathFilter(sample_rate=sample_rate, max_per_second=max_per_second)
+    logger.addFilter(flt)
+    return flt
 
 
 def get_logger(name: str = "aiocc") -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        fmt = "%(asctime)s %(levelname)s %(name)s: %(message)s"
-        handler.setFormatter(logging.Formatter(fmt))
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
+        cfg = _settings()
+        logger.addHandler(_shared_handler())
+        logger.setLevel(str(getattr(cfg, "LOG_LEVEL", "INFO")).upper())
+        sampling = (getattr(cfg, "LOG_SAMPLING", None) or {}).get(name)
+        if sampling:
+            configure_sampling(name, **sampling)
     return logger
@@ -1,12 +1,215 @@
-from typing import Dict, Any
+"""Incremental escalation: compiled rules re-evaluated only for tasks that change.
+
+On start the agent mirrors the tasks table in memory (one query), then
+follows TaskStore change notifications. A change is checked only against the
+candidate rules from the RuleSet index. When a rule starts matching, it is
+armed. Rules without a delay fire at once; `status_for`/`age` rules sit in a
+timer heap until the delay has passed. A task that stops matching disarms the
+rule, so each (rule, task) pair fires at most once per match. Fired pairs are
+recorded in the store with the rule's anchor value, so a restart does not post
+them again while they still match.
+"""
+
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from collections import deque
+from datetime import datetime, timezone
+import asyncio
+import heapq
+import itertools
+import time
+
 from src.agents.base_agent import BaseAgent
+from src.core.config import settings
+from src.core.rate_limiter import rate_limiter
+from src.utils.logger import get_logger
+from .escalation_rules import Rule, RuleSet
+
+logger = get_logger("EscalationAgent")
+
+
+def _epoch(iso: Optional[str], default: float) -> float:
+    if not iso:
+        return default
+    dt = datetime.fromisoformat(iso)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _anchor_value(rule: Rule, task: Dict[str, Any]) -> str:
+    """The value the rule's delay starts from, as recorded with a fired escalation."""
+    return str(task.get(rule.anchor) or "") if rule.anchor else ""
 
 
 class EscalationAgent(BaseAgent):
-    async def poll(self) -> None:
-        # Detect unresolved issues and initiate escalation flows
-        return
+    name = "escalation"
+    # polling fires escalations; there is nothing to ingest
+    ingests_items = False
+
+    def __init__(self, router=None, store=None, rules: Optional[List[Dict[str, Any]]] = None, channel: Optional[str] = None, slack_agent: Any = None):
+        super().__init__(router, store)
+        self.rules = RuleSet(settings.ESCALATION_RULES if rules is None else rules)
+        self.channel = channel or settings.ESCALATION_CHANNEL
+        # a burst of matching tasks is paced and coalesced by the Slack agent's outbox
+        self.slack_agent = slack_agent
+        # task_id -> task fields, kept current from change notifications
+        self._tasks: Dict[int, Dict[str, Any]] = {}
+        # (rule, task_id) -> arm token; a heap entry is live while its token matches
+        self._armed: Dict[Tuple[str, int], int] = {}
+        self._fired: Set[Tuple[str, int]] = set()
+        # (rule, task_id, anchor) fired before the last restart; only read while start() mirrors tasks
+        self._restored: Set[Tuple[str, int, str]] = set()
+        # fired pairs that stopped matching, still to be removed from the store
+        self._cleared: Set[Tuple[str, int]] = set()
+        self._by_task: Dict[int, Set[str]] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._subscribed = False
+        self._started_at = time.time()
+        self.evaluations = 0
+        self.fired = 0
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=50)
+
+    async def start(self) -> None:
+        """Mirror current tasks, arm matching rules and start the timer task."""
+        if self.store is None or not len(self.rules):
+            return
+        if not self._subscribed:
+            self.store.subscribe(self.on_task_change)
+            self._subscribed = True
+        self._started_at = time.time()
+        self._wakeup = asyncio.Event()
+        self._restored = {(r["rule"], r["task_id"], r["anchor"]) for r in await self.store.list_fired_escalations()}
+        for task in await self.store.list_tasks_async():
+            self.on_task_change(task.id, dict(task.__dict__))
+        # records of tasks that no longer match, or whose anchor moved, are stale
+        self._cleared.update((name, task_id) for name, task_id, _ in self._restored if (name, task_id) not in self._fired)
+        self._restored = set()
+        await self._forget_cleared()
+        self._runner = asyncio.create_task(self._run(), name="escalation-timers")
+        logger.info("Escalation rules armed: %s rule(s), %s task(s) mirrored", len(self.rules), len(self._tasks))
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+
+    def on_task_change(self, task_id: int, changes: Dict[str, Any]) -> None:
+        """TaskStore listener: re-check only the rules this change can affect."""
+        known = self._tasks.get(task_id)
+        task = {**(known or {}), **changes, "id": task_id}
+        self._tasks[task_id] = task
+        changed = None if known is None else set(changes)
+        rules = {r.name: r for r in self.rules.candidates(task, changed)}
+        # rules armed or fired for this task may stop matching (e.g. its owner changed)
+        for name in self._by_task.get(task_id, set()) - set(rules):
+            rule = self.rules.rules[name]
+            if changed is None or rule.fields & changed:
+                rules[name] = rule
+        head = self._heap[0][0] if self._heap else None
+        for rule in rules.values():
+            self._evaluate(rule, task, changed)
+        if self._wakeup is not None and (self._cleared or self._heap and (head is None or self._heap[0][0] < head)):
+            self._wakeup.set()
+
+    def _evaluate(self, rule: Rule, task: Dict[str, Any], changed: Optional[Set[str]]) -> None:
+        self.evaluations += 1
+        key = (rule.name, task["id"])
+        if not rule.predicate(task):
+            self._armed.pop(key, None)
+            if key in self._fired:
+                self._fired.discard(key)
+                self._cleared.add(key)
+            self._by_task.get(task["id"], set()).discard(rule.name)
+            return
+        if key in self._fired:
+            return
+        if (rule.name, task["id"], _anchor_value(rule, task)) in self._restored:
+            self._fired.add(key)
+            self._by_task.setdefault(task["id"], set()).add(rule.name)
+            return
+        if key in self._armed and (changed is not None and (rule.anchor is None or rule.anchor not in changed)):
+            return  # still matching and the delay's start did not move
+        anchor = _epoch(task.get(rule.anchor), self._started_at) if rule.anchor else time.time()
+        token = next(self._seq)
+        self._armed[key] = token
+        self._by_task.setdefault(task["id"], set()).add(rule.name)
+        heapq.heappush(self._heap, (anchor + rule.delay, token, rule.name, task["id"]))
+
+    async def _forget_cleared(self) -> None:
+        while self._cleared:
+            name, task_id = self._cleared.pop()
+            if self.store is None:
+                continue
+            try:
+                await self.store.clear_fired_escalation(name, task_id)
+            except Exception as e:
+                logger.exception("Clearing escalation %s for task %s failed: %s", name, task_id, e)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            await self._forget_cleared()
+            delay = self._heap[0][0] - time.time() if self._heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.fire_due()
+
+    async def fire_due(self, now: Optional[float] = None) -> int:
+        """Fire armed rules whose delay has passed; returns how many fired."""
+        fired = 0
+        # a pair that stopped matching and fires again must not lose its new record to a late clear
+        await self._forget_cleared()
+        while self._heap and self._heap[0][0] <= (now if now is not None else time.time()):
+            _, token, name, task_id = heapq.heappop(self._heap)
+            key = (name, task_id)
+            if self._armed.get(key) != token:
+                continue  # disarmed or re-armed since
+            del self._armed[key]
+            self._fired.add(key)
+            rule, task = self.rules.rules[name], self._tasks.get(task_id, {})
+            try:
+                await self.act({"rule": name, "task": task, "channel": rule.channel or self.channel, "text": rule.render(task)})
+                if self.store is not None:
+                    await self.store.mark_escalation_fired(name, task_id, _anchor_value(rule, task))
+                fired += 1
+            except Exception as e:
+                logger.exception("Escalation %s for task %s failed: %s", name, task_id, e)
+        return fired
+
+    async def poll(self) -> int:
+        # rules fire from change notifications and timers; polling only catches up without a running loop
+        return await self.fire_due()
 
     async def act(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        # Perform escalation actions
-        return {"status": "ok"}
+        """Post the escalation `text` to `channel` via `slack_agent`, or ToolRouter if there is none."""
+        self.fired += 1
+        task = payload.get("task") or {}
+        self.recent.append({"rule": payload.get("rule"), "task_id": task.get("id"), "at": datetime.utcnow().isoformat()})
+        logger.info("Escalating task %s (rule %s)", task.get("id"), payload.get("rule"))
+        channel = payload.get("channel") or self.channel
+        if self.slack_agent is not None:
+            return {"status": "ok", "results": [await self.slack_agent.act(channel, payload.get("text"))]}
+        if self.arouter is None:
+            return {"status": "ok"}
+        async with rate_limiter.limit("slack", key=channel):
+            results = await self.arouter.multi_execute([{"tool": "slack", "action": "send_message", "payload": {"channel": channel, "text": payload.get("text")}}])
+        return {"status": "ok", "results": results}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rules": len(self.rules),
+            "tasks_mirrored": len(self._tasks),
+            "armed": len(self._armed),
+            "evaluations": self.evaluations,
+            "fired": self.fired,
+            "recent": list(self.recent),
+            "running": self._runner is not None and not self._runner.done(),
+        }
@@ -0,0 +1,191 @@
+"""Declarative escalation rules, compiled once and indexed by the fields they test.
+
+A rule looks like:
+
+    {
+        "name": "stale-gmail",
+        "when": {"owner": "alice@example.com", "status": "open", "source": "gmail",
+                 "title": {"contains": "invoice"}},
+        "status_for": "48h",          # or "age": "3d" (since the task was created)
+        "channel": "#escalations",
+        "message": "{title} has been {status} for 48h ({owner})",
+    }
+
+`when` maps a task field (or `metadata.<key>`) to a scalar (equality), a list
+(membership) or a dict of operators: eq, ne, in, not_in, contains, regex,
+exists. Each rule compiles into a single predicate. Rules are indexed by one
+equality field (owner, source or status) so a task change is only checked
+against rules that can match it, and only when the change touches a field
+the rule references.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+import re
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+# fields a rule can be indexed by, most selective first
+INDEX_FIELDS = ("owner", "source", "status")
+OPERATORS = ("eq", "ne", "in", "not_in", "contains", "regex", "exists")
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_duration(value: Any) -> float:
+    """Seconds in `value`: a number or a string like "90s", "30m", "48h", "2d"."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", str(value))
+    if not m:
+        raise ValueError(f"invalid duration {value!r}")
+    return float(m.group(1)) * _DURATION_UNITS[m.group(2) or "s"]
+
+
+def _getter(name: str) -> Callable[[Dict[str, Any]], Any]:
+    if name.startswith("metadata."):
+        key = name.split(".", 1)[1]
+        return lambda t: (t.get("metadata") or {}).get(key)
+    return lambda t: t.get(name)
+
+
+def _compile_condition(name: str, spec: Any) -> Predicate:
+    get = _getter(name)
+    if isinstance(spec, list):
+        spec = {"in": spec}
+    elif not isinstance(spec, dict):
+        spec = {"eq": spec}
+    unknown = set(spec) - set(OPERATORS)
+    if unknown:
+        raise ValueError(f"unknown operator(s) {sorted(unknown)} for field {name!r}")
+    checks: List[Predicate] = []
+    if "eq" in spec:
+        checks.append(lambda t, v=spec["eq"]: get(t) == v)
+    if "ne" in spec:
+        checks.append(lambda t, v=spec["ne"]: get(t) != v)
+    if "in" in spec:
+        checks.append(lambda t, v=frozenset(spec["in"]): get(t) in v)
+    if "not_in" in spec:
+        checks.append(lambda t, v=frozenset(spec["not_in"]): get(t) not in v)
+    if "contains" in spec:
+        needle = str(spec["contains"]).lower()
+        checks.append(lambda t: needle in str(get(t) or "").lower())
+    if "regex" in spec:
+        pattern = re.compile(spec["regex"])
+        checks.append(lambda t: pattern.search(str(get(t) or "")) is not None)
+    if "exists" in spec:
+        checks.append(lambda t, v=bool(spec["exists"]): (get(t) is not None) == v)
+    if len(checks) == 1:
+        return checks[0]
+    return lambda t: all(c(t) for c in checks)
+
+
+def _equality_values(spec: Any) -> Optional[List[Any]]:
+    """Values a field must equal for the condition to hold, if it pins them down."""
+    if isinstance(spec, list):
+        return list(spec)
+    if not isinstance(spec, dict):
+        return [spec]
+    if "eq" in spec:
+        return [spec["eq"]]
+    if "in" in spec:
+        return list(spec["in"])
+    return None
+
+
+@dataclass
+class Rule:
+    name: str
+    predicate: Predicate
+    fields: Set[str]
+    status_for: float = 0.0
+    age: float = 0.0
+    channel: Optional[str] = None
+    message: Optional[str] = None
+    index_field: Optional[str] = None
+    index_values: List[Any] = field(default_factory=list)
+    spec: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def anchor(self) -> Optional[str]:
+        """Task timestamp field the rule's delay counts from, if any."""
+        if self.status_for:
+            return "status_changed_at"
+        if self.age:
+            return "created_at"
+        return None
+
+    @property
+    def delay(self) -> float:
+        return self.status_for or self.age
+
+    def render(self, task: Dict[str, Any]) -> str:
+        template = self.message or "Escalation '{rule}': task {id} '{title}' ({owner}, {status})"
+        try:
+            return template.format_map({**task, "rule": self.name})
+        except (KeyError, IndexError, ValueError):
+            return template
+
+
+def compile_rule(spec: Dict[str, Any]) -> Rule:
+    name = spec.get("name")
+    if not name:
+        raise ValueError("escalation rule needs a name")
+    when = spec.get("when") or {}
+    if not isinstance(when, dict):
+        raise ValueError(f"rule {name!r}: 'when' must be an object")
+    if "status_for" in spec and "age" in spec:
+        raise ValueError(f"rule {name!r}: use either 'status_for' or 'age'")
+    checks = [_compile_condition(f, s) for f, s in when.items()]
+    predicate: Predicate = (lambda t: all(c(t) for c in checks)) if checks else (lambda t: True)
+    rule = Rule(
+        name=name,
+        predicate=predicate,
+        fields={f.split(".", 1)[0] for f in when},
+        status_for=parse_duration(spec.get("status_for", 0)),
+        age=parse_duration(spec.get("age", 0)),
+        channel=spec.get("channel"),
+        message=spec.get("message"),
+        spec=dict(spec),
+    )
+    if rule.status_for:
+        rule.fields.add("status")
+    for f in INDEX_FIELDS:
+        values = _equality_values(when[f]) if f in when else None
+        if values:
+            rule.index_field, rule.index_values = f, values
+            break
+    return rule
+
+
+class RuleSet:
+    """Compiled rules plus the index used to pick candidates for a task."""
+
+    def __init__(self, specs: Iterable[Dict[str, Any]] = ()):
+        self.rules: Dict[str, Rule] = {}
+        self._index: Dict[Tuple[str, Any], List[Rule]] = {}
+        self._unindexed: List[Rule] = []
+        for spec in specs:
+            self.add(compile_rule(spec))
+
+    def add(self, rule: Rule) -> None:
+        if rule.name in self.rules:
+            raise ValueError(f"duplicate escalation rule {rule.name!r}")
+        self.rules[rule.name] = rule
+        if rule.index_field is None:
+            self._unindexed.append(rule)
+            return
+        for value in rule.index_values:
+            self._index.setdefault((rule.index_field, value), []).append(rule)
+
+    def candidates(self, task: Dict[str, Any], changed: Optional[Set[str]] = None) -> List[Rule]:
+        """Rules that could match `task`; with `changed`, only those referencing a changed field."""
+        found: List[Rule] = []
+        for f in INDEX_FIELDS:
+            found.extend(self._index.get((f, task.get(f)), ()))
+        found.extend(self._unindexed)
+        if changed is not None:
+            found = [r for r in found if r.fields & changed]
+        return found
+
+    def __len__(self) -> int:
+        return len(self.rules)
@@ -1,12 +1,216 @@
-from typing import Dict, Any
+"""Deadline reminders and overdue transitions driven by an in-memory timer heap.
+
+On start the agent loads every active task with a due time (one indexed
+query) into a min-heap of (fire_at, kind, task) timers: a reminder
+`lead_seconds` before the deadline and the overdue transition at the
+deadline. A single background task sleeps until the earliest timer, so
+nothing scans the tasks table periodically. The TaskStore notifies the agent
+of inserts, due-date changes and status changes; stale heap entries are
+skipped lazily when they come up.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+import asyncio
+import heapq
+import itertools
+import time
+
 from src.agents.base_agent import BaseAgent
+from src.core.config import settings
+from src.core.rate_limiter import rate_limiter
+from src.core.task_store import ACTIVE_STATUSES
+from src.utils.logger import get_logger
+
+logger = get_logger("ReminderAgent")
+
+REMIND = "remind"
+OVERDUE = "overdue"
+# send results that count as delivered ("mock" when Slack runs without a token)
+DELIVERED = ("ok", "mock")
+
+
+def _epoch(iso: str) -> float:
+    dt = datetime.fromisoformat(iso)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
 
 
 class ReminderAgent(BaseAgent):
-    async def poll(self) -> None:
-        # Periodically check TaskStore (via core) for overdue tasks and schedule reminders
-        return
+    name = "reminder"
+    # polling fires reminders; there is nothing to ingest
+    ingests_items = False
+
+    def __init__(self, router=None, store=None, lead_seconds: Optional[float] = None, channel: Optional[str] = None, slack_agent: Any = None):
+        super().__init__(router, store)
+        self.lead_seconds = settings.REMINDER_LEAD_SECONDS if lead_seconds is None else lead_seconds
+        self.channel = channel or settings.REMINDER_CHANNEL
+        # reminders go through the shared SlackAgent's outbox when given
+        self.slack_agent = slack_agent
+        # heap of (fire_at, seq, kind, task_id, due_at); seq keeps pops stable
+        self._heap: List[Tuple[float, int, str, int, str]] = []
+        self._seq = itertools.count()
+        # task_id -> (due_at, title, owner) for tasks still awaiting a timer
+        self._tasks: Dict[int, Tuple[str, Optional[str], Optional[str]]] = {}
+        self._reminded: Dict[int, bool] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self.reminders_sent = 0
+        self.marked_overdue = 0
+        self.max_lateness_ms = 0.0
+        self._subscribed = False
+
+    async def start(self) -> None:
+        """Load upcoming deadlines and start the timer task."""
+        if self.store is None:
+            return
+        if not self._subscribed:
+            self.store.subscribe(self.on_task_change)
+            self._subscribed = True
+        self._heap, self._tasks, self._reminded = [], {}, {}
+        for task in await self.store.list_due_tasks_async():
+            self._heap.extend(self._track(task.id, task.due_at, task.title, task.owner, reminded=bool(task.reminded_at)))
+        heapq.heapify(self._heap)
+        self._wakeup = asyncio.Event()
+        self._runner = asyncio.create_task(self._run(), name="reminder-timers")
+        logger.info("Reminder timers loaded for %s task(s)", len(self._tasks))
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+
+    def _track(self, task_id: int, due_at: str, title: Optional[str], owner: Optional[str], reminded: bool) -> List[Tuple[float, int, str, int, str]]:
+        """Record the task and return its timers (not yet on the heap)."""
+        self._tasks[task_id] = (due_at, title, owner)
+        self._reminded[task_id] = reminded
+        due = _epoch(due_at)
+        timers = []
+        if not reminded and self.lead_seconds > 0:
+            timers.append((due - self.lead_seconds, next(self._seq), REMIND, task_id, due_at))
+        timers.append((due, next(self._seq), OVERDUE, task_id, due_at))
+        return timers
+
+    def _push(self, task_id: int, due_at: str, title: Optional[str], owner: Optional[str], reminded: bool) -> None:
+        head = self._heap[0][0] if self._heap else None
+        for timer in self._track(task_id, due_at, title, owner, reminded):
+            heapq.heappush(self._heap, timer)
+        # wake the timer task if the earliest deadline moved forward
+        if self._wakeup is not None and (head is None or self._heap[0][0] < head):
+            self._wakeup.set()
+
+    def on_task_change(self, task_id: int, changes: Dict[str, Any]) -> None:
+        """TaskStore listener: keep the heap in step with inserts and updates.
+
+        Due-date changes carry the task's status, title and owner, so only
+        active tasks are scheduled.
+        """
+        status = changes.get("status")
+        if status is not None and status not in ACTIVE_STATUSES:
+            self._tasks.pop(task_id, None)
+            self._reminded.pop(task_id, None)
+            return
+        if "due_at" not in changes:
+            return
+        known = self._tasks.get(task_id, (None, None, None))
+        if not changes["due_at"] or status is None:
+            self._tasks.pop(task_id, None)
+            return
+        self._push(
+            task_id,
+            changes["due_at"],
+            changes.get("title", known[1]),
+            changes.get("owner", known[2]),
+            reminded=bool(changes.get("reminded_at")),
+        )
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            delay = self._heap[0][0] - time.time() if self._heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.fire_due()
+
+    async def fire_due(self, now: Optional[float] = None) -> int:
+        """Fire every timer whose time has come; returns how many fired."""
+        fired = 0
+        while self._heap and self._heap[0][0] <= (now if now is not None else time.time()):
+            fire_at, _, kind, task_id, due_at = heapq.heappop(self._heap)
+            tracked = self._tasks.get(task_id)
+            if tracked is None or tracked[0] != due_at:
+                continue  # completed, removed or rescheduled since this timer was pushed
+            self.max_lateness_ms = max(self.max_lateness_ms, round((time.time() - fire_at) * 1000.0, 1))
+            try:
+                if kind == REMIND:
+                    await self._remind(task_id, *tracked)
+                else:
+                    await self._mark_overdue(task_id, *tracked)
+                fired += 1
+            except Exception as e:
+                logger.exception("Reminder timer %s for task %s failed: %s", kind, task_id, e)
+        return fired
+
+    async def _remind(self, task_id: int, due_at: str, title: Optional[str], owner: Optional[str]) -> None:
+        if self._reminded.get(task_id):
+            return
+        result = await self.act({"task_id": task_id, "title": title, "owner": owner, "due_at": due_at})
+        if result.get("status") not in DELIVERED:
+            # reminded_at stays unset, so the overdue timer (or a restart) tries again
+            logger.warning("Reminder for task %s was not delivered: %s", task_id, result)
+            return
+        self._reminded[task_id] = True
+        await self.store.mark_reminded_async(task_id)
+        self.reminders_sent += 1
+
+    async def _mark_overdue(self, task_id: int, due_at: str, title: Optional[str], owner: Optional[str]) -> None:
+        # a reminder that was never sent (lead of 0, or the service was down) goes out now
+        try:
+            await self._remind(task_id, due_at, title, owner)
+        except Exception as e:
+            logger.exception("Reminder for overdue task %s failed: %s", task_id, e)
+        self._tasks.pop(task_id, None)
+        await self.store.update_status_async(task_id, OVERDUE)
+        self.marked_overdue += 1
+        logger.info("Task %s is overdue (due %s)", task_id, due_at)
+
+    async def poll(self) -> int:
+        # timers fire on their own once started; polling only catches up without a running loop
+        return await self.fire_due()
 
     async def act(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        # Send reminder via ToolRouter
-        return {"status": "ok"}
+        """Send a reminder for `payload` (task_id, title, owner, due_at) to Slack.
+
+        Sent through `slack_agent` (its outbox coalesces and paces messages per
+        channel) when set, otherwise via ToolRouter under the shared Slack rate
+        limit. The status is "error" if any send result was not delivered.
+        """
+        owner = f" ({payload['owner']})" if payload.get("owner") else ""
+        text = f"Reminder: '{payload.get('title')}'{owner} is due {payload.get('due_at')} UTC"
+        if self.slack_agent is not None:
+            results = [await self.slack_agent.act(self.channel, text)]
+        elif self.arouter is None:
+            logger.info("No Slack agent or router; reminder not sent: %s", text)
+            return {"status": "mock"}
+        else:
+            async with rate_limiter.limit("slack", key=self.channel):
+                results = await self.arouter.multi_execute([{"tool": "slack", "action": "send_message", "payload": {"channel": self.channel, "text": text}}])
+        status = "ok" if results and all(r.get("status") in DELIVERED for r in results) else "error"
+        return {"status": status, "results": results}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked_tasks": len(self._tasks),
+            "pending_timers": len(self._heap),
+            "next_fire_in_s": round(self._heap[0][0] - time.time(), 3) if self._heap else None,
+            "reminders_sent": self.reminders_sent,
+            "marked_overdue": self.marked_overdue,
+            "max_lateness_ms": self.max_lateness_ms,
+            "running": self._runner is not None and not self._runner.done(),
+        }
@@ -0,0 +1,26 @@
+import shutil
+import tempfile
+
+import pytest
+
+from src.core.config import settings
+
+_session_cache_dir = None
+
+
+def pytest_configure(config):
+    # main.py builds its planner (and summary cache) when test modules import it during collection
+    global _session_cache_dir
+    _session_cache_dir = tempfile.mkdtemp(prefix="summary_cache-")
+    settings.SUMMARY_CACHE_DIR = _session_cache_dir
+
+
+def pytest_unconfigure(config):
+    if _session_cache_dir:
+        shutil.rmtree(_session_cache_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def summary_cache_dir(tmp_path, monkeypatch):
+    """Keep summaries cached by planners under test out of the repo's data/summary_cache."""
+    monkeypatch.setattr(settings, "SUMMARY_CACHE_DIR", str(tmp_path / "summary_cache"))
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+import pytest
+
+from src.agents.registry import AgentRegistry
+
+
+class SlowAgent:
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def connect(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("auth failed")
+        return {"status": "connected"}
+
+
+@pytest.mark.asyncio
+async def test_status_probes_run_concurrently_and_are_cached():
+    registry = AgentRegistry(status_ttl=60, probe_timeout=0.5)
+    agents = {"slack": SlowAgent(0.1), "gmail": SlowAgent(0.1), "notion": SlowAgent(0.1, fail=True), "drive": SlowAgent(5)}
+    for name, agent in agents.items():
+        registry.register(name, agent)
+
+    started = time.perf_counter()
+    # concurrent callers share one probe
+    first, second = await asyncio.gather(registry.status(), registry.status())
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert first == second
+    assert first["slack"]["status"] == "connected"
+    assert first["notion"] == {"status": "error", "error": "auth failed", "latency_ms": first["notion"]["latency_ms"]}
+    assert first["drive"]["status"] == "timeout"
+
+    await registry.status()
+    assert all(a.calls == 1 for a in agents.values())
+    await registry.status(refresh=True)
+    assert all(a.calls == 2 for a in agents.values())
+
+
+def test_agents_endpoints_use_registry():
+    from fastapi.testclient import TestClient
+    from main import agents, app
+
+    client = TestClient(app)
+    res = client.get("/agents/status", params={"refresh": True})
+    assert res.status_code == 200
+    assert set(res.json()["agents"]) == {"slack", "gmail", "notion"}
+
+    gmail = agents.get("gmail")
+    res = client.post("/agents/gmail/action", json={"action": "mark_processed", "payload": {"id": "m1"}})
+    assert res.status_code == 200
+    assert agents.get("gmail") is gmail
+    assert client.post("/agents/unknown/action", json={"action": "x"}).status_code == 404
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.agents import slack_agent as slack_module
+from src.agents.notion_agent import NotionAgent
+from src.agents.slack_agent import SlackAgent
+from src.core.background_loop import BackgroundLoop, background_loop
+from src.core.config import settings
+
+
+class FakeSlackClient:
+    instances = 0
+
+    def __init__(self, token=None):
+        FakeSlackClient.instances += 1
+        self.loops = set()
+
+    async def chat_postMessage(self, channel, text, **kwargs):
+        self.loops.add(asyncio.get_running_loop())
+        await asyncio.sleep(0.05)
+        return {"ok": True, "ts": str(time.time()), "channel": channel}
+
+
+def test_sync_sends_share_one_loop_and_client(monkeypatch):
+    monkeypatch.setattr(settings, "SLACK_BOT_TOKEN", "x-token")
+    monkeypatch.setattr(slack_module, "AsyncWebClient", FakeSlackClient)
+    FakeSlackClient.instances = 0
+    agent = SlackAgent()
+
+    for i in range(3):
+        assert agent.send(f"#c{i}", "hello")["status"] == "ok"
+    assert FakeSlackClient.instances == 1
+    assert agent._client.loops == {background_loop.loop}
+
+    results = agent.send_many([(f"#bulk{i}", f"update {i}") for i in range(4)])
+    assert [r["channel"] for r in results] == [f"#bulk{i}" for i in range(4)]
+    assert FakeSlackClient.instances == 1
+
+
+def test_send_many_runs_concurrently_and_reports_failures_in_order():
+    class FlakyNotion(NotionAgent):
+        async def act(self, action, payload):
+            await asyncio.sleep(0.05)
+            if payload.get("fail"):
+                raise ValueError("boom")
+            return {"status": "ok", "action": action, "id": payload["id"]}
+
+    agent = FlakyNotion()
+    started = time.perf_counter()
+    results = agent.send_many([("update_task", {"id": i}) for i in range(16)], max_concurrency=16)
+    assert time.perf_counter() - started < 0.4  # sixteen 50ms calls
+    assert [r["id"] for r in results] == list(range(16))
+
+    results = agent.send_many([("update_task", {"id": 1}), {"action": "update_task", "payload": {"id": 2, "fail": True}}, ("update_task", {"id": 3})])
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+    assert results[1]["error"] == "boom"
+
+
+def test_background_loop_timeout_cancels_and_rejects_reentry():
+    runner = BackgroundLoop(name="test-loop")
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        runner.run(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+
+    async def reenter():
+        return runner.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        runner.run(reenter())
+    assert runner.run_many([asyncio.sleep(0.01, result=i) for i in range(5)], max_concurrency=2) == list(range(5))
+    runner.stop()
+    assert runner._thread is None
+
+
+@pytest.mark.asyncio
+async def test_shared_agent_keeps_separate_state_per_loop(monkeypatch):
+    monkeypatch.setattr(settings, "SLACK_BOT_TOKEN", "x-token")
+    monkeypatch.setattr(slack_module, "AsyncWebClient", FakeSlackClient)
+    agent = SlackAgent()
+    agent.outbox.window = 0.1
+
+    # a send waiting in this loop's outbox survives a sync send on the background loop
+    queued = asyncio.ensure_future(agent.act("#ops", "from the server loop"))
+    await asyncio.sleep(0.01)
+    sync_result = await asyncio.to_thread(agent.send, "#ops", "from a sync caller")
+    result = await asyncio.wait_for(queued, 1)
+    assert result["status"] == sync_result["status"] == "ok"
+    assert agent._client.loops == {asyncio.get_running_loop(), background_loop.loop}
+    assert agent.outbox.stats()["queued"] == {}
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from src.core.analytics import AnalyticsEngine
+from src.core.dedup import MinHashLSH, shingles
+from src.core.task_store import TaskStore
+
+
+def test_signatures_estimate_similarity():
+    lsh = MinHashLSH()
+    a = lsh.signature("Review the Q3 budget spreadsheet by Friday")
+    b = lsh.signature("Reminder: review the Q3 budget spreadsheet by Friday!")
+    c = lsh.signature("Book flights for the offsite")
+    assert lsh.similarity(a, b) >= 0.7
+    assert lsh.similarity(a, c) < 0.2
+    assert set(lsh.band_keys(a)) & set(lsh.band_keys(b))
+    assert shingles("Item 1") != shingles("Item 2")
+    assert lsh.signature("the, and!") is None
+
+
+@pytest.mark.asyncio
+async def test_cross_source_duplicates_are_linked_at_ingest():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    original = await store.add_task_async(source="gmail", title="Review the Q3 budget spreadsheet by Friday", owner="alice@example.com")
+    batch = await store.add_tasks_async(
+        [
+            {"source": "slack", "title": "Reminder: review the Q3 budget spreadsheet by Friday!"},
+            {"source": "notion", "title": "Review Q3 budget spreadsheet by friday"},
+            {"source": "notion", "title": "Book flights for the offsite"},
+            {"source": "slack", "title": "Book the flights for the offsite"},
+        ]
+    )
+    assert [t.status for t in batch] == ["duplicate", "duplicate", "open", "duplicate"]
+    assert batch[0].metadata["duplicate_of"] == original.id
+    assert batch[3].metadata["duplicate_of"] == batch[2].id
+    canonical = await store.get_task_async(original.id)
+    assert canonical.metadata["duplicates"] == [batch[0].id, batch[1].id]
+    assert await AnalyticsEngine(store).active_tasks_count() == 2
+
+    # closed tasks are not duplicate targets
+    await store.update_status_async(batch[2].id, "done")
+    again = await store.add_task_async(source="gmail", title="Book flights for the offsite")
+    assert again.status == "open"
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_lookup_compares_only_bucket_candidates():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    rng = random.Random(7)
+    words = [f"w{i}" for i in range(2000)]
+    await store.add_tasks_async([{"source": "gmail", "title": " ".join(rng.sample(words, 6))} for _ in range(500)])
+    compared = store.dedup.stats()["candidates_compared"]
+    await store.add_task_async(source="slack", title="Totally unrelated escalation about the datacenter move")
+    assert store.dedup.stats()["candidates_compared"] - compared < 10
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_existing_tasks_are_backfilled(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    plain = TaskStore(db_path=path, dedup=False)
+    await plain.connect()
+    first = await plain.add_task_async(source="gmail", title="Renew the SSL certificate for api.example.com")
+    await plain.add_task_async(source="slack", title="Renew the SSL certificate for api.example.com")
+    await plain.disconnect()
+
+    store = TaskStore(db_path=path)
+    await store.connect()
+    dup = await store.add_task_async(source="notion", title="Renew SSL certificate for api.example.com")
+    assert dup.status == "duplicate" and dup.metadata["duplicate_of"] == first.id
+    await store.disconnect()
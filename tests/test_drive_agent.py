@@ -0,0 +1,149 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from src.agents.drive_agent import GOOGLE_DOC, ActionItemParser, DriveAgent
+from src.core.ingest import ingest_agent
+from src.core.task_store import TaskStore
+
+
+class FakeDrive:
+    """Minimal Drive v3 ASGI server: paged /files listing and chunked downloads."""
+
+    def __init__(self, chunk_size=7, page_size=2, delay=0.01):
+        self.files = {}
+        self.chunk_size = chunk_size
+        self.page_size = page_size
+        self.delay = delay
+        self.downloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def put(self, file_id, content, name=None, mime=GOOGLE_DOC):
+        prev = self.files.get(file_id)
+        version = (prev["version"] + 1) if prev else 1
+        self.files[file_id] = {"id": file_id, "name": name or file_id, "mimeType": mime, "version": version, "content": content.encode()}
+
+    async def __call__(self, scope, receive, send):
+        path, query = scope["path"], parse_qs(scope["query_string"].decode())
+        if path == "/files":
+            ids = sorted(self.files)
+            start = int(query.get("pageToken", ["0"])[0])
+            page = ids[start:start + self.page_size]
+            body = {"files": [{k: v for k, v in self.files[i].items() if k != "content"} | {"version": str(self.files[i]["version"])} for i in page]}
+            if start + self.page_size < len(ids):
+                body["nextPageToken"] = str(start + self.page_size)
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+            await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+            return
+        file_id = path.split("/")[2]
+        content = self.files[file_id]["content"]
+        self.downloads.append(file_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+            for i in range(0, len(content), self.chunk_size):
+                await asyncio.sleep(self.delay)
+                await send({"type": "http.response.body", "body": content[i:i + self.chunk_size], "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            self.in_flight -= 1
+
+
+def make_agent(fake, store, max_concurrency=2):
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://drive.test")
+    return DriveAgent(store=store, client=client, max_concurrency=max_concurrency, chunk_size=5)
+
+
+def test_parser_handles_split_lines_and_characters():
+    text = "Intro\nTODO: send the deck to @alice\n- [ ] Book the café\nnot an action\nAction item: fix CI".encode()
+    parser = ActionItemParser(max_line_chars=40)
+    found = []
+    for i in range(0, len(text), 3):
+        found += parser.feed(text[i:i + 3])
+    found += parser.close()
+    assert found == ["send the deck to @alice", "Book the café", "fix CI"]
+    long_line = ("TODO: " + "x" * 500 + "\nTODO: short\n").encode()
+    parser = ActionItemParser(max_line_chars=40)
+    found = [t for i in range(0, len(long_line), 16) for t in parser.feed(long_line[i:i + 16])] + parser.close()
+    assert found == ["x" * 34, "short"]
+    assert parser.max_buffered <= 40
+
+
+@pytest.mark.asyncio
+async def test_scan_skips_unchanged_documents_and_emits_only_new_items():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    fake = FakeDrive()
+    fake.put("doc1", "Notes\nTODO: draft the launch plan @bob\n", name="Launch")
+    fake.put("doc2", "- [ ] renew the domain\n", name="Ops")
+    fake.put("doc3", "nothing to do here\n", name="Misc")
+    fake.put("img", "binary", mime="image/png")
+    agent = make_agent(fake, store)
+
+    first = await agent.poll()
+    assert sorted(i["title"] for i in first) == ["draft the launch plan @bob", "renew the domain"]
+    assert next(i for i in first if i["file_id"] == "doc1")["owner"] == "bob"
+    assert sorted(fake.downloads) == ["doc1", "doc2", "doc3"]
+
+    # nothing changed: listing only, no downloads
+    fake.downloads.clear()
+    assert await agent.poll() == []
+    assert fake.downloads == []
+    assert agent.stats()["unchanged"] == 3
+
+    # doc1 gains an item, doc2 gets a new revision with identical content
+    fake.put("doc1", "Notes\nTODO: draft the launch plan @bob\nTODO: book the venue\n", name="Launch")
+    fake.put("doc2", "- [ ] renew the domain\n", name="Ops (renamed)")
+    third = await agent.poll()
+    assert [i["title"] for i in third] == ["book the venue"]
+    assert sorted(fake.downloads) == ["doc1", "doc2"]
+    assert agent.stats()["same_content"] == 1
+    state = await store.get_drive_documents(["doc1", "doc2"])
+    assert state["doc1"]["revision_id"] == "2" and len(state["doc1"]["item_hashes"]) == 2
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_downloads_run_in_parallel_under_the_cap_and_ingest():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    fake = FakeDrive(chunk_size=4, page_size=10, delay=0.005)
+    for i in range(8):
+        fake.put(f"doc{i}", f"TODO: follow up on topic {i} with vendor{i}\n" * 3)
+    agent = make_agent(fake, store, max_concurrency=3)
+    stats = await ingest_agent(store, agent, batch_size=4)
+    assert stats["tasks"] == 8
+    assert fake.max_in_flight == 3
+    assert len([t for t in await store.list_tasks_async() if t.source == "drive"]) == 8
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_scan_state_is_saved_only_after_items_are_ingested():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    fake = FakeDrive()
+    fake.put("doc1", "TODO: send the minutes\n")
+    fake.put("doc2", "TODO: order new badges\n")
+    agent = make_agent(fake, store)
+    add_tasks = store.add_tasks_async
+
+    async def failing_add(tasks):
+        raise RuntimeError("disk full")
+
+    store.add_tasks_async = failing_add
+    with pytest.raises(RuntimeError):
+        await ingest_agent(store, agent, batch_size=1)
+    assert await store.get_drive_documents(["doc1", "doc2"]) == {}
+
+    # the failed scan is redone in full on the next sync
+    store.add_tasks_async = add_tasks
+    stats = await ingest_agent(store, agent)
+    assert stats["tasks"] == 2
+    assert sorted(await store.get_drive_documents(["doc1", "doc2"])) == ["doc1", "doc2"]
+    await store.disconnect()
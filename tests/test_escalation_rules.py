@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from src.agents import slack_agent as slack_module
+from src.agents.slack_agent import SlackAgent
+from src.core.config import settings
+from src.core.task_store import TaskStore
+from src.workflows.escalation_agent import EscalationAgent
+from src.workflows.escalation_rules import RuleSet, compile_rule, parse_duration
+
+
+def test_rules_compile_to_predicates():
+    rule = compile_rule(
+        {
+            "name": "r",
+            "when": {"owner": "alice", "status": ["open", "in_progress"], "title": {"contains": "Invoice"}, "metadata.priority": {"ne": "low"}},
+            "status_for": "48h",
+        }
+    )
+    assert rule.status_for == 48 * 3600 and rule.anchor == "status_changed_at"
+    assert rule.index_field == "owner" and rule.fields == {"owner", "status", "title", "metadata"}
+    assert rule.predicate({"owner": "alice", "status": "open", "title": "Pay invoice #4", "metadata": {}})
+    assert not rule.predicate({"owner": "alice", "status": "done", "title": "Pay invoice #4", "metadata": {}})
+    assert not rule.predicate({"owner": "alice", "status": "open", "title": "Pay invoice", "metadata": {"priority": "low"}})
+    assert parse_duration("90s") == 90 and parse_duration("2d") == 172800
+    with pytest.raises(ValueError):
+        compile_rule({"name": "bad", "when": {"owner": {"startswith": "a"}}})
+    with pytest.raises(ValueError):
+        RuleSet([{"name": "dup"}, {"name": "dup"}])
+
+
+def test_index_limits_candidates():
+    rules = RuleSet([{"name": f"owner-{i}", "when": {"owner": f"user{i}", "status": "open"}} for i in range(1000)] + [{"name": "any-gmail", "when": {"title": {"regex": "^URGENT"}}}])
+    names = {r.name for r in rules.candidates({"owner": "user7", "status": "open", "source": "gmail"})}
+    assert names == {"owner-7", "any-gmail"}
+    # a change to a field no candidate references checks nothing
+    assert rules.candidates({"owner": "user7"}, changed={"description"}) == []
+
+
+class RecordingEscalation(EscalationAgent):
+    def __init__(self, store, rules):
+        super().__init__(router=None, store=store, rules=rules)
+        self.sent = []
+
+    async def act(self, payload):
+        self.sent.append((payload["rule"], payload["task"]["id"], payload["text"]))
+        return await super().act(payload)
+
+
+@pytest.mark.asyncio
+async def test_rules_fire_incrementally_on_task_changes():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    old = await store.add_task_async(source="gmail", title="Old request", owner="alice")
+    agent = RecordingEscalation(
+        store,
+        [
+            {"name": "stale-gmail", "when": {"source": "gmail", "status": "open"}, "status_for": "0.1s", "message": "{title} is stale"},
+            {"name": "blocked", "when": {"status": "blocked"}},
+        ],
+    )
+    await agent.start()
+    blocked = await store.add_task_async(source="slack", title="Deploy", owner="bob")
+    await store.update_status_async(blocked.id, "blocked")
+    await asyncio.sleep(0.01)
+    assert agent.sent == [("blocked", blocked.id, "Escalation 'blocked': task %s 'Deploy' (bob, blocked)" % blocked.id)]
+
+    fresh = await store.add_task_async(source="gmail", title="New request", owner="carol")
+    await asyncio.sleep(0.05)
+    # the fresh task is resolved before its delay passes and never escalates
+    await store.update_status_async(fresh.id, "done")
+    await asyncio.sleep(0.1)
+    assert [(r, t) for r, t, _ in agent.sent if r == "stale-gmail"] == [("stale-gmail", old.id)]
+    assert ("stale-gmail", old.id, "Old request is stale") in agent.sent
+
+    # a description edit re-checks no rule and fires nothing new
+    evaluations = agent.evaluations
+    agent.on_task_change(old.id, {"description": "more detail"})
+    assert agent.evaluations == evaluations
+    # leaving and re-entering the matching status re-arms the rule once
+    await store.update_status_async(old.id, "in_progress")
+    await store.update_status_async(old.id, "open")
+    await asyncio.sleep(0.15)
+    assert [t for r, t, _ in agent.sent if r == "stale-gmail"] == [old.id, old.id]
+    assert agent.stats()["armed"] == 0
+    await agent.stop()
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_escalation_bursts_go_through_the_slack_outbox(monkeypatch):
+    class FakeSlackClient:
+        def __init__(self, token=None):
+            self.posts = []
+
+        async def chat_postMessage(self, channel, text, **kwargs):
+            self.posts.append((channel, text))
+            return {"ok": True, "ts": "1.0", "channel": channel}
+
+    monkeypatch.setattr(settings, "SLACK_BOT_TOKEN", "x-token")
+    monkeypatch.setattr(settings, "SLACK_COALESCE_WINDOW_SECONDS", 0.05)
+    monkeypatch.setattr(slack_module, "AsyncWebClient", FakeSlackClient)
+    slack = SlackAgent()
+    agent = EscalationAgent(router=None, rules=[], channel="#escalations", slack_agent=slack)
+
+    results = await asyncio.gather(*[agent.act({"rule": "blocked", "task": {"id": i}, "text": f"task {i} is blocked"}) for i in range(5)])
+    assert all(r["results"][0]["status"] == "ok" for r in results)
+    # one coalesced post instead of five separate messages
+    assert slack._client.posts == [("#escalations", "\n".join(f"task {i} is blocked" for i in range(5)))]
+    assert agent.fired == 5
+
+
+@pytest.mark.asyncio
+async def test_restart_does_not_post_fired_escalations_again(tmp_path):
+    rules = [
+        {"name": "blocked", "when": {"status": "blocked"}},
+        {"name": "stale", "when": {"status": "open"}, "status_for": "0.05s"},
+    ]
+    store = TaskStore(db_path=str(tmp_path / "tasks.db"))
+    await store.connect()
+    blocked = await store.add_task_async(source="slack", title="Deploy", owner="bob")
+    await store.update_status_async(blocked.id, "blocked")
+    stale = await store.add_task_async(source="gmail", title="Old request")
+    unblocked = await store.add_task_async(source="slack", title="Migrate")
+    await store.update_status_async(unblocked.id, "blocked")
+    agent = RecordingEscalation(store, rules)
+    await agent.start()
+    await asyncio.sleep(0.1)
+    await agent.stop()
+    assert sorted((r, t) for r, t, _ in agent.sent) == [("blocked", blocked.id), ("blocked", unblocked.id), ("stale", stale.id)]
+    await store.update_status_async(unblocked.id, "in_progress")
+    await store.disconnect()
+
+    store = TaskStore(db_path=str(tmp_path / "tasks.db"))
+    await store.connect()
+    restarted = RecordingEscalation(store, rules)
+    await restarted.start()
+    await asyncio.sleep(0.1)
+    assert restarted.sent == []
+    # a task that stopped matching while the agent was down escalates again on its next match
+    await store.update_status_async(unblocked.id, "blocked")
+    await asyncio.sleep(0.01)
+    assert [(r, t) for r, t, _ in restarted.sent] == [("blocked", unblocked.id)]
+    await restarted.stop()
+    assert {(r["rule"], r["task_id"]) for r in await store.list_fired_escalations()} == {("blocked", blocked.id), ("blocked", unblocked.id), ("stale", stale.id)}
+    await store.disconnect()
@@ -0,0 +1,63 @@
+import pytest
+
+from src.core.exceptions import ToolConnectionError
+from src.core.fault_injection import FaultInjector, FaultProfile
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+def test_seeded_injector_is_reproducible():
+    profiles = {"notion": {"latency": "longtail", "latency_ms": 50, "tail": 1.5}}
+    a = FaultInjector(profiles, seed=7)
+    b = FaultInjector(profiles, seed=7)
+    profile = a.profile_for("notion", "fetch_tasks")
+
+    samples = [a.sample_latency(profile) for _ in range(20)]
+
+    assert samples == [b.sample_latency(profile) for _ in range(20)]
+    assert max(samples) > 0.05 > min(samples)
+
+
+def test_profile_lookup_and_validation():
+    inj = FaultInjector({"slack.post_message": {"latency_ms": 5}, "*": {"error_rate": 0.5}})
+
+    assert inj.profile_for("slack", "post_message").latency_ms == 5
+    assert inj.profile_for("gmail", "send").error_rate == 0.5
+    with pytest.raises(ValueError):
+        FaultProfile.from_dict({"latency": "bimodal"})
+
+
+@pytest.mark.asyncio
+async def test_stub_injects_errors_padding_and_timeouts():
+    faults = FaultInjector(
+        {
+            "slack": FaultProfile(error_rate=1.0),
+            "notion": FaultProfile(payload_bytes=128),
+            "gmail": FaultProfile(timeout_rate=1.0, hang_seconds=5),
+        },
+        seed=1,
+    )
+    router = ToolRouterStub(faults=faults)
+
+    with pytest.raises(ToolConnectionError):
+        await router.amulti_execute([{"tool": "slack", "action": "post_message", "payload": {}}])
+    [result] = await router.amulti_execute([{"tool": "notion", "action": "fetch_tasks", "payload": {}}])
+    assert len(result["data"]) == 128
+    # the sync path is unaffected
+    assert router.multi_execute([{"tool": "slack", "action": "post_message", "payload": {}}])[0]["status"] == "ok"
+
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        planner = WorkflowPlanner(router=router, store=store)
+        planner.retry_backoff = 0.0
+        planner.step_timeout = 0.05
+        summary = await planner.run("weekly_review_cross_tool", params={"channel": "#ops", "database_id": "db_1"})
+
+        statuses = {ex["tool"]: ex["status"] for ex in summary["executions"]}
+        assert statuses["gmail"] == "timeout"
+        assert statuses["slack"] == "error"
+        assert faults.stats()["injected_errors"] == 1 + planner.max_attempts
+    finally:
+        await store.disconnect()
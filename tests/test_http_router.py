@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from src.core.exceptions import WorkflowExecutionError
+from src.core.http_router import HttpToolRouter
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+def make_fake_toolrouter():
+    """A stand-in remote ToolRouter that delegates to the stub."""
+    app = FastAPI()
+    stub = ToolRouterStub()
+    app.state.requests = []
+
+    @app.post("/plan")
+    async def plan(request: Request):
+        return stub.plan(await request.json())
+
+    @app.post("/multi_execute")
+    async def multi_execute(request: Request):
+        body = await request.json()
+        app.state.requests.append(
+            {"idempotency_key": request.headers.get("idempotency-key"), "auth": request.headers.get("authorization")}
+        )
+        if any(ex["payload"].get("channel") == "#slow" for ex in body["executions"]):
+            await asyncio.sleep(5)
+        if any(ex["payload"].get("channel") == "#down" for ex in body["executions"]):
+            return JSONResponse({"error": "unavailable"}, status_code=503)
+        return {"results": stub.multi_execute(body["executions"])}
+
+    @app.get("/connections")
+    async def connections():
+        return stub.manage_connections()
+
+    return app
+
+
+class TimeoutTransport(httpx.AsyncBaseTransport):
+    """ASGITransport ignores timeouts; enforce the read timeout the way a network transport would."""
+
+    def __init__(self, app):
+        self.inner = httpx.ASGITransport(app=app)
+
+    async def handle_async_request(self, request):
+        try:
+            return await asyncio.wait_for(self.inner.handle_async_request(request), request.extensions["timeout"]["read"])
+        except asyncio.TimeoutError as e:
+            raise httpx.ReadTimeout("timed out", request=request) from e
+
+
+@pytest.mark.asyncio
+async def test_http_router_runs_workflow_over_pooled_client():
+    app = make_fake_toolrouter()
+    router = HttpToolRouter("http://toolrouter", api_key="secret", transport=httpx.ASGITransport(app=app))
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        planner = WorkflowPlanner(router=router, store=store)
+        assert planner.arouter is router
+
+        summary = await planner.run("weekly_review", params={"channel": "#ops", "manager_email": "m@example.com"})
+        client = router.client
+
+        assert summary["status"] == "success"
+        assert any(ex["tool"] == "slack" for ex in summary["executions"])
+        assert all(r["auth"] == "Bearer secret" for r in app.state.requests)
+        assert app.state.requests[0]["idempotency_key"] == f"run-{summary['run_id']}-step-0"
+
+        # later calls reuse the same pooled client
+        await router.manage_connections()
+        assert router.client is client
+    finally:
+        await router.aclose()
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_http_router_raises_on_server_error():
+    router = HttpToolRouter("http://toolrouter", transport=httpx.ASGITransport(app=make_fake_toolrouter()))
+    try:
+        with pytest.raises(WorkflowExecutionError):
+            await router.multi_execute([{"tool": "slack", "action": "post_message", "payload": {"channel": "#down"}}])
+    finally:
+        await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_router_timeouts_are_recorded_as_step_timeouts():
+    router = HttpToolRouter("http://toolrouter", timeout=0.05, transport=TimeoutTransport(make_fake_toolrouter()))
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        planner = WorkflowPlanner(router=router, store=store)
+        planner.max_attempts = 1
+        # no step timeout, so the router's own request timeout fires
+        planner.step_timeout = None
+        results = await planner._execute_with_retry({"tool": "slack", "action": "post_message", "payload": {"channel": "#slow"}})
+        assert [r["status"] for r in results] == ["timeout"]
+    finally:
+        await router.aclose()
+        await store.disconnect()
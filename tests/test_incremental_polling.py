@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import patch
+
+from src.agents.gmail_agent import GmailAgent
+from src.agents.notion_agent import NotionAgent
+from src.agents.slack_agent import SlackAgent
+from src.core.config import settings
+from src.core.task_store import TaskStore
+
+
+class FakeSlackClient:
+    """conversations_history over a fixed channel, two messages per page."""
+
+    def __init__(self, ts_values):
+        self.messages = [{"ts": ts, "text": f"message {ts}"} for ts in ts_values]
+        self.calls = []
+
+    async def conversations_history(self, channel, limit, oldest=None, cursor=None):
+        self.calls.append({"oldest": oldest, "cursor": cursor})
+        newer = [m for m in self.messages if oldest is None or float(m["ts"]) > float(oldest)]
+        newer.sort(key=lambda m: float(m["ts"]), reverse=True)
+        start = int(cursor or 0)
+        page = newer[start:start + 2]
+        has_more = start + 2 < len(newer)
+        return {"messages": page, "has_more": has_more, "response_metadata": {"next_cursor": str(start + 2) if has_more else ""}}
+
+
+class FakeGmailClient:
+    def __init__(self):
+        self.history = [{"id": f"m{i}", "subject": f"mail {i}", "historyId": str(100 + i)} for i in range(3)]
+
+    def fetch_messages(self, label, limit, history_id=None, page_token=None):
+        msgs = [m for m in self.history if history_id is None or int(m["historyId"]) > int(history_id)]
+        latest = self.history[-1]["historyId"]
+        return {"messages": msgs, "next_page_token": None, "history_id": latest}
+
+
+@pytest.mark.asyncio
+async def test_slack_poll_paginates_and_resumes_from_cursor(monkeypatch):
+    monkeypatch.setattr(settings, "SLACK_BOT_TOKEN", "x-token", raising=False)
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        client = FakeSlackClient(["1.000001", "2.000001", "3.000001"])
+        with patch("src.agents.slack_agent.AsyncWebClient", return_value=client):
+            agent = SlackAgent(store=store)
+            first = await agent.poll("#ops", limit=2)
+            assert sorted(m["ts"] for m in first) == ["1.000001", "2.000001", "3.000001"]
+            assert [c["cursor"] for c in client.calls] == [None, "2"]
+            assert await store.get_cursor("slack", "#ops") == "3.000001"
+
+            client.messages.append({"ts": "4.000001", "text": "new"})
+            client.calls.clear()
+            second = await agent.poll("#ops", limit=2)
+            assert [m["ts"] for m in second] == ["4.000001"]
+            assert client.calls == [{"oldest": "3.000001", "cursor": None}]
+
+            # nothing new: cursor unchanged
+            assert await agent.poll("#ops", limit=2) == []
+            assert await store.get_cursor("slack", "#ops") == "4.000001"
+    finally:
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_gmail_and_notion_polls_use_stored_cursors():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        gmail_client = FakeGmailClient()
+        with patch("src.agents.gmail_agent.GmailClient", return_value=gmail_client):
+            agent = GmailAgent(store=store)
+            agent.token = "g-token"
+            assert len(await agent.poll(label="INBOX")) == 3
+            gmail_client.history.append({"id": "m3", "subject": "late mail", "historyId": "103"})
+            assert [m["id"] for m in await agent.poll(label="INBOX")] == ["m3"]
+
+        pages = [
+            {"id": "p1", "title": "Roadmap", "last_edited_time": "2026-01-01T10:00:00Z"},
+            {"id": "p2", "title": "Budget", "last_edited_time": "2026-01-02T10:00:00Z"},
+        ]
+
+        class FakeNotionClient:
+            def __init__(self, token):
+                pass
+
+            async def query_tasks(self, database_id, limit, edited_after=None, start_cursor=None):
+                results = [p for p in pages if edited_after is None or p["last_edited_time"] > edited_after]
+                return {"results": results, "has_more": False, "next_cursor": None}
+
+        with patch("src.agents.notion_agent.NotionClient", FakeNotionClient):
+            agent = NotionAgent(store=store)
+            agent.token = "n-token"
+            assert len(await agent.poll(database_id="db_1")) == 2
+            pages[0]["last_edited_time"] = "2026-01-03T09:00:00Z"
+            assert [p["id"] for p in await agent.poll(database_id="db_1")] == ["p1"]
+
+        state = {(r["agent"], r["source"]): r["cursor"] for r in await store.list_sync_state()}
+        assert state == {("gmail", "INBOX"): "103", ("notion", "db_1"): "2026-01-03T09:00:00Z"}
+    finally:
+        await store.disconnect()
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from src.agents.base_agent import BaseAgent
+from src.core.ingest import ingest_agent
+from src.core.task_store import TaskStore
+
+
+class PagedAgent(BaseAgent):
+    """Serves `pages` pages of `per_page` items from a fake upstream cursor API."""
+
+    name = "fake"
+
+    def __init__(self, store, pages=10, per_page=5):
+        super().__init__(router=None, store=store)
+        self.pages = pages
+        self.per_page = per_page
+        self.fetched = 0
+
+    async def fetch_page(self, cursor, page_token):
+        start = int(page_token or 0)
+        self.fetched += 1
+        items = [{"id": str(i), "title": f"item {i}"} for i in range(start, start + self.per_page)]
+        end = start + self.per_page
+        return items, (str(end) if end < self.pages * self.per_page else None), str(end)
+
+    async def iter_items(self, source="inbox"):
+        async for page in self.iter_since_cursor(source, self.fetch_page):
+            yield page
+
+    async def poll(self):
+        return [i async for page in self.iter_items() for i in page]
+
+    async def act(self, *args, **kwargs):
+        return {"status": "ok"}
+
+
+class SlowStore:
+    def __init__(self, agent):
+        self.agent = agent
+        self.max_ahead = 0
+        self.written = 0
+
+    async def add_tasks_async(self, tasks):
+        await asyncio.sleep(0.01)
+        self.written += len(tasks)
+        # pages fetched beyond what has been written so far
+        self.max_ahead = max(self.max_ahead, self.agent.fetched - self.written // self.agent.per_page)
+        return tasks
+
+
+@pytest.mark.asyncio
+async def test_iter_items_is_lazy():
+    agent = PagedAgent(store=None, pages=10)
+    pages = agent.iter_items()
+    first = await pages.__anext__()
+    assert len(first) == 5 and agent.fetched == 1
+    await pages.aclose()
+
+
+@pytest.mark.asyncio
+async def test_ingest_applies_backpressure():
+    agent = PagedAgent(store=None, pages=20)
+    store = SlowStore(agent)
+
+    stats = await ingest_agent(store, agent, batch_size=5, max_buffered=2)
+
+    assert stats == {"pages": 20, "items": 100, "tasks": 100, "batches": 20}
+    # bounded buffer + one page in each of producer and consumer
+    assert store.max_ahead <= 4
+
+
+@pytest.mark.asyncio
+async def test_ingest_writes_tasks_and_advances_cursor():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        agent = PagedAgent(store=store, pages=3)
+        stats = await ingest_agent(store, agent, batch_size=4)
+
+        assert stats["tasks"] == 15 and stats["batches"] == 4
+        tasks = await store.list_tasks_async()
+        assert len(tasks) == 15
+        assert tasks[0].source == "fake" and tasks[0].metadata == {"external_id": "0"}
+        assert await store.get_cursor("fake", "inbox") == "15"
+    finally:
+        await store.disconnect()
@@ -0,0 +1,58 @@
+import json
+import logging
+
+from src.utils.logger import HotPathFilter, JsonFormatter, _DeferredQueueHandler, get_logger
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("WorkflowPlanner", logging.INFO, __file__, 1, "run %s done", ("r1",), None)
+    record.run_id = 7
+    out = json.loads(JsonFormatter().format(record))
+    assert out["message"] == "run r1 done"
+    assert out["logger"] == "WorkflowPlanner"
+    assert out["run_id"] == 7
+
+
+def test_hot_path_filter_limits_info_but_not_errors():
+    flt = HotPathFilter(max_per_second=2)
+    info = [logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None) for _ in range(10)]
+    passed = [flt.filter(r) for r in info]
+    assert sum(passed) == 2
+    assert flt.filter(logging.LogRecord("x", logging.ERROR, __file__, 1, "boom", None, None))
+
+    sampled_out = HotPathFilter(sample_rate=0.0)
+    assert not sampled_out.filter(logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None))
+
+
+def test_queue_handler_defers_only_immutable_arguments():
+    import queue
+    import sys
+
+    q = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(q)
+    handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "run %s took %.1fs", ("r1", 2.5), None))
+    deferred = q.get_nowait()
+    assert deferred.args == ("r1", 2.5) and deferred.getMessage() == "run r1 took 2.5s"
+
+    # a mutable argument is formatted now; later changes don't leak into the log line
+    payload = {"status": "running"}
+    handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "state %s", (payload,), None))
+    payload["status"] = "done"
+    assert q.get_nowait().getMessage() == "state {'status': 'running'}"
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+    handler.handle(logging.LogRecord("x", logging.ERROR, __file__, 1, "failed", None, exc_info))
+    record = q.get_nowait()
+    assert record.exc_info is None
+    assert "ValueError: boom" in record.exc_text
+    assert "ValueError: boom" in logging.Formatter().format(record)
+    assert json.loads(JsonFormatter().format(record))["exc_info"] == record.exc_text
+
+
+def test_get_logger_reuses_shared_handler():
+    a = get_logger("test_logger_a")
+    b = get_logger("test_logger_b")
+    assert a.handlers and a.handlers[0] is b.handlers[0]
@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from src.agents.base_agent import BaseAgent
+from src.agents.gmail_agent import GmailAgent
+from src.agents.notion_agent import NotionAgent
+from src.core.poll_supervisor import PollLoop, PollSupervisor
+from src.core.task_store import TaskStore
+
+
+def test_interval_adapts_to_activity_and_errors():
+    loop = PollLoop(name="gmail", poll=None, interval=60, min_interval=10, max_interval=600)
+
+    assert loop.adapt(5, error=False) == 30
+    assert loop.adapt(5, error=False) == 15
+    assert loop.adapt(5, error=False) == 10  # clamped at min_interval
+    assert loop.adapt(0, error=False) == 15
+    loop.consecutive_errors = 3
+    assert loop.adapt(None, error=True) == 480
+    loop.consecutive_errors = 5
+    assert loop.adapt(None, error=True) == 600  # clamped at max_interval
+
+
+@pytest.mark.asyncio
+async def test_loops_run_concurrently_within_budget_and_isolate_failures():
+    supervisor = PollSupervisor(max_concurrency=2)
+    active = 0
+    peak = 0
+
+    def make_poll(items):
+        async def poll():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return [{}] * items
+
+        return poll
+
+    async def broken():
+        raise RuntimeError("upstream down")
+
+    opts = dict(interval=0.01, min_interval=0.01, max_interval=0.05, jitter=0.2)
+    for name, items in (("slack", 3), ("gmail", 0), ("notion", 1)):
+        supervisor.add(name, make_poll(items), **opts)
+    supervisor.add("drive", broken, **opts)
+
+    await supervisor.start()
+    await asyncio.sleep(0.3)
+    await supervisor.stop()
+
+    metrics = supervisor.metrics()["loops"]
+    assert peak <= 2
+    assert all(metrics[n]["polls"] >= 2 for n in ("slack", "gmail", "notion"))
+    assert metrics["slack"]["items_per_poll"] == 3.0
+    assert metrics["drive"]["errors"] == metrics["drive"]["polls"] >= 1
+    assert metrics["drive"]["last_error"] == "upstream down"
+    assert metrics["drive"]["interval_s"] == 0.05
+    assert all(m["running"] is False for m in metrics.values())
+
+
+def test_add_agents_uses_targets():
+    class Agent:
+        def __init__(self):
+            self.calls = []
+
+        async def poll(self, **kwargs):
+            self.calls.append(kwargs)
+            return []
+
+    slack = Agent()
+    supervisor = PollSupervisor()
+    added = supervisor.add_agents({"slack": slack}, targets={"slack": {"args": {"channel": "#ops"}, "interval": 30}, "jira": {}})
+
+    assert added == ["slack"]
+    assert supervisor.loops["slack"].interval == 30
+    asyncio.run(supervisor.poll_once(supervisor.loops["slack"]))
+    assert slack.calls == [{"channel": "#ops"}]
+
+
+def test_add_agents_ingests_items_into_the_store():
+    class Store:
+        def __init__(self):
+            self.tasks = []
+            self.cursors = {}
+
+        async def add_tasks_async(self, tasks):
+            self.tasks += tasks
+
+        async def set_cursor(self, agent, source, cursor):
+            self.cursors[(agent, source)] = cursor
+
+    class Source(BaseAgent):
+        name = "gmail"
+
+        async def poll(self):
+            raise AssertionError("ingesting agents are synced through iter_items")
+
+        async def iter_items(self):
+            yield [{"id": "m1", "subject": "Renew the lease"}]
+            await self.set_cursor("inbox", "42")
+
+        async def act(self, payload):
+            return {}
+
+    class Timer(BaseAgent):
+        name = "reminder"
+        ingests_items = False
+
+        async def poll(self):
+            return 3
+
+        async def act(self, payload):
+            return {}
+
+    store = Store()
+    supervisor = PollSupervisor()
+    supervisor.add_agents({"gmail": Source(None, store), "reminder": Timer(None, store)}, targets={"gmail": {}, "reminder": {}}, store=store)
+    for loop in supervisor.loops.values():
+        asyncio.run(supervisor.poll_once(loop))
+
+    assert [t["title"] for t in store.tasks] == ["Renew the lease"]
+    assert store.cursors == {("gmail", "inbox"): "42"}
+    assert supervisor.loops["gmail"].items_total == 1
+    assert supervisor.loops["reminder"].items_total == 3
+
+
+@pytest.mark.asyncio
+async def test_mock_agents_ingest_their_sample_items_once():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    supervisor = PollSupervisor()
+    agents = {"gmail": GmailAgent(store=store), "notion": NotionAgent(store=store)}
+    for agent in agents.values():
+        agent.token = None
+    supervisor.add_agents(agents, targets={"gmail": {}, "notion": {}}, store=store)
+
+    for loop in supervisor.loops.values():
+        await supervisor.poll_once(loop)
+    synced = len(await store.list_tasks_async())
+    intervals = {name: loop.current_interval for name, loop in supervisor.loops.items()}
+    for loop in supervisor.loops.values():
+        await supervisor.poll_once(loop)
+
+    assert synced == 4
+    assert len(await store.list_tasks_async()) == synced
+    assert all(loop.current_interval > intervals[name] for name, loop in supervisor.loops.items())
+    await store.disconnect()
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.rate_limiter import RateLimiter, ToolLimit, limit_key
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_and_reports_waits():
+    limiter = RateLimiter({"notion": ToolLimit(rate=20.0, burst=1.0, max_in_flight=10)})
+
+    async def call():
+        async with limiter.limit("notion"):
+            return time.monotonic()
+
+    start = time.monotonic()
+    await asyncio.gather(*[call() for _ in range(5)])
+    # first token is free, the remaining 4 are spaced 50ms apart
+    assert time.monotonic() - start >= 0.18
+    stats = limiter.metrics()["notion"]
+    assert stats["acquired"] == 5
+    assert stats["max_wait_seconds"] > 0
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_and_per_channel_key():
+    limiter = RateLimiter({"slack": ToolLimit(rate=1000.0, burst=1000.0, max_in_flight=2, key_rate=1000.0, key_burst=10.0)})
+    peak = 0
+    active = 0
+
+    async def call(channel):
+        nonlocal peak, active
+        async with limiter.limit("slack", key=channel):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*[call(f"#c{i % 3}") for i in range(9)])
+    assert peak == 2
+    assert limit_key("slack", "post_message", {"channel": "#ops"}) == "#ops"
+    assert limit_key("notion", "fetch_tasks", {}) is None
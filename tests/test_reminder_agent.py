@@ -0,0 +1,171 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+import time
+
+import pytest
+
+from src.core.analytics import AnalyticsEngine
+from src.core.task_store import TaskStore
+from src.workflows.reminder_agent import ReminderAgent
+
+
+def in_seconds(seconds):
+    return (datetime.utcnow() + timedelta(seconds=seconds)).isoformat()
+
+
+class RecordingReminder(ReminderAgent):
+    def __init__(self, store, lead_seconds):
+        super().__init__(router=None, store=store, lead_seconds=lead_seconds)
+        self.sent = []
+
+    async def act(self, payload):
+        self.sent.append((payload["task_id"], time.time()))
+        return {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_reminder_and_overdue_fire_on_time():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    agent = RecordingReminder(store, lead_seconds=0.1)
+    await agent.start()
+    due = time.time() + 0.2
+    task = await store.add_task_async(source="test", title="Ship it", due_at=datetime.utcfromtimestamp(due))
+    await asyncio.sleep(0.15)
+    assert [t for t, _ in agent.sent] == [task.id]
+    assert abs(agent.sent[0][1] - (due - 0.1)) < 0.05
+    assert (await store.get_task_async(task.id)).status == "open"
+    await asyncio.sleep(0.1)
+    stored = await store.get_task_async(task.id)
+    assert stored.status == "overdue" and stored.reminded_at
+    # no second reminder at the deadline
+    assert len(agent.sent) == 1
+    assert agent.stats()["max_lateness_ms"] < 50
+    await agent.stop()
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_rescheduled_and_completed_tasks_do_not_fire():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    agent = RecordingReminder(store, lead_seconds=0)
+    await agent.start()
+    moved = await store.add_task_async(source="test", title="Moved", due_at=in_seconds(0.05))
+    done = await store.add_task_async(source="test", title="Done", due_at=in_seconds(0.05))
+    await store.set_due_async(moved.id, in_seconds(3600))
+    await store.update_status_async(done.id, "done")
+    await asyncio.sleep(0.15)
+    assert agent.sent == []
+    assert (await store.get_task_async(moved.id)).status == "open"
+    assert (await store.get_task_async(done.id)).status == "done"
+    assert agent.stats()["tracked_tasks"] == 1
+    await agent.stop()
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_startup_loads_deadlines_without_repeating_reminders():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    past = await store.add_task_async(source="test", title="Missed", due_at=in_seconds(-60))
+    already = await store.add_task_async(source="test", title="Reminded", due_at=in_seconds(0.1))
+    await store.mark_reminded_async(already.id)
+    await store.add_task_async(source="test", title="Later", due_at=in_seconds(3600))
+    await store.add_task_async(source="test", title="No deadline")
+    # an active past-due task counts as overdue before any timer has run
+    assert await AnalyticsEngine(store).overdue_percentage() == 25.0
+
+    agent = RecordingReminder(store, lead_seconds=0.05)
+    await agent.start()
+    assert agent.stats()["tracked_tasks"] == 3
+    await asyncio.sleep(0.2)
+    assert (await store.get_task_async(past.id)).status == "overdue"
+    assert (await store.get_task_async(already.id)).status == "overdue"
+    # the missed task is reminded once while being marked overdue; the other was reminded before the restart
+    assert [t for t, _ in agent.sent] == [past.id]
+    await agent.stop()
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_existing_database_gains_due_columns(tmp_path):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, source VARCHAR(255), title VARCHAR(255), description TEXT, owner VARCHAR(255), status VARCHAR(50), metadata TEXT)")
+    conn.execute("INSERT INTO tasks (source, title, status, metadata) VALUES ('old', 'legacy', 'open', '{}')")
+    conn.commit()
+    conn.close()
+
+    store = TaskStore(db_path=str(path))
+    await store.connect()
+    legacy = (await store.list_tasks_async())[0]
+    assert legacy.due_at is None
+    await store.set_due_async(legacy.id, "2030-01-01T09:00:00+02:00")
+    assert [t.due_at for t in await store.list_due_tasks_async()] == ["2030-01-01T07:00:00"]
+    await store.disconnect()
+    indexes = [r[1] for r in sqlite3.connect(path).execute("PRAGMA index_list('tasks')")]
+    assert "ix_tasks_status_due_at" in indexes
+
+
+@pytest.mark.asyncio
+async def test_reminders_are_sent_through_the_shared_slack_agent():
+    class FakeSlack:
+        def __init__(self):
+            self.sent = []
+
+        async def act(self, channel, text):
+            self.sent.append((channel, text))
+            return {"status": "ok", "channel": channel}
+
+    class NoRouter:
+        def multi_execute(self, executions):
+            raise AssertionError("reminders must not bypass the Slack outbox")
+
+    slack = FakeSlack()
+    agent = ReminderAgent(router=NoRouter(), lead_seconds=0, channel="#reminders", slack_agent=slack)
+    result = await agent.act({"task_id": 1, "title": "Ship it", "owner": "bob", "due_at": "2024-05-01T12:00:00"})
+    assert result == {"status": "ok", "results": [{"status": "ok", "channel": "#reminders"}]}
+    assert slack.sent == [("#reminders", "Reminder: 'Ship it' (bob) is due 2024-05-01T12:00:00 UTC")]
+
+
+@pytest.mark.asyncio
+async def test_new_deadlines_are_tracked_only_for_active_tasks():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    agent = RecordingReminder(store, lead_seconds=0)
+    await agent.start()
+    task = await store.add_task_async(source="test", title="Write the report", owner="carol")
+    done = await store.add_task_async(source="test", title="Already shipped")
+    await store.update_status_async(done.id, "done")
+    await store.set_due_async(task.id, in_seconds(3600))
+    await store.set_due_async(done.id, in_seconds(0.05))
+    assert agent._tasks == {task.id: ((await store.get_task_async(task.id)).due_at, "Write the report", "carol")}
+    await asyncio.sleep(0.15)
+    assert (await store.get_task_async(done.id)).status == "done"
+    assert agent.sent == []
+    await agent.stop()
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_failed_reminders_are_not_marked_sent():
+    class FailingSlack:
+        async def act(self, channel, text):
+            return {"status": "error", "error": "channel_not_found"}
+
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    agent = ReminderAgent(store=store, lead_seconds=0.05, channel="#reminders", slack_agent=FailingSlack())
+    task = await store.add_task_async(source="test", title="Ship it", due_at=in_seconds(0.05))
+    result = await agent.act({"task_id": task.id, "title": "Ship it", "due_at": task.due_at})
+    assert result["status"] == "error"
+
+    await agent.start()
+    await asyncio.sleep(0.15)
+    stored = await store.get_task_async(task.id)
+    assert stored.status == "overdue" and stored.reminded_at is None
+    assert agent.stats()["reminders_sent"] == 0
+    await agent.stop()
+    await store.disconnect()
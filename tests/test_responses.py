@@ -0,0 +1,97 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from src.core import responses
+from src.core.config import settings
+from src.core.responses import CompressionMiddleware, FastJSONResponse, dumps, negotiate_encoding
+from src.core.task_store import TaskStore
+
+
+@dataclass
+class Row:
+    id: int
+    at: datetime
+
+
+def make_app():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big():
+        return FastJSONResponse({"runs": [{"id": i, "status": "success", "log": {"params": {"channel": "#ops"}}} for i in range(200)]})
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"line {i}\n".encode() * 50 for i in range(20)), media_type="text/plain")
+
+    return app
+
+
+def test_dumps_matches_stdlib_json_and_handles_extra_types():
+    payload = {"rows": [Row(1, datetime(2024, 5, 1, 12, 30))], "tags": {"a"}, 7: "int key", "text": "café"}
+    assert json.loads(dumps(payload)) == {"rows": [{"id": 1, "at": "2024-05-01T12:30:00"}], "tags": ["a"], "7": "int key", "text": "café"}
+    # beyond orjson's 64-bit integers the stdlib fallback takes over
+    assert json.loads(dumps({"n": 2**70})) == {"n": 2**70}
+
+
+def test_negotiate_encoding_honours_q_values(monkeypatch):
+    monkeypatch.setattr(responses, "_BROTLI_AVAILABLE", False)
+    assert negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("*;q=0.5") == "gzip"
+    assert negotiate_encoding(None) is None
+    monkeypatch.setattr(responses, "_BROTLI_AVAILABLE", True)
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.8") == "gzip"
+
+
+def test_compresses_large_and_streaming_responses_only():
+    client = TestClient(make_app())
+
+    res = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.headers["vary"] == "Accept-Encoding"
+    assert int(res.headers["content-length"]) < len(res.content) / 5
+    assert len(res.json()["runs"]) == 200
+
+    raw = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert raw.json() == res.json()
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers and small.json() == {"ok": True}
+
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert streamed.headers["content-encoding"] == "gzip"
+    assert "content-length" not in streamed.headers
+    assert streamed.text == "".join(f"line {i}\n" * 50 for i in range(20))
+
+
+def test_api_tasks_and_logs_are_compressed(monkeypatch):
+    import main
+
+    store = TaskStore(db_path=":memory:")
+    monkeypatch.setattr(settings, "SCHEDULER_ENABLED", False)
+    monkeypatch.setattr(settings, "POLLING_ENABLED", False)
+    monkeypatch.setattr(main, "store", store)
+    with TestClient(main.app) as client:
+        for i in range(30):
+            client.post("/tasks", params={"source": "notion", "title": f"Compression check {i}", "owner": "ops"})
+        res = client.get("/tasks", headers={"Accept-Encoding": "gzip"})
+        assert res.status_code == 200 and res.headers["content-encoding"] == "gzip"
+        assert len(res.json()["tasks"]) == 30
+
+        client.portal.call(store.create_run, "weekly_review", datetime.utcnow().isoformat(), "success", {"executions": [{"tool": "slack", "status": "ok"}] * 40})
+        logs = client.get("/workflows/logs", headers={"Accept-Encoding": "gzip"})
+        assert logs.headers["content-encoding"] == "gzip"
+        assert len(logs.json()["runs"][0]["log"]["executions"]) == 40
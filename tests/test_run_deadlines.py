@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.core.deadline import bounded, deadline_scope, remaining_time
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+class HangingRouter(ToolRouterStub):
+    """Hangs on Slack posts; everything else completes immediately."""
+
+    def __init__(self):
+        super().__init__()
+        self.slack_started = asyncio.Event()
+
+    async def multi_execute(self, executions):
+        if executions[0]["tool"] == "slack":
+            self.slack_started.set()
+            await asyncio.sleep(3600)
+        return super().multi_execute(executions)
+
+
+@pytest.mark.asyncio
+async def test_step_timeout_and_run_deadline():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        planner = WorkflowPlanner(router=HangingRouter(), store=store)
+        planner.retry_backoff = 0.0
+        planner.step_timeout = 0.05
+        summary = await planner.run("weekly_review", params={"channel": "#ops", "manager_email": "m@x.com"})
+        assert summary["executions"][-1]["status"] == "timeout"
+        assert summary["status"] == "error"
+
+        planner.step_timeout = None
+        summary = await planner.run("weekly_review", params={"channel": "#ops2", "manager_email": "m@x.com"}, timeout=0.1)
+        assert summary["status"] == "timeout"
+        assert [ex["tool"] for ex in summary["executions"]] == ["notion", "openai"]
+        run = await store.get_run(summary["run_id"])
+        assert run["status"] == "timeout"
+    finally:
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_cancel_inflight_run():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        router = HangingRouter()
+        planner = WorkflowPlanner(router=router, store=store)
+        planner.step_timeout = None
+        run_task = asyncio.create_task(planner.run("weekly_review", params={"channel": "#c", "manager_email": "m@x.com"}))
+        await asyncio.wait_for(router.slack_started.wait(), timeout=1)
+        run_id = next(iter(planner._run_tasks))
+        assert await planner.cancel(run_id) is True
+        summary = await asyncio.wait_for(run_task, timeout=1)
+        assert summary["status"] == "cancelled"
+        assert (await store.get_run(run_id))["status"] == "cancelled"
+        assert await planner.cancel(run_id) is False
+        assert planner.limiter.metrics()["slack"]["in_flight"] == 0
+    finally:
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_deadline_scope_is_propagated():
+    assert remaining_time() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            # inner scopes never extend the outer deadline
+            assert remaining_time() <= 10
+        with pytest.raises(asyncio.TimeoutError):
+            await bounded(asyncio.sleep(1), timeout=0.01)
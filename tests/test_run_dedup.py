@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+class SlowRouter(ToolRouterStub):
+    def __init__(self):
+        super().__init__()
+        self.posts = 0
+        self.active = 0
+        self.peak = 0
+
+    async def multi_execute(self, executions):
+        if executions[0]["tool"] == "slack":
+            self.posts += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        return super().multi_execute(executions)
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_attach_to_inflight_run():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        router = SlowRouter()
+        planner = WorkflowPlanner(router=router, store=store)
+        params = {"channel": "#ops", "manager_email": "m@example.com"}
+
+        first, second = await asyncio.gather(planner.run("weekly_review", params=params), planner.run("weekly_review", params=dict(params)))
+
+        assert router.posts == 1
+        assert first["run_id"] == second["run_id"]
+        assert second.get("deduplicated") is True
+        assert first["concurrency_key"] == WorkflowPlanner.concurrency_key("weekly_review", params)
+
+        # an explicit key separates otherwise identical requests
+        await asyncio.gather(
+            planner.run("weekly_review", params=params, concurrency_key="a"),
+            planner.run("weekly_review", params=params, concurrency_key="b"),
+        )
+        assert router.posts == 3
+    finally:
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_per_workflow_max_concurrency_queues_excess():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        router = SlowRouter()
+        planner = WorkflowPlanner(router=router, store=store)
+        planner.max_concurrency["weekly_review_cross_tool"] = 1
+        runs = [planner.run("weekly_review_cross_tool", params={"channel": f"#c{i}", "database_id": "db"}) for i in range(3)]
+        summaries = await asyncio.gather(*runs)
+
+        assert router.peak == 1
+        assert len({s["run_id"] for s in summaries}) == 3
+    finally:
+        await store.disconnect()
@@ -0,0 +1,40 @@
+import pytest
+
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.tracing import RunTrace, span
+from src.core.workflow_planner import WorkflowPlanner
+
+
+def test_span_is_noop_without_active_trace():
+    with span("orphan") as sp:
+        sp.attributes["x"] = 1
+    trace = RunTrace("t")
+    with trace.activate():
+        with span("outer"):
+            with span("inner", tool="slack"):
+                pass
+    spans = trace.to_dict()["spans"]
+    assert [s["name"] for s in spans] == ["outer", "inner"]
+    assert spans[1]["parent_id"] == spans[0]["id"]
+    assert spans[1]["attributes"] == {"tool": "slack"}
+
+
+@pytest.mark.asyncio
+async def test_run_timeline_is_persisted():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        planner = WorkflowPlanner(router=ToolRouterStub(), store=store)
+        summary = await planner.run("weekly_review", params={"channel": "#ops", "manager_email": "m@x.com"})
+        names = [s["name"] for s in summary["timeline"]["spans"]]
+        for expected in ("load_plan", "resolve_placeholders", "router.plan", "store.create_run", "step", "multi_execute", "store.save_step", "store.update_run"):
+            assert expected in names
+        attempts = [s for s in summary["timeline"]["spans"] if s["name"] == "multi_execute"]
+        assert [a["attributes"]["tool"] for a in attempts] == ["notion", "openai", "slack"]
+        assert all(a["duration_ms"] >= 0 for a in attempts)
+
+        run = await store.get_run(summary["run_id"])
+        assert run["log"]["timeline"]["trace_id"] == summary["timeline"]["trace_id"]
+    finally:
+        await store.disconnect()
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.core.scheduler import CronExpression, Schedule, WorkflowScheduler, next_fire_time
+from src.core.task_store import TaskStore
+
+
+def test_cron_next_after():
+    cron = CronExpression("*/15 9-17 * * 1-5")
+    # Saturday 2024-01-06 -> next fire is Monday 09:00
+    assert cron.next_after(datetime(2024, 1, 6, 12, 0)) == datetime(2024, 1, 8, 9, 0)
+    assert cron.next_after(datetime(2024, 1, 8, 9, 0)) == datetime(2024, 1, 8, 9, 15)
+    assert CronExpression("@weekly").next_after(datetime(2024, 1, 3)) == datetime(2024, 1, 7, 0, 0)
+    with pytest.raises(ValueError):
+        CronExpression("61 * * * *")
+
+
+def test_missed_runs_are_coalesced():
+    sched = Schedule(name="s", kind="workflow", target="weekly_review", cron="0 * * * *", last_run_at="2024-01-01T00:00:00")
+    now = datetime(2024, 1, 1, 5, 30)
+    fire_at, missed = next_fire_time(sched, now)
+    assert fire_at == now
+    assert missed == 5
+
+
+class SlowPlanner:
+    def __init__(self):
+        self.calls = 0
+
+    def list_workflows(self):
+        return ["weekly_review"]
+
+    async def run(self, workflow_name, params=None):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_overlap_policy_and_persistence():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        planner = SlowPlanner()
+        scheduler = WorkflowScheduler(store=store, planner=planner)
+        await scheduler.add_schedule(Schedule(name="skip", kind="workflow", target="weekly_review", cron="@weekly"))
+        await scheduler.add_schedule(Schedule(name="queue", kind="workflow", target="weekly_review", cron="@weekly", overlap="queue"))
+
+        first = await scheduler.trigger("skip")
+        second = await scheduler.trigger("skip")
+        assert first is not None and second is None
+        queued = [await scheduler.trigger("queue"), await scheduler.trigger("queue")]
+        await asyncio.gather(first, *queued)
+        assert planner.calls == 3
+
+        saved = {s.name: s for s in await store.list_schedules()}
+        assert saved["queue"].overlap == "queue"
+        assert saved["skip"].last_run_at
+        await scheduler.stop()
+    finally:
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_schedule_saves_do_not_deadlock(tmp_path):
+    store = TaskStore(db_path=str(tmp_path / "schedules.db"))
+    await store.connect()
+    try:
+        saves = [store.upsert_schedule(Schedule(name=f"s{i % 3}", kind="workflow", target="weekly_review", cron="@weekly", last_run_at=str(i))) for i in range(12)]
+        saves += [store.mark_schedule_run(f"s{i}", "now") for i in range(3)]
+        await asyncio.gather(*saves)
+        saved = {s.name: s for s in await store.list_schedules()}
+        assert sorted(saved) == ["s0", "s1", "s2"]
+        assert saved["s2"].cron == "@weekly"
+    finally:
+        await store.disconnect()
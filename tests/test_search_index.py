@@ -0,0 +1,61 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.agents.gmail_agent import GmailAgent
+from src.core.search_index import SearchIndex, search_index
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+def test_ranking_and_incremental_updates():
+    index = SearchIndex()
+    index.index_item("gmail", {"id": "m1", "subject": "Quarterly budget review", "snippet": "budget numbers attached"})
+    index.index_item("notion", {"id": "p1", "title": "Budget"})
+    index.index_item("slack", {"id": "c:1", "text": "lunch plans for friday"})
+
+    res = index.search("budget review")
+    assert [r["id"] for r in res["results"]] == ["m1", "p1"]
+    assert res["results"][0]["title"] == "Quarterly budget review"
+    assert index.search("budget", sources=["notion"])["results"][0]["source"] == "notion"
+
+    # re-indexing replaces old postings; removal drops the document
+    index.index_item("gmail", {"id": "m1", "subject": "Offsite agenda"})
+    assert [r["id"] for r in index.search("budget")["results"]] == ["p1"]
+    assert index.remove("notion", "p1")
+    assert index.search("budget")["results"] == []
+    assert index.stats()["documents"] == 2
+
+
+@pytest.mark.asyncio
+async def test_tasks_polls_and_workflow_fetches_are_searchable():
+    search_index.clear()
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        task = await store.add_task_async(source="notion", title="Prepare onboarding checklist", owner="dana")
+        await store.update_status_async(task.id, "done")
+        await GmailAgent().poll()
+        router = ToolRouterStub()
+        await WorkflowPlanner(router=router, store=store).run("weekly_review_cross_tool", params={"channel": "#ops", "database_id": "db_1"})
+
+        hit = router.search("onboarding")["results"][0]
+        assert (hit["source"], hit["id"], hit["meta"]["status"]) == ("task", str(task.id), "done")
+        assert {r["source"] for r in router.search("weekly update")["results"]} == {"gmail"}
+        assert router.search("review")["results"][0]["id"] == "m2"
+    finally:
+        await store.disconnect()
+        search_index.clear()
+
+
+def test_search_endpoint():
+    from main import app
+
+    search_index.clear()
+    search_index.index_item("slack", {"id": "#ops:1", "text": "deploy freeze starts monday"})
+    try:
+        res = TestClient(app).get("/search", params={"q": "deploy freeze", "source": "slack"})
+        assert res.status_code == 200
+        assert res.json()["results"][0]["id"] == "#ops:1"
+    finally:
+        search_index.clear()
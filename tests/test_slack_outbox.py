@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from src.agents.slack_outbox import SlackOutbox
+from src.core.rate_limiter import RateLimiter, ToolLimit
+
+
+class FakeSlack:
+    def __init__(self, fail_threads=False, rate_limited=0):
+        self.posts = []
+        self.fail_threads = fail_threads
+        self.rate_limited = rate_limited
+
+    async def post(self, channel, text, thread_ts=None):
+        if self.rate_limited:
+            self.rate_limited -= 1
+            raise RateLimited()
+        if thread_ts and self.fail_threads:
+            raise RuntimeError("thread_not_found")
+        self.posts.append({"channel": channel, "text": text, "thread_ts": thread_ts})
+        return {"ts": str(len(self.posts)), "channel": channel}
+
+
+class RateLimited(Exception):
+    class response:
+        status_code = 429
+        headers = {"Retry-After": "0"}
+
+
+def limiter():
+    # one send per channel every 50ms
+    return RateLimiter({"slack": ToolLimit(rate=100, burst=100, max_in_flight=4, key_rate=20, key_burst=1)})
+
+
+@pytest.mark.asyncio
+async def test_burst_to_one_channel_is_coalesced_with_per_message_results():
+    slack = FakeSlack()
+    outbox = SlackOutbox(slack.post, limiter=limiter())
+
+    results = await asyncio.gather(*(outbox.send("#ops", f"update {i}") for i in range(5)), outbox.send("#dev", "hi"))
+
+    ops = [p for p in slack.posts if p["channel"] == "#ops"]
+    assert len(ops) == 1 and ops[0]["text"] == "\n".join(f"update {i}" for i in range(5))
+    assert [r["position"] for r in results[:5]] == list(range(5))
+    assert all(r["status"] == "ok" and r["coalesced"] == 5 and r["ts"] == results[0]["ts"] for r in results[:5])
+    assert results[5] == {"status": "ok", "ts": results[5]["ts"], "channel": "#dev"}
+
+
+@pytest.mark.asyncio
+async def test_messages_arriving_while_paced_join_the_next_batch():
+    slack = FakeSlack(rate_limited=1)
+    outbox = SlackOutbox(slack.post, limiter=limiter())
+
+    first = asyncio.ensure_future(outbox.send("#ops", "a"))
+    await asyncio.sleep(0.01)
+    rest = await asyncio.gather(*(outbox.send("#ops", t) for t in ("b", "c")))
+    await first
+
+    assert [p["text"] for p in slack.posts] == ["a", "b\nc"]
+    assert outbox.stats()["api_calls"] == 3  # includes the retried 429
+    assert [r["coalesced"] for r in rest] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_thread_mode_reports_partial_failures():
+    slack = FakeSlack(fail_threads=True)
+    outbox = SlackOutbox(slack.post, mode="thread", limiter=limiter())
+
+    parent, reply1, reply2 = await asyncio.gather(*(outbox.send("#ops", t) for t in ("summary", "x", "y")))
+
+    assert parent["status"] == "ok"
+    assert reply1["status"] == reply2["status"] == "error"
+    assert reply1["thread_ts"] == parent["ts"]
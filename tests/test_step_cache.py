@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from src.core.step_cache import StepCache
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+class CountingRouter(ToolRouterStub):
+    def __init__(self):
+        super().__init__()
+        self.calls = {}
+
+    async def multi_execute(self, executions):
+        ex = executions[0]
+        key = (ex["tool"], ex["action"])
+        self.calls[key] = self.calls.get(key, 0) + 1
+        await asyncio.sleep(0.02)
+        return super().multi_execute(executions)
+
+
+@pytest.mark.asyncio
+async def test_identical_fetch_steps_share_one_execution():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        router = CountingRouter()
+        planner = WorkflowPlanner(router=router, store=store, step_cache=StepCache(ttl_seconds=60, max_entries=8))
+        runs = [planner.run("weekly_review", params={"channel": f"#team{i}", "manager_email": "m@test.com"}) for i in range(5)]
+        summaries = await asyncio.gather(*runs)
+
+        assert router.calls[("notion", "fetch_tasks")] == 1
+        assert router.calls[("slack", "post_message")] == 5
+        assert all(s["executions"][0]["status"] == "ok" for s in summaries)
+
+        # later runs inside the TTL are served from the cache
+        await planner.run("weekly_review", params={"channel": "#late", "manager_email": "m@test.com"})
+        assert router.calls[("notion", "fetch_tasks")] == 1
+        stats = planner.step_cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] + stats["shared_inflight"] == 5
+    finally:
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_key_normalization():
+    cache = StepCache(ttl_seconds=60, max_entries=2)
+    assert StepCache.make_key("gmail", "fetch_messages", {"b": 1, "a": None}) == StepCache.make_key("gmail", "fetch_messages", {"b": 1})
+
+    async def value(v):
+        return v
+
+    for i in range(3):
+        await cache.get_or_execute(f"k{i}", lambda i=i: value(i))
+    assert cache.get("k0") == (False, None)
+    assert cache.get("k2") == (True, 2)
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.http_router import HttpToolRouter
+from src.core.router_adapter import SyncRouterAdapter
+from src.core.summary_cache import DiskLRUCache, LocalModelClient, RouterModelClient, Summarizer, estimate_tokens
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+def test_disk_cache_evicts_least_recently_used_and_survives_restart(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=250)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"summary": key * 60})
+    assert cache.get("a")[0]  # a is now the most recently used
+    cache.put("d", {"summary": "d" * 60})
+    assert cache.stats()["evictions"] == 1
+    assert not cache.get("b")[0]
+    assert cache.bytes <= 250
+
+    reopened = DiskLRUCache(str(tmp_path), max_bytes=250)
+    assert reopened.get("d") == (True, {"summary": "d" * 60})
+    assert sorted(reopened._index) == sorted(cache._index)
+
+
+@pytest.mark.asyncio
+async def test_summarizer_dedupes_batches_and_serves_repeats_from_disk(tmp_path):
+    # five identical requests and four distinct ones, with a budget of two per batch
+    docs = [f"task {i}: " + "review the quarterly budget " * 3 for i in range(4)]
+    client = LocalModelClient(latency=0.05, per_token_seconds=0)
+    budget = 2 * estimate_tokens(f"Summarize\n\n{docs[0]}")
+    summarizer = Summarizer(client, DiskLRUCache(str(tmp_path)), max_batch_tokens=budget, batch_window=0.01)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *[summarizer.summarize("gpt-4", "Summarize", docs[0]) for _ in range(5)],
+        *[summarizer.summarize("gpt-4", "Summarize", d) for d in docs[1:]],
+    )
+    cold = time.perf_counter() - started
+    assert all(r["status"] == "ok" for r in results)
+    assert client.prompts == 4 and client.calls == 2
+    assert summarizer.stats()["shared_inflight"] == 4
+
+    started = time.perf_counter()
+    again = await asyncio.gather(*[summarizer.summarize("gpt-4", "Summarize", d) for d in docs])
+    warm = time.perf_counter() - started
+    assert all(r["cached"] for r in again) and client.calls == 2
+    assert warm < cold / 2
+    # a different model or prompt is a different key
+    await summarizer.summarize("local-small", "Summarize", docs[0])
+    assert client.calls == 3
+
+    stats = summarizer.stats()
+    assert stats["hits"] == 4 and stats["misses"] == 5
+    assert stats["hit_rate"] == round(8 / 13, 3)
+
+    # another backend sharing the cache directory doesn't get these summaries
+    other = LocalModelClient(latency=0, per_token_seconds=0, max_chars=40)
+    result = await Summarizer(other, DiskLRUCache(str(tmp_path))).summarize("gpt-4", "Summarize", docs[0])
+    assert result["cached"] is False and other.calls == 1
+
+
+def test_router_clients_are_identified_by_router_and_url():
+    stub = RouterModelClient(SyncRouterAdapter(ToolRouterStub()))
+    remote = RouterModelClient(HttpToolRouter(base_url="http://router-a.internal/"))
+    assert stub.identity == "ToolRouterStub"
+    assert remote.identity == "HttpToolRouter:http://router-a.internal"
+    assert RouterModelClient(HttpToolRouter(base_url="http://router-b.internal")).identity != remote.identity
+
+
+@pytest.mark.asyncio
+async def test_weekly_review_reuses_summary_until_tasks_change(tmp_path):
+    class CountingRouter(ToolRouterStub):
+        def __init__(self):
+            super().__init__()
+            self.summaries = 0
+
+        def multi_execute(self, executions):
+            self.summaries += sum(1 for ex in executions if ex["action"] == "summarize")
+            return super().multi_execute(executions)
+
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        router = CountingRouter()
+        planner = WorkflowPlanner(router=router, store=store)
+        planner.summarizer = Summarizer.from_settings(planner.arouter)
+        planner.summarizer.cache = DiskLRUCache(str(tmp_path))
+        await store.add_task_async("notion", "Ship the release notes", owner="alice")
+        params = {"channel": "#ops", "manager_email": "m@example.com"}
+
+        first = await planner.run("weekly_review", params=params)
+        second = await planner.run("weekly_review", params=params)
+        assert first["status"] == second["status"] == "success"
+        assert router.summaries == 1
+        assert second["executions"][1]["cached"] is True
+
+        await store.add_task_async("gmail", "Renew the SSL certificate", owner="bob")
+        await planner.run("weekly_review", params=params)
+        assert router.summaries == 2
+    finally:
+        await store.disconnect()
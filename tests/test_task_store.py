@@ -1,6 +1,11 @@
+import asyncio
+from datetime import datetime
+
 import pytest
+from sqlalchemy.dialects import postgresql
 
-from src.core.task_store import TaskStore
+from src.core import task_store
+from src.core.task_store import TaskStore, sync_state_table
 
 
 @pytest.mark.asyncio
@@ -16,3 +21,36 @@ async def test_add_and_get_task(tmp_path):
         assert got.title == "hello"
     finally:
         await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cursor_writes_do_not_deadlock(tmp_path):
+    store = TaskStore(db_path=str(tmp_path / "cursors.db"))
+    await store.connect()
+    try:
+        run_id = await store.create_run("weekly_review", datetime.utcnow().isoformat())
+        writes = [store.set_cursor(f"agent{i % 2}", f"source{i % 3}", str(i)) for i in range(12)]
+        writes += [store.update_run(run_id, datetime.utcnow().isoformat(), "success", {"i": i}) for i in range(4)]
+        await asyncio.gather(*writes)
+        assert len(await store.list_sync_state()) == 6
+        # concurrent writers land in any order; the cursor holds one of the values written for its key
+        assert await store.get_cursor("agent1", "source2") in {"5", "11"}
+    finally:
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_upsert_falls_back_for_dialects_without_on_conflict(tmp_path, monkeypatch):
+    # PostgreSQL gets its own ON CONFLICT construct
+    query = task_store.UPSERT_INSERTS["postgresql"](sync_state_table).values(agent="a", source="s", cursor="1")
+    assert "ON CONFLICT (agent, source) DO UPDATE" in str(query.on_conflict_do_update(index_elements=["agent", "source"], set_={"cursor": "1"}).compile(dialect=postgresql.dialect()))
+
+    monkeypatch.setattr(task_store, "UPSERT_INSERTS", {})
+    store = TaskStore(db_path=str(tmp_path / "generic.db"))
+    await store.connect()
+    try:
+        await asyncio.gather(*[store.set_cursor("slack", "#ops", str(i)) for i in range(5)])
+        await store.set_cursor("slack", "#ops", "latest")
+        assert [(s["source"], s["cursor"]) for s in await store.list_sync_state()] == [("#ops", "latest")]
+    finally:
+        await store.disconnect()
@@ -0,0 +1,167 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import app
+from scripts.replay_webhooks import replay, sample_events
+from src.core.config import settings
+from src.core.ingest import IngestQueue
+from src.core.task_store import TaskStore
+from src.core.webhooks import EventDeduper, build_pubsub_push, decode_pubsub_push, sign_slack_request, verify_slack_signature
+
+
+def test_slack_signature_rejects_tampered_and_stale_requests():
+    body = b'{"type": "event_callback"}'
+    headers = sign_slack_request("secret", body, timestamp=1_700_000_000)
+    ts, sig = headers["X-Slack-Request-Timestamp"], headers["X-Slack-Signature"]
+    assert verify_slack_signature("secret", ts, body, sig, now=1_700_000_010)
+    assert not verify_slack_signature("secret", ts, body + b" ", sig, now=1_700_000_010)
+    assert not verify_slack_signature("other", ts, body, sig, now=1_700_000_010)
+    assert not verify_slack_signature("secret", ts, body, sig, now=1_700_000_000 + 301)
+
+
+def test_pubsub_push_round_trip_and_dedup():
+    message_id, data = decode_pubsub_push(build_pubsub_push({"historyId": "42"}, "m-1"))
+    assert (message_id, data) == ("m-1", {"historyId": "42"})
+    with pytest.raises(ValueError):
+        decode_pubsub_push({"message": {"data": "!!"}})
+    dedup = EventDeduper(max_size=2)
+    assert not dedup.seen("a")
+    assert dedup.seen("a")
+    assert not dedup.seen("b") and not dedup.seen("c")
+    # oldest id evicted once the cache is full
+    assert not dedup.seen("a")
+
+
+@pytest.mark.asyncio
+async def test_ingest_queue_batches_writes():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    queue = IngestQueue(store, batch_size=10, flush_interval=0.05)
+    for i in range(25):
+        assert queue.submit({"source": "slack", "title": f"event {i}"})
+    await queue.flush()
+    assert len(await store.list_tasks_async()) == 25
+    stats = queue.stats()
+    assert stats["written"] == 25 and stats["batches"] == 3
+    await queue.stop()
+    await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_ingest_queue_retries_failed_batches_then_dead_letters():
+    class FlakyStore:
+        def __init__(self, failures):
+            self.failures = failures
+            self.written = []
+
+        async def add_tasks_async(self, tasks):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("database is locked")
+            self.written += tasks
+
+    store = FlakyStore(failures=2)
+    queue = IngestQueue(store, batch_size=10, flush_interval=0.01, max_retries=3, retry_backoff=0.001)
+    for i in range(5):
+        queue.submit({"source": "slack", "title": f"event {i}"}, key=f"slack:E{i}")
+    await queue.flush()
+    assert len(store.written) == 5
+    assert queue.stats()["retried"] == 10 and queue.stats()["dead_lettered"] == 0
+    await queue.stop()
+
+    forgotten = []
+    store.failures = 100
+    queue = IngestQueue(store, batch_size=10, flush_interval=0.01, max_retries=2, retry_backoff=0.001, on_dead_letter=forgotten.extend)
+    queue.submit({"source": "slack", "title": "lost"}, key="slack:E9")
+    queue.submit({"source": "slack", "title": "no key"})
+    await queue.flush()
+    assert forgotten == ["slack:E9"]
+    assert [d["task"]["title"] for d in queue.dead_letters] == ["lost", "no key"]
+    assert queue.dead_letters[0]["attempts"] == 3 and queue.stats()["dead_lettered"] == 2
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_ingest_queue_coalesces_syncs():
+    queue = IngestQueue(store=None)
+    runs = []
+
+    async def sync():
+        runs.append(1)
+        await asyncio.sleep(0.02)
+
+    assert queue.request_sync("gmail", sync)
+    await asyncio.sleep(0.005)
+    for _ in range(5):
+        assert not queue.request_sync("gmail", sync)
+    await queue.flush()
+    # one run plus a single rerun for everything that arrived meanwhile
+    assert len(runs) == 2
+    assert queue.stats()["syncs_coalesced"] == 5
+
+
+@pytest.fixture
+def webhook_client(monkeypatch):
+    store = TaskStore(db_path=":memory:")
+    monkeypatch.setattr(settings, "SLACK_SIGNING_SECRET", "test-secret")
+    monkeypatch.setattr(settings, "GMAIL_PUSH_TOKEN", "test-token")
+    monkeypatch.setattr(settings, "SCHEDULER_ENABLED", False)
+    monkeypatch.setattr(settings, "POLLING_ENABLED", False)
+    monkeypatch.setattr(main, "store", store)
+    # the push sync reads its cursor through the Gmail agent's own store
+    monkeypatch.setattr(main.agents.get("gmail"), "store", store)
+    monkeypatch.setattr(main, "event_queue", IngestQueue(store, batch_size=50, flush_interval=0.01))
+    monkeypatch.setattr(main, "event_dedup", EventDeduper())
+    with TestClient(app) as client:
+        yield client, store
+
+
+def test_replayed_events_are_verified_deduplicated_and_stored(webhook_client):
+    client, store = webhook_client
+    events = sample_events(count=10, duplicates=0.5, seed=3)
+    result = replay(client, events)
+    assert result["statuses"].get("slack:200", 0) + result["statuses"].get("gmail:200", 0) == len(events)
+    client.portal.call(main.event_queue.flush)
+    tasks = client.portal.call(store.list_tasks_async)
+    slack_titles = sorted(t.title for t in tasks if t.source == "slack")
+    # 8 distinct Slack messages despite the re-sent duplicates
+    assert slack_titles == sorted(f"Replayed message {i}" for i in range(10) if i % 5 != 4)
+    # the Gmail notifications triggered mailbox syncs (mock messages)
+    assert any(t.source == "gmail" for t in tasks)
+    assert main.event_dedup.stats()["duplicates"] == len(events) - 10
+
+
+def test_dead_lettered_events_are_accepted_again(webhook_client, monkeypatch):
+    client, store = webhook_client
+    monkeypatch.setattr(main, "event_queue", IngestQueue(store, flush_interval=0.01, max_retries=0, on_dead_letter=main.forget_events))
+    add_tasks = store.add_tasks_async
+
+    async def failing_add(tasks):
+        raise RuntimeError("disk full")
+
+    body = json.dumps({"type": "event_callback", "event_id": "Ev1", "event": {"type": "message", "text": "Restart the build agent", "user": "U1", "ts": "1.0"}}).encode()
+    store.add_tasks_async = failing_add
+    assert client.post("/webhooks/slack/events", content=body, headers=sign_slack_request("test-secret", body)).json()["queued"]
+    client.portal.call(main.event_queue.flush)
+    assert main.event_queue.stats()["dead_lettered"] == 1
+
+    # Slack's redelivery is no longer treated as a duplicate
+    store.add_tasks_async = add_tasks
+    assert client.post("/webhooks/slack/events", content=body, headers=sign_slack_request("test-secret", body)).json()["queued"]
+    client.portal.call(main.event_queue.flush)
+    assert [t.title for t in client.portal.call(store.list_tasks_async)] == ["Restart the build agent"]
+
+
+def test_webhooks_reject_bad_credentials_and_answer_challenge(webhook_client):
+    client, _ = webhook_client
+    body = json.dumps({"type": "url_verification", "challenge": "abc"}).encode()
+    resp = client.post("/webhooks/slack/events", content=body, headers=sign_slack_request("test-secret", body))
+    assert resp.json() == {"challenge": "abc"}
+    resp = client.post("/webhooks/slack/events", content=body, headers=sign_slack_request("wrong", body))
+    assert resp.status_code == 401
+    resp = client.post("/webhooks/gmail/push", params={"token": "nope"}, json=build_pubsub_push({"historyId": "1"}, "x"))
+    assert resp.status_code == 401
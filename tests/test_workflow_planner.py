@@ -21,3 +21,50 @@ async def test_weekly_review_runs_with_params():
         assert any(ex["tool"] == "slack" for ex in summary["executions"])
     finally:
         await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_run_many_reports_per_param_set():
+    class FailingChannelRouter(ToolRouterStub):
+        def multi_execute(self, executions):
+            ex = executions[0]
+            if ex["tool"] == "slack" and ex["payload"].get("channel") == "#broken":
+                raise Exception("channel_not_found")
+            return super().multi_execute(executions)
+
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        planner = WorkflowPlanner(router=FailingChannelRouter(), store=store)
+        planner.retry_backoff = 0.0
+        param_sets = [{"channel": f"#team{i}", "manager_email": f"m{i}@example.com"} for i in range(4)]
+        param_sets.append({"channel": "#broken", "manager_email": "x@example.com"})
+
+        summary = await planner.run_many("weekly_review", param_sets, max_concurrency=2)
+
+        assert summary["total"] == 5
+        assert summary["succeeded"] == 4 and summary["failed"] == 1
+        assert summary["runs"][4]["status"] == "error"
+        assert planner.step_cache.stats()["misses"] == 1
+
+        runs = await store.list_runs(limit=10)
+        assert len(runs) == 5
+        assert sorted(r["status"] for r in runs) == ["error"] + ["success"] * 4
+    finally:
+        await store.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_checkpoint_every_step():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        planner = WorkflowPlanner(router=ToolRouterStub(), store=store)
+        param_sets = [{"channel": f"#team{i}", "manager_email": f"m{i}@example.com"} for i in range(20)]
+        summary = await planner.run_many("weekly_review", param_sets, max_concurrency=20)
+        assert summary["succeeded"] == 20
+        for item in summary["runs"]:
+            steps = await store.list_steps(item["run_id"])
+            assert [s["status"] for s in steps] == ["ok", "ok", "ok"]
+    finally:
+        await store.disconnect()
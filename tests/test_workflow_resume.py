@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from src.core.exceptions import RunStateError
+from src.core.task_store import TaskStore
+from src.core.toolrouter_config import ToolRouterStub
+from src.core.workflow_planner import WorkflowPlanner
+
+
+class FlakyNotionRouter(ToolRouterStub):
+    """Fails every create_summary_page call until `healthy` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.healthy = False
+        self.calls = []
+
+    def multi_execute(self, executions):
+        ex = executions[0]
+        self.calls.append((ex["tool"], ex["action"], ex.get("idempotency_key")))
+        if ex["action"] == "create_summary_page" and not self.healthy:
+            raise Exception("notion unavailable")
+        return super().multi_execute(executions)
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed_steps():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        router = FlakyNotionRouter()
+        planner = WorkflowPlanner(router=router, store=store)
+        planner.retry_backoff = 0.0
+
+        params = {"channel": "#ops", "database_id": "db_1"}
+        summary = await planner.run("weekly_review_cross_tool", params=params)
+        run_id = summary["run_id"]
+        assert summary["executions"][-1]["status"] == "error"
+        steps = await store.list_steps(run_id)
+        assert [s["status"] for s in steps] == ["ok", "ok", "error"]
+
+        router.healthy = True
+        router.calls.clear()
+        resumed = await planner.resume(run_id)
+
+        # only the failed Notion step runs again; the Slack post is not repeated
+        assert router.calls == [("notion", "create_summary_page", f"run-{run_id}-step-2")]
+        assert resumed["skipped_steps"] == [0, 1]
+        assert all(ex["status"] == "ok" for ex in resumed["executions"])
+        run = await store.get_run(run_id)
+        assert run["status"] == "success"
+
+        # a successful run is not replayed
+        router.calls.clear()
+        with pytest.raises(RunStateError):
+            await planner.resume(run_id)
+        assert router.calls == []
+
+        with pytest.raises(KeyError):
+            await planner.resume(9999)
+    finally:
+        await store.disconnect()
+
+
+class SlowNotionRouter(FlakyNotionRouter):
+    async def multi_execute(self, executions):
+        if executions[0]["action"] == "create_summary_page":
+            await asyncio.sleep(0.05)
+        return super().multi_execute(executions)
+
+
+@pytest.mark.asyncio
+async def test_resume_rejects_executing_runs_and_concurrent_resumes():
+    store = TaskStore(db_path=":memory:")
+    await store.connect()
+    try:
+        router = SlowNotionRouter()
+        planner = WorkflowPlanner(router=router, store=store)
+        planner.retry_backoff = 0.0
+        params = {"channel": "#ops", "database_id": "db_1"}
+
+        running = asyncio.create_task(planner.run("weekly_review_cross_tool", params=params))
+        while not planner._run_tasks:
+            await asyncio.sleep(0.001)
+        run_id = next(iter(planner._run_tasks))
+        with pytest.raises(RunStateError):
+            await planner.resume(run_id)
+        summary = await running
+        assert summary["status"] == "error"
+
+        router.healthy = True
+        router.calls.clear()
+        outcomes = await asyncio.gather(planner.resume(run_id), planner.resume(run_id), return_exceptions=True)
+        assert sum(isinstance(o, RunStateError) for o in outcomes) == 1
+        assert [c[1] for c in router.calls] == ["create_summary_page"]
+    finally:
+        await store.disconnect()
@@ -19,3 +19,15 @@ def test_execute_workflow_endpoint():
     data = resp.json()
     assert data["workflow"] == "weekly_review"
     assert "summary" in data
+
+
+def test_execute_batch_endpoint():
+    payload = {
+        "workflow_name": "weekly_review",
+        "param_sets": [{"channel": "#a", "manager_email": "a@test.com"}, {"channel": "#b", "manager_email": "b@test.com"}],
+    }
+    resp = client.post("/workflows/execute_batch", json=payload)
+    assert resp.status_code == 200
+    summary = resp.json()["summary"]
+    assert summary["total"] == 2
+    assert [r["index"] for r in summary["runs"]] == [0, 1]